@@ -0,0 +1,76 @@
+"""Content-addressed storage of large numeric arrays outside of the job records."""
+
+import hashlib
+import os
+from typing import Any
+
+import numpy as np
+
+ARRAY_REF_KEY = "$array"
+
+
+class ArrayStore:
+    """Stores numeric arrays as `.npy` files named after the hash of their content.
+
+    Job records only keep a small reference to the file, so reading and listing jobs never has to
+    parse the payload. Arrays are memory-mapped when read back.
+
+    Attributes:
+        directory: Directory holding the `.npy` files.
+        min_size: Number of elements from which an array is moved out of the record.
+    """
+
+    def __init__(self, directory: str, min_size: int = 4096):
+        self.directory = directory
+        self.min_size = min_size
+
+    def put(self, array: np.ndarray) -> str:
+        """Write `array` to the store (if not already present) and return its file name."""
+        array = np.ascontiguousarray(array)
+        digest = hashlib.sha256(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.data)
+        name = f"{digest.hexdigest()}.npy"
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as file:
+                np.save(file, array)
+            os.replace(tmp_path, path)
+        return name
+
+    def get(self, name: str) -> np.ndarray:
+        """Memory-map the array stored under `name`."""
+        return np.load(os.path.join(self.directory, name), mmap_mode="r")
+
+    def externalize(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Return a copy of `data` where large numeric arrays are replaced by store references."""
+        externalized = {}
+        for key, value in data.items():
+            array = _as_numeric_array(value)
+            if array is not None and array.size >= self.min_size:
+                externalized[key] = {ARRAY_REF_KEY: self.put(array)}
+            else:
+                externalized[key] = value
+        return externalized
+
+    def resolve(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Return a copy of `data` where store references are replaced by memory-mapped arrays."""
+        return {
+            key: self.get(value[ARRAY_REF_KEY]) if is_array_ref(value) else value
+            for key, value in data.items()
+        }
+
+
+def is_array_ref(value: Any) -> bool:
+    return isinstance(value, dict) and value.keys() == {ARRAY_REF_KEY}
+
+
+def _as_numeric_array(value: Any) -> np.ndarray | None:
+    if not isinstance(value, (list, np.ndarray)):
+        return None
+    try:
+        array = np.asarray(value)
+    except ValueError:  # ragged nested lists
+        return None
+    return array if array.dtype.kind in "biuf" else None
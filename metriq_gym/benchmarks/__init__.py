@@ -1,27 +1,70 @@
-from metriq_gym.benchmarks.benchmark import Benchmark, BenchmarkData
-from metriq_gym.benchmarks.qml_kernel import QMLKernel, QMLKernelData
-from metriq_gym.benchmarks.clops import Clops, ClopsData
-from metriq_gym.benchmarks.quantum_volume import QuantumVolume, QuantumVolumeData
-from metriq_gym.benchmarks.bseq import BSEQ, BSEQData
+"""Registry of the benchmarks.
+
+Benchmark modules import heavy dependencies (qiskit, simulators, graph libraries), so they are only
+imported when one of their classes is first looked up, e.g. `BENCHMARK_HANDLERS[job_type]`.
+"""
+
+from collections.abc import Iterator, Mapping
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from metriq_gym.job_type import JobType
 
-BENCHMARK_HANDLERS: dict[JobType, type[Benchmark]] = {
-    JobType.BSEQ: BSEQ,
-    JobType.CLOPS: Clops,
-    JobType.QML_KERNEL: QMLKernel,
-    JobType.QUANTUM_VOLUME: QuantumVolume,
+if TYPE_CHECKING:
+    from metriq_gym.benchmarks.benchmark import Benchmark, BenchmarkData, BenchmarkResult
+
+# Module and handler, data and result class names of each benchmark.
+_BENCHMARKS: dict[JobType, tuple[str, str, str, str]] = {
+    JobType.BSEQ: ("bseq", "BSEQ", "BSEQData", "BSEQResult"),
+    JobType.CLOPS: ("clops", "Clops", "ClopsData", "ClopsResult"),
+    JobType.QML_KERNEL: ("qml_kernel", "QMLKernel", "QMLKernelData", "QMLKernelResult"),
+    JobType.QUANTUM_VOLUME: (
+        "quantum_volume",
+        "QuantumVolume",
+        "QuantumVolumeData",
+        "QuantumVolumeResult",
+    ),
 }
 
-BENCHMARK_DATA_CLASSES: dict[JobType, type[BenchmarkData]] = {
-    JobType.BSEQ: BSEQData,
-    JobType.CLOPS: ClopsData,
-    JobType.QML_KERNEL: QMLKernelData,
-    JobType.QUANTUM_VOLUME: QuantumVolumeData,
+# Classes re-exported by this package, by module.
+_EXPORTS: dict[str, str] = {
+    "Benchmark": "benchmark",
+    "BenchmarkData": "benchmark",
+    "BenchmarkResult": "benchmark",
+    **{name: module for module, *names in _BENCHMARKS.values() for name in names},
 }
 
+
+class _LazyClassRegistry(Mapping[JobType, Any]):
+    """Maps each job type to one of its benchmark classes, importing its module on lookup."""
+
+    def __init__(self, position: int):
+        self._position = position
+
+    def __getitem__(self, job_type: JobType) -> Any:
+        module, *names = _BENCHMARKS[job_type]
+        return getattr(import_module(f"{__name__}.{module}"), names[self._position])
+
+    def __iter__(self) -> Iterator[JobType]:
+        return iter(_BENCHMARKS)
+
+    def __len__(self) -> int:
+        return len(_BENCHMARKS)
+
+
+BENCHMARK_HANDLERS: Mapping[JobType, type["Benchmark"]] = _LazyClassRegistry(0)
+BENCHMARK_DATA_CLASSES: Mapping[JobType, type["BenchmarkData"]] = _LazyClassRegistry(1)
+BENCHMARK_RESULT_CLASSES: Mapping[JobType, type["BenchmarkResult"]] = _LazyClassRegistry(2)
+
 SCHEMA_MAPPING = {
     JobType.BSEQ: "bseq.schema.json",
     JobType.CLOPS: "clops.schema.json",
     JobType.QML_KERNEL: "qml_kernel.schema.json",
     JobType.QUANTUM_VOLUME: "quantum_volume.schema.json",
 }
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f"{__name__}.{_EXPORTS[name]}"), name)
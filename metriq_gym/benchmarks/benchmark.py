@@ -1,23 +1,34 @@
 import argparse
 
 from pydantic import BaseModel
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import ClassVar
 
 from qbraid import GateModelResultData, QuantumDevice, QuantumJob
 
 
 @dataclass
 class BenchmarkData:
-    """Stores intermediate data from pre-processing and dispatching"""
+    """Stores intermediate data from pre-processing and dispatching
+
+    When the circuits of several benchmarks are packed into shared provider jobs (see
+    `metriq_gym.packing`), `circuit_indices` locates the circuits of this benchmark among the
+    measurement counts of the provider jobs.
+    """
 
     provider_job_ids: list[str]
+    circuit_indices: list[int] | None = field(default=None, kw_only=True)
 
 
 @dataclass
 class BenchmarkResult:
-    """Stores the final results of the benchmark"""
+    """Stores the final results of the benchmark
+
+    Results are recorded along with their `schema_version`. Bump it in a subclass whenever the
+    way its result is computed changes, so that previously recorded results get recomputed.
+    """
 
-    pass
+    schema_version: ClassVar[int] = 1
 
 
 class Benchmark[BD: BenchmarkData, BR: BenchmarkResult]:
@@ -29,6 +40,14 @@ class Benchmark[BD: BenchmarkData, BR: BenchmarkResult]:
         self.args = args
         self.params: BaseModel = params
 
+    def prepare(self) -> None:
+        """Do the device-independent local work of the benchmark ahead of dispatching it.
+
+        Suite dispatches run this once per benchmark configuration, in a separate process, before
+        dispatching the configuration to each device. It is meant for work that
+        `dispatch_handler` then picks up instead of redoing, e.g. through a cache.
+        """
+
     def dispatch_handler(self, device: QuantumDevice) -> BD:
         raise NotImplementedError
 
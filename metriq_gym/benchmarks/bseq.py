@@ -6,6 +6,7 @@ the CHSH inequality. The violation of this inequality indicates successful entan
 """
 
 from dataclasses import dataclass
+import logging
 
 import networkx as nx
 import rustworkx as rx
@@ -14,22 +15,28 @@ from qbraid import GateModelResultData, QuantumDevice, QuantumJob
 from qbraid.runtime.result_data import MeasCount
 
 from qiskit import QuantumCircuit
-from qiskit.result import marginal_counts, sampled_expectation_value
 
 from metriq_gym.benchmarks.benchmark import Benchmark, BenchmarkData, BenchmarkResult
 from metriq_gym.helpers.task_helpers import flatten_counts
+from metriq_gym.packing import run_circuits
 from metriq_gym.helpers.graph_helpers import (
     GraphColoring,
     device_graph_coloring,
     largest_connected_size,
 )
-from metriq_gym.qplatform.device import connectivity_graph
+from metriq_gym.qplatform.device_cache import load_device_metadata
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
 class BSEQResult(BenchmarkResult):
+    schema_version = 2
+
     largest_connected_size: int
     fraction_connected: float
+    num_colors: int
+    num_circuits: int
 
 
 @dataclass
@@ -63,13 +70,9 @@ def generate_chsh_circuit_sets(coloring: GraphColoring) -> list[QuantumCircuit]:
     # For each coloring, generate a set of CHSH pairs (Bell pairs plus an Ry(pi/4)) on each
     # edge of the coloring.  Measurement register is twice the number of qubit pairs in the
     # coloring
-    for counter in range(coloring.num_colors):
-        num_qubit_pairs = len(
-            {key for key, val in coloring.edge_color_map.items() if val == counter}
-        )
-        qc = QuantumCircuit(num_qubits, 2 * num_qubit_pairs)
-        for edge_idx in (key for key, val in coloring.edge_color_map.items() if val == counter):
-            edge = (coloring.edge_index_map[edge_idx][0], coloring.edge_index_map[edge_idx][1])
+    for edges in coloring.color_edges:
+        qc = QuantumCircuit(num_qubits, 2 * len(edges))
+        for edge in edges.tolist():
             # For each edge in the color set perform a CHSH experiment at the optimal value
             qc.h(edge[0])
             qc.cx(*edge)
@@ -80,15 +83,14 @@ def generate_chsh_circuit_sets(coloring: GraphColoring) -> list[QuantumCircuit]:
     exp_sets = []
     # For each coloring circuit, generate 4 new circuits with the required post-rotation operators
     # and measurements appended
-    for counter, circ in enumerate(circuits):
+    for edges, circ in zip(coloring.color_edges, circuits):
         meas_circuits = []
         # Need to create a circuit for each measurement basis. This amounts to appending a H gate to the qubits with an
         # X-basis measurement Each basis corresponds to one of the four CHSH correlation terms.
         for basis in ["ZZ", "ZX", "XZ", "XX"]:
             temp_qc = circ.copy()
             meas_counter = 0
-            for edge_idx in (key for key, val in coloring.edge_color_map.items() if val == counter):
-                edge = (coloring.edge_index_map[edge_idx][0], coloring.edge_index_map[edge_idx][1])
+            for edge in edges.tolist():
                 for idx, oper in enumerate(basis[::-1]):
                     if oper == "X":
                         temp_qc.h(edge[idx])
@@ -100,6 +102,34 @@ def generate_chsh_circuit_sets(coloring: GraphColoring) -> list[QuantumCircuit]:
     return exp_sets
 
 
+def counts_to_bit_matrix(counts: MeasCount, num_clbits: int) -> tuple[np.ndarray, np.ndarray]:
+    """Convert measurement counts into a matrix of measured bits and a vector of weights.
+
+    Args:
+        counts: Measurement counts keyed by bitstring (classical bit 0 rightmost).
+        num_clbits: Minimum number of classical bits; shorter bitstrings are zero-padded.
+
+    Returns:
+        A boolean (outcomes x clbits) matrix whose column i holds classical bit i, and the
+        number of times each outcome was measured.
+    """
+    keys = [key.replace(" ", "") for key in counts]
+    width = max([num_clbits, *map(len, keys)])
+    chars = np.frombuffer("".join(key.zfill(width) for key in keys).encode(), dtype=np.uint8)
+    bits = chars.reshape(len(keys), width)[:, ::-1] == ord("1")
+    return bits, np.fromiter(counts.values(), dtype=np.int64, count=len(keys))
+
+
+def zz_expectation_values(counts: MeasCount, num_pairs: int) -> np.ndarray:
+    """Compute the ZZ expectation value of every measured pair of classical bits at once.
+
+    Pair `i` is made of classical bits `2i` and `2i + 1`.
+    """
+    bits, weights = counts_to_bit_matrix(counts, 2 * num_pairs)
+    parities = bits[:, 0 : 2 * num_pairs : 2] ^ bits[:, 1 : 2 * num_pairs : 2]
+    return (weights @ np.where(parities, -1, 1)) / weights.sum()
+
+
 def chsh_subgraph(coloring: GraphColoring, counts: list[MeasCount]) -> rx.PyGraph:
     """Constructs a subgraph of qubit pairs that violate the CHSH inequality.
 
@@ -113,31 +143,20 @@ def chsh_subgraph(coloring: GraphColoring, counts: list[MeasCount]) -> rx.PyGrap
     # A subgraph is constructed containing only the edges (qubit pairs) that successfully violate the CHSH inequality.
     # The size of the largest connected component in this subgraph provides a measure of the device's performance.
     good_edges = []
-    for color_idx in range(coloring.num_colors):
-        num_meas_pairs = len(
-            {key for key, val in coloring.edge_color_map.items() if val == color_idx}
-        )
-        exp_vals: np.ndarray = np.zeros(num_meas_pairs, dtype=float)
+    for color_idx, edges in enumerate(coloring.color_edges):
+        exp_vals: np.ndarray = np.zeros(len(edges), dtype=float)
 
         for idx in range(4):
-            for pair in range(num_meas_pairs):
-                sub_counts = marginal_counts(counts[color_idx * 4 + idx], [2 * pair, 2 * pair + 1])
-                exp_val = sampled_expectation_value(sub_counts, "ZZ")
-                exp_vals[pair] += exp_val if idx != 2 else -exp_val
-
-        for idx, edge_idx in enumerate(
-            key for key, val in coloring.edge_color_map.items() if val == color_idx
-        ):
-            edge = (coloring.edge_index_map[edge_idx][0], coloring.edge_index_map[edge_idx][1])
-            # The benchmark checks whether the CHSH inequality is violated (i.e., the sum of correlations exceeds 2,
-            # indicating entanglement).
-            if exp_vals[idx] > 2:
-                good_edges.append(edge)
+            exp_val = zz_expectation_values(counts[color_idx * 4 + idx], len(edges))
+            exp_vals += exp_val if idx != 2 else -exp_val
+
+        # The benchmark checks whether the CHSH inequality is violated (i.e., the sum of correlations exceeds 2,
+        # indicating entanglement).
+        good_edges.extend(edges[exp_vals > 2].tolist())
 
     good_graph = rx.PyGraph(multigraph=False)
     good_graph.add_nodes_from(list(range(coloring.num_nodes)))
-    for edge in good_edges:
-        good_graph.add_edge(*edge, 1)
+    good_graph.add_edges_from([(q0, q1, 1) for q0, q1 in good_edges])
     return good_graph
 
 
@@ -148,30 +167,26 @@ class BSEQ(Benchmark):
         """Runs the benchmark and returns job metadata."""
         shots = self.params.shots
 
-        topology_graph = connectivity_graph(device)
-        coloring = device_graph_coloring(topology_graph)
+        metadata = load_device_metadata(device, getattr(self.args, "refresh_device", False))
+        topology_graph = metadata.connectivity_graph()
+        coloring = device_graph_coloring(topology_graph, self.params.coloring_strategy)
         trans_exp_sets = generate_chsh_circuit_sets(coloring)
-
-        quantum_jobs: list[QuantumJob | list[QuantumJob]] = [
-            device.run(circ_set, shots=shots) for circ_set in trans_exp_sets
-        ]
-
-        provider_job_ids = [
-            job.id
-            for quantum_job_set in quantum_jobs
-            for job in (quantum_job_set if isinstance(quantum_job_set, list) else [quantum_job_set])
-        ]
+        logger.info(
+            f"Colored {topology_graph.num_edges()} qubit pairs with {coloring.num_colors} colors "
+            f"({self.params.coloring_strategy} strategy): "
+            f"{sum(map(len, trans_exp_sets))} circuits to run"
+        )
 
         return BSEQData(
-            provider_job_ids=provider_job_ids,
+            provider_job_ids=[
+                job_id
+                for circ_set in trans_exp_sets
+                for job_id in run_circuits(device, circ_set, shots)
+            ],
             shots=shots,
             num_qubits=device.num_qubits,
             topology_graph=topology_graph,
-            coloring={
-                "num_nodes": coloring.num_nodes,
-                "edge_color_map": dict(coloring.edge_color_map),
-                "edge_index_map": dict(coloring.edge_index_map),
-            },
+            coloring=coloring.to_dict(),
         )
 
     def poll_handler(
@@ -191,4 +206,6 @@ class BSEQ(Benchmark):
         return BSEQResult(
             largest_connected_size=lcs,
             fraction_connected=lcs / job_data.coloring.num_nodes,
+            num_colors=job_data.coloring.num_colors,
+            num_circuits=4 * job_data.coloring.num_colors,
         )
@@ -1,5 +1,9 @@
-import copy
-from dataclasses import dataclass
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import logging
+import time
 
 import rustworkx as rx
 import numpy as np
@@ -8,119 +12,211 @@ from qiskit import QuantumCircuit
 from qiskit_device_benchmarking.clops.clops_benchmark import append_1q_layer
 
 from metriq_gym.benchmarks.benchmark import Benchmark, BenchmarkData, BenchmarkResult
-from metriq_gym.qplatform.job import execution_time
+from metriq_gym.qplatform.job import job_metadata
 from metriq_gym.helpers.task_helpers import flatten_job_ids
-from metriq_gym.qplatform.device import connectivity_graph
+from metriq_gym.qplatform.device import run_parameterized, supports_parameterized_runs
+from metriq_gym.qplatform.device_cache import load_device_metadata
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
 class ClopsData(BenchmarkData):
-    pass
+    """Data class to store CLOPS benchmark metadata.
+
+    Attributes:
+        parameter_binding: Where the circuit parameters were bound: "native" (by the provider,
+            from a single parameterized circuit) or "client".
+        stage_seconds: Client-side duration of each dispatch stage (generate, bind, transpile
+            and submit), in seconds.
+        dispatch_started_at: Time the dispatch started, in seconds since the epoch.
+    """
+
+    parameter_binding: str = "client"
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    dispatch_started_at: float | None = None
 
 
 @dataclass
 class ClopsResult(BenchmarkResult):
-    clops_score: float
+    """Result of the CLOPS benchmark.
+
+    Attributes:
+        clops_score: Circuit layers per second of provider execution time, if the provider
+            reports it.
+        hybrid_clops_score: Circuit layers per second of client dispatch stages plus provider
+            execution time.
+        wall_clock_clops_score: Circuit layers per second from the start of the dispatch to the
+            completion of the last provider job.
+        provider_seconds: Total provider execution time, in seconds.
+        stage_seconds: Client-side duration of each dispatch stage, in seconds.
+    """
+
+    schema_version = 3
+
+    clops_score: float | None
+    hybrid_clops_score: float | None = None
+    wall_clock_clops_score: float | None = None
+    provider_seconds: float | None = None
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+
+
+@contextmanager
+def _timed(stage_seconds: dict[str, float], stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_seconds[stage] = stage_seconds.get(stage, 0.0) + time.perf_counter() - start
 
 
 # adapted from submodules/qiskit-device-benchmarking/qiskit_device_benchmarking/clops/clops_benchmark.py::create_qubit_map
 # As opposed to the original version of this function, this takes a topology graph as an argument instead of an IBM's coupling map object.
-def create_qubit_map(width: int, topology_graph: rx.PyGraph, total_qubits: int) -> list[int]:
+def create_qubit_map(
+    width: int,
+    topology_graph: rx.PyGraph,
+    total_qubits: int,
+    qubit_weights: Sequence[float] | None = None,
+) -> list[int]:
     """
     Returns a list of  'width' qubits that are connected based on a coupling map that has
     bad edges already removed and a list of faulty qubits.  If there is not
     such a map, raises ValueError
-    """
-    qubit_map = []
 
-    # make coupling map bidirectional so we can find all neighbors
-    cm = copy.deepcopy(topology_graph)
-    for edge in topology_graph.edge_list():
-        cm.add_edge(edge[1], edge[0], None)
+    The qubits are collected breadth-first from the first starting qubit (in index order, or in
+    decreasing order of `qubit_weights` if given) whose connected component is large enough.
+    Neighbors are visited in index order.
+    """
+    starting_qubits: Iterable[int] = range(total_qubits)
+    if qubit_weights is not None:
+        starting_qubits = sorted(starting_qubits, key=lambda qubit: -qubit_weights[qubit])
 
-    for starting_qubit in range(total_qubits):
+    # Every qubit of a component too small for `width` would fail as a starting qubit as well.
+    too_small: set[int] = set()
+    for starting_qubit in starting_qubits:
+        if starting_qubit in too_small or not topology_graph.has_node(starting_qubit):
+            continue
+        if not topology_graph.neighbors(starting_qubit):
+            continue
         qubit_map = [starting_qubit]
-        new_neighbors = []
-        prospective_neighbors = list(cm.neighbors(starting_qubit))
-        while prospective_neighbors:
-            for pn in prospective_neighbors:
-                if pn not in qubit_map:
-                    new_neighbors.append(pn)
-            qubit_map = qubit_map + new_neighbors
-            prospective_neighbors = []
-            for nn in new_neighbors:
-                potential_neighbors = list(cm.neighbors(nn))
-                for pn in potential_neighbors:
-                    if pn not in prospective_neighbors:
-                        prospective_neighbors.append(pn)
-            new_neighbors = []
-            if len(qubit_map) >= width:
-                return qubit_map[:width]
+        visited = {starting_qubit}
+        queue = deque(qubit_map)
+        while queue and len(qubit_map) < width:
+            for neighbor in sorted(topology_graph.neighbors(queue.popleft())):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    qubit_map.append(neighbor)
+                    queue.append(neighbor)
+        if len(qubit_map) >= width:
+            return qubit_map[:width]
+        too_small |= visited
     raise ValueError(f"Insufficient connected qubits to create set of {width} qubits")
 
 
+def random_maximal_matching(
+    edges: np.ndarray, num_qubits: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Draw a random maximal matching of the given edges.
+
+    The edges are shuffled once and then accepted greedily unless one of their qubits is already
+    taken. This is equivalent to repeatedly picking a random edge among those not touching the
+    matching, in O(num_edges).
+
+    Args:
+        edges: The (num_edges x 2) array of qubit pairs to match.
+        num_qubits: Number of qubits the edges refer to.
+        rng: Random number generator to shuffle the edges with.
+
+    Returns:
+        The (num_matched x 2) array of matched qubit pairs, in the order they were accepted.
+    """
+    occupied = [False] * num_qubits
+    matching = []
+    for q0, q1 in rng.permutation(edges).tolist():
+        if not (occupied[q0] or occupied[q1]):
+            occupied[q0] = occupied[q1] = True
+            matching.append((q0, q1))
+    return np.array(matching, dtype=np.int64).reshape(-1, 2)
+
+
 # adapted from submodules/qiskit-device-benchmarking/qiskit_device_benchmarking/clops/clops_benchmark.py::prepare_clops_circuits
-# As opposed to the original version of this function, this takes a topology graph as an argument instead of an IBM's coupling map object.
+# As opposed to the original version of this function, this takes an edge array as an argument instead of an IBM's coupling map object.
 def append_2q_layer(
-    qc: QuantumCircuit, topology_graph: rx.PyGraph, basis_gates: set[str], rng: np.random.Generator
+    qc: QuantumCircuit, edges: np.ndarray, basis_gates: set[str], rng: np.random.Generator
 ) -> None:
     """
-    Add a layer of random 2q gates.
+    Add a layer of random 2q gates on a random maximal matching of `edges`.
     """
-    available_edges = set(topology_graph.edge_list())
-    while len(available_edges) > 0:
-        edge = tuple(rng.choice(list(available_edges)))
-        available_edges.remove(edge)
-        edges_to_delete = set()
-        for ce in list(available_edges):
-            if (edge[0] in ce) or (edge[1] in ce):
-                edges_to_delete.add(ce)
-        available_edges.difference_update(edges_to_delete)
-        if "ecr" in basis_gates:
-            qc.ecr(*edge)
-        elif "cz" in basis_gates:
-            qc.cz(*edge)
-        else:
-            qc.cx(*edge)
+    if "ecr" in basis_gates:
+        append_gate = qc.ecr
+    elif "cz" in basis_gates:
+        append_gate = qc.cz
+    else:
+        append_gate = qc.cx
+    for q0, q1 in random_maximal_matching(edges, qc.num_qubits, rng).tolist():
+        append_gate(q0, q1)
 
 
 # adapted from submodules/qiskit-device-benchmarking/qiskit_device_benchmarking/clops/clops_benchmark.py::prepare_clops_circuits
-def prepare_clops_circuits(
+def prepare_clops_template(
     width: int,
     layers: int,
-    num_circuits: int,
     basis_gates: set[str],
     topology_graph: rx.PyGraph,
     total_qubits: int,
-    seed: int = 0,
-) -> list[QuantumCircuit]:
+    rng: np.random.Generator,
+) -> QuantumCircuit:
+    """Build the parameterized CLOPS circuit whose parameters are updated for every run."""
     qubit_map = create_qubit_map(width, topology_graph, total_qubits=total_qubits)
 
-    for edge in topology_graph.edge_list():
-        if edge[0] not in qubit_map or edge[1] not in qubit_map:
-            topology_graph.remove_edge(*edge)
+    # Only keep the couplings between the qubits of the map.
+    edges = np.array(topology_graph.edge_list(), dtype=np.int64).reshape(-1, 2)
+    in_map = np.zeros(max(qubit_map) + 1, dtype=bool)
+    in_map[qubit_map] = True
+    edges = edges[(edges < len(in_map)).all(axis=1)]
+    edges = edges[in_map[edges[:, 0]] & in_map[edges[:, 1]]]
 
     qc = QuantumCircuit(max(qubit_map) + 1, max(qubit_map) + 1)
     qubits = [qc.qubits[i] for i in qubit_map]
 
-    parameters = []
-    rng = np.random.default_rng(seed)
     for d in range(layers):
-        append_2q_layer(qc, topology_graph, basis_gates, rng)
-        parameters += append_1q_layer(qc, qubits, parameterized=True, parameter_prefix=f"L{d}")
+        append_2q_layer(qc, edges, basis_gates, rng)
+        append_1q_layer(qc, qubits, parameterized=True, parameter_prefix=f"L{d}")
 
     for idx in range(width):
         qc.measure(qubit_map[idx], idx)
+    return qc
+
+
+def clops_parameter_values(
+    template: QuantumCircuit, num_circuits: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Draw random values for the template parameters, one row per circuit.
+
+    The columns follow the order of `template.parameters`.
+    """
+    return rng.uniform(0, np.pi * 2, size=(num_circuits, template.num_parameters))
 
-    # Parameters are instantiated for each circuit with random values
-    parametrized_circuits = [
-        qc.assign_parameters(
-            [rng.uniform(0, np.pi * 2) for _ in range(sum([len(param) for param in parameters]))]
-        )
-        for _ in range(num_circuits)
-    ]
 
-    return parametrized_circuits
+def bind_clops_circuits(
+    template: QuantumCircuit, parameter_values: np.ndarray
+) -> list[QuantumCircuit]:
+    """Bind each row of parameter values to a copy of the template on the client."""
+    return [template.assign_parameters(values) for values in parameter_values]
+
+
+def prepare_clops_circuits(
+    width: int,
+    layers: int,
+    num_circuits: int,
+    basis_gates: set[str],
+    topology_graph: rx.PyGraph,
+    total_qubits: int,
+    seed: int = 0,
+) -> list[QuantumCircuit]:
+    rng = np.random.default_rng(seed)
+    template = prepare_clops_template(width, layers, basis_gates, topology_graph, total_qubits, rng)
+    return bind_clops_circuits(template, clops_parameter_values(template, num_circuits, rng))
 
 
 class Clops(Benchmark):
@@ -130,24 +226,58 @@ class Clops(Benchmark):
     """
 
     def dispatch_handler(self, device: QuantumDevice) -> ClopsData:
-        topology_graph = connectivity_graph(device)
-        num_qubits = device.num_qubits
+        dispatch_started_at = time.time()
+        stage_seconds: dict[str, float] = {}
+        metadata = load_device_metadata(device, getattr(self.args, "refresh_device", False))
+        topology_graph = metadata.connectivity_graph()
+        num_qubits = metadata.num_qubits
         if num_qubits is None:
             raise ValueError(
                 "Device must have a known number of qubits to run the CLOPS benchmark."
             )
-        basis_gates = set(device.profile.basis_gates or [])
-        circuits = prepare_clops_circuits(
-            width=self.params.width,
-            layers=self.params.num_layers,
-            num_circuits=self.params.num_circuits,
-            basis_gates=basis_gates,
-            topology_graph=topology_graph,
-            total_qubits=num_qubits,
-        )
-        quantum_job: QuantumJob | list[QuantumJob] = device.run(circuits, shots=self.params.shots)
+        basis_gates = set(metadata.basis_gates)
+        with _timed(stage_seconds, "generate"):
+            rng = np.random.default_rng(0)
+            template = prepare_clops_template(
+                width=self.params.width,
+                layers=self.params.num_layers,
+                basis_gates=basis_gates,
+                topology_graph=topology_graph,
+                total_qubits=num_qubits,
+                rng=rng,
+            )
+            parameter_values = clops_parameter_values(template, self.params.num_circuits, rng)
+
+        parameter_binding = "client"
+        if self.params.parameter_binding == "native":
+            if supports_parameterized_runs(device):
+                parameter_binding = "native"
+            else:
+                logger.info("Device does not bind parameters natively, binding them on the client")
+
+        quantum_job: QuantumJob | list[QuantumJob]
+        if parameter_binding == "native":
+            with _timed(stage_seconds, "transpile"):
+                run_input = device.apply_runtime_profile(template)
+            with _timed(stage_seconds, "submit"):
+                quantum_job = run_parameterized(
+                    device, run_input, parameter_values, self.params.shots
+                )
+        else:
+            with _timed(stage_seconds, "bind"):
+                circuits = bind_clops_circuits(template, parameter_values)
+            # Equivalent to device.run, split up to time the transpilation and the submission.
+            with _timed(stage_seconds, "transpile"):
+                run_inputs = [device.apply_runtime_profile(circuit) for circuit in circuits]
+            with _timed(stage_seconds, "submit"):
+                quantum_job = device.submit(run_inputs, shots=self.params.shots)
         provider_job_ids = flatten_job_ids(quantum_job)
-        return ClopsData(provider_job_ids=provider_job_ids)
+        return ClopsData(
+            provider_job_ids=provider_job_ids,
+            parameter_binding=parameter_binding,
+            stage_seconds=stage_seconds,
+            dispatch_started_at=dispatch_started_at,
+        )
 
     def poll_handler(
         self,
@@ -155,7 +285,34 @@ class Clops(Benchmark):
         result_data: list[GateModelResultData],
         quantum_jobs: list[QuantumJob],
     ) -> ClopsResult:
-        clops_score = (self.params.num_circuits * self.params.num_layers * self.params.shots) / sum(
-            execution_time(quantum_job) for quantum_job in quantum_jobs
+        layer_operations = self.params.num_circuits * self.params.num_layers * self.params.shots
+        clops_score = hybrid_clops_score = wall_clock_clops_score = None
+        provider_seconds = None
+        try:
+            metadata = [job_metadata(quantum_job) for quantum_job in quantum_jobs]
+        except NotImplementedError:
+            logger.info("Provider job timing not available")
+            metadata = []
+        try:
+            provider_seconds = sum(job.execution_time() for job in metadata)
+            clops_score = layer_operations / provider_seconds
+            if job_data.stage_seconds:
+                client_seconds = sum(job_data.stage_seconds.values())
+                hybrid_clops_score = layer_operations / (client_seconds + provider_seconds)
+        except ValueError:
+            logger.info("Provider execution times not available")
+        if metadata and job_data.dispatch_started_at is not None:
+            try:
+                completed_at = max(job.completion_time().timestamp() for job in metadata)
+                wall_clock_clops_score = layer_operations / (
+                    completed_at - job_data.dispatch_started_at
+                )
+            except ValueError:
+                logger.info("Provider completion times not available")
+        return ClopsResult(
+            clops_score=clops_score,
+            hybrid_clops_score=hybrid_clops_score,
+            wall_clock_clops_score=wall_clock_clops_score,
+            provider_seconds=provider_seconds,
+            stage_seconds=dict(job_data.stage_seconds),
         )
-        return ClopsResult(clops_score=clops_score)
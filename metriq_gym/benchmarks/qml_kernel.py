@@ -1,5 +1,6 @@
 import numpy as np
 from dataclasses import dataclass
+from functools import lru_cache
 
 from qiskit import QuantumCircuit
 from qiskit.circuit import ParameterVector
@@ -9,7 +10,8 @@ from qbraid import GateModelResultData, QuantumDevice, QuantumJob
 from qbraid.runtime.result_data import MeasCount
 
 from metriq_gym.benchmarks.benchmark import Benchmark, BenchmarkData, BenchmarkResult
-from metriq_gym.helpers.task_helpers import flatten_counts, flatten_job_ids
+from metriq_gym.helpers.task_helpers import flatten_counts
+from metriq_gym.packing import run_circuits
 
 
 @dataclass
@@ -54,17 +56,26 @@ def ZZfeature_circuit(num_qubits: int) -> QuantumCircuit:
     return qc
 
 
-def create_inner_product_circuit(num_qubits: int, seed: int = 0) -> QuantumCircuit:
-    np.random.seed(seed)
+@lru_cache
+def inner_product_template(num_qubits: int) -> QuantumCircuit:
+    """Parametrized inner-product circuit of the ZZ feature map, with measurements.
 
-    # Create the ZZ feature map circuit and build the inner-product circuit.
+    The template only depends on the width, so it is built once per width and reused, e.g. across
+    the points of a sweep. It must not be modified: bind its parameters into a new circuit.
+    """
     qc_qml = ZZfeature_circuit(num_qubits)
     inner_prod = unitary_overlap(qc_qml, qc_qml, insert_barrier=True)
     inner_prod.measure_all()
+    return inner_prod
+
+
+def create_inner_product_circuit(num_qubits: int, seed: int = 0) -> QuantumCircuit:
+    rng = np.random.default_rng(seed)
+    inner_prod = inner_product_template(num_qubits)
 
     # Assign parameters: using the same parameters for both copies gives perfect overlap.
     # Here we tile a random parameter vector for half the total parameters.
-    param_vec = np.tile(2 * np.pi * np.random.random(size=inner_prod.num_parameters // 2), 2)
+    param_vec = np.tile(2 * np.pi * rng.random(size=inner_prod.num_parameters // 2), 2)
     return inner_prod.assign_parameters(param_vec)
 
 
@@ -76,10 +87,8 @@ def calculate_accuracy_score(num_qubits: int, count_results: MeasCount) -> float
 class QMLKernel(Benchmark):
     def dispatch_handler(self, device: QuantumDevice) -> QMLKernelData:
         qc = create_inner_product_circuit(self.params.num_qubits)
-        quantum_job: QuantumJob | list[QuantumJob] = device.run(qc, shots=self.params.shots)
-        provider_job_ids = flatten_job_ids(quantum_job)
         return QMLKernelData(
-            provider_job_ids=provider_job_ids,
+            provider_job_ids=run_circuits(device, qc, self.params.shots),
         )
 
     def poll_handler(
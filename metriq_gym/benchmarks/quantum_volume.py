@@ -1,5 +1,7 @@
+from concurrent.futures import ProcessPoolExecutor
 import math
-import statistics
+import os
+import numpy as np
 from scipy.stats import binom
 from dataclasses import dataclass
 
@@ -8,10 +10,19 @@ from qbraid.runtime.result_data import MeasCount
 from pyqrack import QrackSimulator
 from qiskit import QuantumCircuit
 
-from metriq_gym.circuits import qiskit_random_circuit_sampling
+from metriq_gym.circuit_cache import (
+    DEFAULT_CIRCUIT_CACHE_DIR,
+    DEFAULT_CIRCUIT_CACHE_MAX_BYTES,
+    CircuitSetCache,
+)
+from metriq_gym.circuits import build_random_circuit_sampling, random_circuit_sampling_params
 
 from metriq_gym.benchmarks.benchmark import Benchmark, BenchmarkData, BenchmarkResult
 from metriq_gym.helpers.task_helpers import flatten_counts
+from metriq_gym.packing import run_circuits
+
+# Bump whenever the circuits generated for a given seed change, to invalidate cached circuit sets.
+QV_GENERATOR_VERSION = 2
 
 
 @dataclass
@@ -20,8 +31,9 @@ class QuantumVolumeData(BenchmarkData):
     shots: int
     depth: int
     confidence_level: float
-    ideal_probs: list[list[float]]
+    ideal_probs: np.ndarray | list[list[float]]
     trials: int
+    seed: int | None = None
 
 
 @dataclass
@@ -35,25 +47,101 @@ class QuantumVolumeResult(BenchmarkResult):
     trials: int
 
 
-def prepare_qv_circuits(n: int, num_trials: int) -> tuple[list[QuantumCircuit], list[list[float]]]:
+def simulate_qv_trials(
+    angles: np.ndarray, permutations: np.ndarray
+) -> tuple[list[QuantumCircuit], np.ndarray]:
+    """Build the random circuits of a batch of trials and compute their ideal output distributions.
+
+    Args:
+        angles: U3 angles of the trials, as drawn by `random_circuit_sampling_params`.
+        permutations: CNOT qubit permutations of the trials.
+    """
+    num_trials, n = angles.shape[:2]
     circuits = []
-    ideal_probs = []
+    ideal_probs = np.empty((num_trials, 2**n))
 
     sim = QrackSimulator(n)
 
-    for _ in range(num_trials):
-        circuit = qiskit_random_circuit_sampling(n)
+    for trial in range(num_trials):
+        circuit = build_random_circuit_sampling(angles[trial], permutations[trial])
         sim_circuit = circuit.copy()
         circuit.measure_all()
         circuits.append(circuit)
 
         sim.run_qiskit_circuit(sim_circuit, shots=0)
-        ideal_probs.append(sim.out_probs())
+        ideal_probs[trial] = sim.out_probs()
         sim.reset_all()
 
     return circuits, ideal_probs
 
 
+def prepare_qv_circuits(
+    n: int, num_trials: int, seed: int | None = None, max_workers: int = 1
+) -> tuple[list[QuantumCircuit], np.ndarray]:
+    """Generate the random circuits of a Quantum Volume run and their ideal output distributions.
+
+    The random parameters of all trials are drawn upfront from a generator seeded with `seed`, so
+    the output only depends on `seed` and not on how the trials are spread across processes.
+
+    Args:
+        n: Number of qubits (and depth) of the circuits.
+        num_trials: Number of circuits to generate.
+        seed: Seed of the run. If None, the circuits are not reproducible.
+        max_workers: Number of processes to generate and simulate the trials with.
+
+    Returns:
+        The circuits, with measurements, and a (num_trials x 2^n) array of ideal probabilities.
+    """
+    angles, permutations = random_circuit_sampling_params(
+        n, num_trials, np.random.default_rng(seed)
+    )
+    if max_workers <= 1 or num_trials <= 1:
+        return simulate_qv_trials(angles, permutations)
+
+    num_chunks = min(max_workers, num_trials)
+    with ProcessPoolExecutor(max_workers=num_chunks) as executor:
+        results = list(
+            executor.map(
+                simulate_qv_trials,
+                [angles[i::num_chunks] for i in range(num_chunks)],
+                [permutations[i::num_chunks] for i in range(num_chunks)],
+            )
+        )
+
+    # Chunks are strided over the trials; interleave them back into the original order.
+    circuits: list[QuantumCircuit] = [None] * num_trials  # type: ignore[list-item]
+    ideal_probs = np.empty((num_trials, 2**n))
+    for i, (chunk_circuits, chunk_probs) in enumerate(results):
+        circuits[i::num_chunks] = chunk_circuits
+        ideal_probs[i::num_chunks] = chunk_probs
+    return circuits, ideal_probs
+
+
+def load_qv_circuits(
+    n: int,
+    num_trials: int,
+    seed: int,
+    max_workers: int = 1,
+    cache: CircuitSetCache | None = None,
+) -> tuple[list[QuantumCircuit], np.ndarray]:
+    """Return the circuits of a seeded Quantum Volume run, generating them only on a cache miss."""
+    if cache is None:
+        return prepare_qv_circuits(n, num_trials, seed, max_workers)
+    key = {
+        "benchmark": "Quantum Volume",
+        "num_qubits": n,
+        "trials": num_trials,
+        "seed": seed,
+        "generator_version": QV_GENERATOR_VERSION,
+    }
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    circuits, ideal_probs = prepare_qv_circuits(n, num_trials, seed, max_workers)
+    cache.put(key, circuits, ideal_probs)
+    return circuits, ideal_probs
+
+
 @dataclass
 class TrialStats:
     """Data class to store statistics of a single trial.
@@ -102,6 +190,97 @@ class AggregateStats:
     avg_xeb: float
 
 
+def counts_to_indices(counts: dict[str, int], num_qubits: int) -> tuple[np.ndarray, np.ndarray]:
+    """Convert measurement counts to arrays of outcome indices and counts.
+
+    Bitstrings that are not `num_qubits` characters of '0'/'1' are ignored.
+
+    Args:
+        counts: A dictionary of bitstrings to counts.
+        num_qubits: Number of measured qubits.
+
+    Returns:
+        The integer value of each bitstring and the corresponding counts.
+    """
+    bitstrings = np.array(list(counts.keys()), dtype=str)
+    values = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    same_length = np.char.str_len(bitstrings) == num_qubits
+    chars = bitstrings[same_length].astype(f"<U{num_qubits}").view("<U1").reshape(-1, num_qubits)
+    valid = np.all((chars == "0") | (chars == "1"), axis=1)
+    weights = np.left_shift(1, np.arange(num_qubits - 1, -1, -1, dtype=np.int64))
+    return (chars[valid] == "1").astype(np.int64) @ weights, values[same_length][valid]
+
+
+def calc_trials_stats(
+    ideal_probs: np.ndarray | list[list[float]],
+    counts: list[dict[str, int]],
+    shots: int,
+    confidence_level: float,
+) -> list[TrialStats]:
+    """Calculate various statistics for quantum volume benchmarking, for all trials at once.
+
+    Args:
+        ideal_probs: A (trials x 2^n) array of ideal probabilities, indexed by output bitstring.
+        counts: For each trial, a dictionary of bitstrings to counts measured from the backend.
+        shots: Number of measurement shots performed on each quantum circuit.
+        confidence_level: Specified confidence level for the benchmarking.
+
+    Returns:
+        A `TrialStats` object for each trial.
+    """
+    ideal = np.asarray(ideal_probs, dtype=np.float64)
+    num_trials, n_pow = ideal.shape
+    n = int(round(math.log2(n_pow)))
+
+    thresholds = np.median(ideal, axis=1)
+    u_u = ideal.mean(axis=1)
+    deviations = ideal - u_u[:, np.newaxis]
+    # XEB.
+    denom = np.einsum("ij,ij->i", deviations, deviations)
+    sum_deviations = deviations.sum(axis=1)
+    del deviations
+
+    # Only the measured outcomes contribute to the count-dependent sums.
+    indices, values = zip(*(counts_to_indices(trial_counts, n) for trial_counts in counts))
+    trial_of = np.repeat(np.arange(num_trials), [len(idx) for idx in indices])
+    outcome_indices = np.concatenate(indices)
+    outcome_counts = np.concatenate(values)
+    outcome_ideal = ideal[trial_of, outcome_indices]
+
+    numer = (
+        np.bincount(
+            trial_of,
+            weights=(outcome_ideal - u_u[trial_of]) * (outcome_counts / shots),
+            minlength=num_trials,
+        )
+        - u_u * sum_deviations
+    )
+    # QV / HOG.
+    hog_counts = np.bincount(
+        trial_of,
+        weights=np.where(outcome_ideal > thresholds[trial_of], outcome_counts, 0),
+        minlength=num_trials,
+    ).astype(np.int64)
+
+    hog_probs = hog_counts / shots
+    xebs = np.divide(numer, denom, out=np.zeros(num_trials), where=denom > 0)
+    p_vals = np.where(hog_counts > 0, 1 - binom.cdf(hog_counts - 1, shots, 1 / 2), 1.0)
+
+    return [
+        TrialStats(
+            qubits=n,
+            shots=shots,
+            xeb=float(xeb),
+            hog_prob=float(hog_prob),
+            hog_pass=bool(hog_prob >= 2 / 3),
+            p_value=float(p_val),
+            confidence_level=confidence_level,
+            confidence_pass=bool(p_val < confidence_level),
+        )
+        for xeb, hog_prob, p_val in zip(xebs, hog_probs, p_vals)
+    ]
+
+
 def calc_trial_stats(
     ideal_probs: list[float],
     counts: dict[str, int],
@@ -119,41 +298,7 @@ def calc_trial_stats(
     Returns:
         A `TrialStats` object containing the calculated statistics.
     """
-    n_pow = len(ideal_probs)
-    n = int(round(math.log2(n_pow)))
-    threshold = statistics.median(ideal_probs)
-    u_u = statistics.mean(ideal_probs)
-    numer: float = 0
-    denom: float = 0
-    sum_hog_counts = 0
-    for i in range(n_pow):
-        b = (bin(i)[2:]).zfill(n)
-
-        count = counts[b] if b in counts else 0
-        ideal = ideal_probs[i]
-
-        # XEB.
-        denom = denom + (ideal - u_u) ** 2
-        numer = numer + (ideal - u_u) * ((count / shots) - u_u)
-
-        # QV / HOG.
-        if ideal > threshold:
-            sum_hog_counts += count
-
-    hog_prob = sum_hog_counts / shots
-    xeb = numer / denom if denom > 0 else 0
-    p_val = (1 - binom.cdf(sum_hog_counts - 1, shots, 1 / 2).item()) if sum_hog_counts > 0 else 1
-
-    return TrialStats(
-        qubits=n,
-        shots=shots,
-        xeb=xeb,
-        hog_prob=hog_prob,
-        hog_pass=hog_prob >= 2 / 3,
-        p_value=p_val,
-        confidence_level=confidence_level,
-        confidence_pass=p_val < confidence_level,
-    )
+    return calc_trials_stats([ideal_probs], [counts], shots, confidence_level)[0]
 
 
 def calc_stats(data: QuantumVolumeData, counts: list[MeasCount]) -> AggregateStats:
@@ -165,18 +310,13 @@ def calc_stats(data: QuantumVolumeData, counts: list[MeasCount]) -> AggregateSta
     Returns:
         An AggregateStats object containing aggregated statistics for the result.
     """
-    trial_stats = []
-
     num_trials = len(counts)
-    # Process each trial, handling provider-specific logic.
-    for trial in range(num_trials):
-        trial_stat = calc_trial_stats(
-            ideal_probs=data.ideal_probs[trial],
-            counts=counts[trial],
-            shots=data.shots,
-            confidence_level=data.confidence_level,
-        )
-        trial_stats.append(trial_stat)
+    trial_stats = calc_trials_stats(
+        ideal_probs=np.asarray(data.ideal_probs)[:num_trials],
+        counts=counts,
+        shots=data.shots,
+        confidence_level=data.confidence_level,
+    )
 
     # Aggregate the trial statistics.
     hog_prob = sum(stat.hog_prob for stat in trial_stats) / num_trials
@@ -195,25 +335,54 @@ def calc_stats(data: QuantumVolumeData, counts: list[MeasCount]) -> AggregateSta
 
 
 class QuantumVolume(Benchmark):
+    def _circuit_cache(self) -> CircuitSetCache | None:
+        # Only circuit sets of an explicit seed can be requested again, so only those are cached.
+        if self.params.seed is None:
+            return None
+        return CircuitSetCache(
+            os.environ.get("METRIQ_GYM_CIRCUIT_CACHE_DIR", DEFAULT_CIRCUIT_CACHE_DIR),
+            int(
+                os.environ.get(
+                    "METRIQ_GYM_CIRCUIT_CACHE_MAX_BYTES", DEFAULT_CIRCUIT_CACHE_MAX_BYTES
+                )
+            ),
+        )
+
+    def prepare(self) -> None:
+        cache = self._circuit_cache()
+        if cache is not None:
+            load_qv_circuits(
+                n=self.params.num_qubits,
+                num_trials=self.params.trials,
+                seed=self.params.seed,
+                max_workers=getattr(self.args, "max_workers", 1),
+                cache=cache,
+            )
+
     def dispatch_handler(self, device: QuantumDevice) -> QuantumVolumeData:
         num_qubits = self.params.num_qubits
         shots = self.params.shots
         trials = self.params.trials
-        circuits, ideal_probs = prepare_qv_circuits(n=num_qubits, num_trials=trials)
-        quantum_job: QuantumJob | list[QuantumJob] = device.run(circuits, shots=shots)
-        provider_job_ids = (
-            [quantum_job.id]
-            if isinstance(quantum_job, QuantumJob)
-            else [job.id for job in quantum_job]
+        seed = self.params.seed
+        cache = self._circuit_cache()
+        if seed is None:
+            seed = int(np.random.SeedSequence().generate_state(1)[0])
+        circuits, ideal_probs = load_qv_circuits(
+            n=num_qubits,
+            num_trials=trials,
+            seed=seed,
+            max_workers=getattr(self.args, "max_workers", 1),
+            cache=cache,
         )
         return QuantumVolumeData(
-            provider_job_ids=provider_job_ids,
+            provider_job_ids=run_circuits(device, circuits, shots),
             num_qubits=num_qubits,
             shots=shots,
             depth=num_qubits,
             confidence_level=self.params.confidence_level,
             ideal_probs=ideal_probs,
             trials=trials,
+            seed=seed,
         )
 
     def poll_handler(
@@ -0,0 +1,106 @@
+"""Local cache of generated benchmark circuits and their ideal output distributions."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any
+
+import numpy as np
+from qiskit import QuantumCircuit, qpy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CIRCUIT_CACHE_DIR = ".metriq_gym_circuits"
+DEFAULT_CIRCUIT_CACHE_MAX_BYTES = 1 << 30
+
+
+class CircuitSetCache:
+    """Stores sets of circuits (as QPY) with their ideal output distributions (as `.npy`).
+
+    An entry is addressed by the hash of the parameters that fully determine it, e.g. the width,
+    number of trials, seed and generator version of a Quantum Volume run. Dispatching the same
+    configuration to several devices then generates and simulates the circuits only once, and
+    every device runs exactly the same circuits.
+
+    Reading an entry marks it as recently used; once the cache grows over `max_bytes`, least
+    recently used entries are evicted.
+
+    Attributes:
+        directory: Directory holding the cache entries.
+        max_bytes: Size cap of the cache.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CIRCUIT_CACHE_DIR,
+        max_bytes: int = DEFAULT_CIRCUIT_CACHE_MAX_BYTES,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key: dict[str, Any]) -> str:
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+        return os.path.join(self.directory, digest)
+
+    def get(self, key: dict[str, Any]) -> tuple[list[QuantumCircuit], np.ndarray] | None:
+        """Return the circuits and ideal probabilities stored under `key`, or None.
+
+        The probabilities are memory-mapped rather than read into memory.
+        """
+        path = self._path(key)
+        try:
+            # The probabilities are written last, so their presence marks a complete entry.
+            ideal_probs = np.load(f"{path}.npy", mmap_mode="r")
+            with open(f"{path}.qpy", "rb") as file:
+                circuits = qpy.load(file)
+            for suffix in (".qpy", ".npy"):
+                os.utime(f"{path}{suffix}")
+        except FileNotFoundError:
+            return None
+        return list(circuits), ideal_probs
+
+    def put(
+        self, key: dict[str, Any], circuits: list[QuantumCircuit], ideal_probs: np.ndarray
+    ) -> None:
+        """Store circuits and their ideal probabilities under `key`."""
+        path = self._path(key)
+        os.makedirs(self.directory, exist_ok=True)
+        for suffix, write in [
+            (".qpy", lambda file: qpy.dump(circuits, file)),
+            (".npy", lambda file: np.save(file, np.asarray(ideal_probs))),
+        ]:
+            tmp_path = f"{path}{suffix}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as file:
+                write(file)
+            os.replace(tmp_path, f"{path}{suffix}")
+        self._evict(keep=path)
+
+    def _evict(self, keep: str) -> None:
+        # Size and last use of each entry, i.e. of its pair of circuit and probability files.
+        entries: dict[str, tuple[float, int]] = {}
+        for entry in os.scandir(self.directory):
+            path, suffix = os.path.splitext(entry.path)
+            if suffix not in (".qpy", ".npy"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            mtime, size = entries.get(path, (0.0, 0))
+            entries[path] = (max(mtime, stat.st_mtime), size + stat.st_size)
+        total_size = sum(size for _, size in entries.values())
+        for _, size, path in sorted((mtime, size, path) for path, (mtime, size) in entries.items()):
+            if total_size <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            # The probabilities go first, so that a partly removed entry is not read.
+            for suffix in (".npy", ".qpy"):
+                try:
+                    os.remove(f"{path}{suffix}")
+                except FileNotFoundError:
+                    pass
+            total_size -= size
+            logger.debug(f"Evicted {path} from the circuit cache")
@@ -2,7 +2,11 @@
 
 import math
 import random
+
+import numpy as np
 from qiskit import QuantumCircuit
+from qiskit.circuit import CircuitInstruction
+from qiskit.circuit.library import CXGate, UGate
 
 
 def rand_u3(circ: QuantumCircuit, q: int) -> None:
@@ -18,21 +22,69 @@ def rand_u3(circ: QuantumCircuit, q: int) -> None:
     circ.u(th, ph, lm, q)
 
 
-def qiskit_random_circuit_sampling(n: int) -> QuantumCircuit:
-    """Generate a square circuit, for random circuit sampling
+def random_circuit_sampling_params(
+    n: int, num_circuits: int, rng: np.random.Generator
+) -> tuple[np.ndarray, np.ndarray]:
+    """Draw the random parameters of a batch of square random circuit sampling circuits.
 
     Args:
-        n: Width of circuit to generate.
+        n: Width (and depth) of the circuits.
+        num_circuits: Number of circuits in the batch.
+        rng: Random number generator to draw the parameters from.
+
+    Returns:
+        The U3 angles, of shape (num_circuits, n, n, 3), and the qubit permutations pairing up
+        the CNOTs of each layer, of shape (num_circuits, n, n).
     """
+    angles = rng.uniform(0, 2 * math.pi, size=(num_circuits, n, n, 3))
+    permutations = rng.permuted(np.broadcast_to(np.arange(n), (num_circuits, n, n)), axis=-1)
+    return angles, permutations
+
+
+def build_random_circuit_sampling(angles: np.ndarray, permutations: np.ndarray) -> QuantumCircuit:
+    """Build a square random circuit sampling circuit from its parameters.
+
+    Args:
+        angles: U3 angles of each layer and qubit, of shape (n, n, 3).
+        permutations: Qubit permutation of each layer, of shape (n, n). CNOTs act on consecutive
+            pairs of the permutation.
+    """
+    n = angles.shape[0]
     circ = QuantumCircuit(n)
-    for _ in range(n):
-        for i in range(n):
-            rand_u3(circ, i)
-
-        unused_bits = list(range(n))
-        random.shuffle(unused_bits)
-        while len(unused_bits) > 1:
-            c = unused_bits.pop()
-            t = unused_bits.pop()
-            circ.cx(c, t)
+    qubits = circ.qubits
+    cx = CXGate()
+    # The gates are known to be valid, so skip the argument broadcasting of circ.u and circ.cx.
+    for layer_angles, permutation in zip(angles.tolist(), permutations.tolist()):
+        for q, (th, ph, lm) in enumerate(layer_angles):
+            circ._append(CircuitInstruction(UGate(th, ph, lm), (qubits[q],)))
+        for c, t in zip(permutation[0 : n - 1 : 2], permutation[1::2]):
+            circ._append(CircuitInstruction(cx, (qubits[c], qubits[t])))
     return circ
+
+
+def qiskit_random_circuit_sampling_batch(
+    n: int, num_circuits: int, rng: np.random.Generator | None = None
+) -> list[QuantumCircuit]:
+    """Generate a batch of square circuits, for random circuit sampling
+
+    Args:
+        n: Width of circuits to generate.
+        num_circuits: Number of circuits to generate.
+        rng: Random number generator used to build the circuits (unseeded by default).
+    """
+    angles, permutations = random_circuit_sampling_params(
+        n, num_circuits, rng or np.random.default_rng()
+    )
+    return [build_random_circuit_sampling(a, p) for a, p in zip(angles, permutations)]
+
+
+def qiskit_random_circuit_sampling(
+    n: int, rng: np.random.Generator | None = None
+) -> QuantumCircuit:
+    """Generate a square circuit, for random circuit sampling
+
+    Args:
+        n: Width of circuit to generate.
+        rng: Random number generator used to build the circuit (unseeded by default).
+    """
+    return qiskit_random_circuit_sampling_batch(n, 1, rng)[0]
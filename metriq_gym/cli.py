@@ -1,11 +1,12 @@
 """Command-line parsing for running metriq benchmarks."""
 
 import argparse
+import json
 import logging
 
 from tabulate import tabulate
 
-from qbraid.runtime import get_providers
+from metriq_gym.helpers.task_helpers import DEFAULT_MAX_WORKERS
 from metriq_gym.job_manager import JobManager, MetriqGymJob
 
 
@@ -13,6 +14,7 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 LIST_JOBS_HEADERS = ["Metriq-gym Job Id", "Provider", "Device", "Type", "Dispatch time (UTC)"]
+POLL_OUTCOMES_HEADERS = ["Metriq-gym Job Id", "Provider", "Device", "Type", "Status"]
 
 
 def list_jobs(jobs: list[MetriqGymJob], show_index: bool = False) -> None:
@@ -36,10 +38,73 @@ def list_jobs(jobs: list[MetriqGymJob], show_index: bool = False) -> None:
     )
 
 
+def list_poll_outcomes(outcomes: list[tuple[MetriqGymJob, str]]) -> None:
+    """Summarize the outcome of polling several jobs.
+
+    Args:
+        outcomes: Pairs of polled job and resulting status.
+    """
+    print(
+        tabulate(
+            [[*job.to_table_row()[:4], status] for job, status in outcomes],
+            headers=POLL_OUTCOMES_HEADERS,
+            tablefmt="grid",
+        )
+    )
+
+
+def list_group_results(jobs: list[MetriqGymJob]) -> None:
+    """Tabulate the jobs of a suite or sweep: the parameters that vary across them and the results.
+
+    Args:
+        jobs: Jobs of the group, results are shown for those that have one recorded.
+    """
+    if not jobs:
+        print("No jobs found.")
+        return
+    varying_params = [
+        key
+        for key in dict.fromkeys(key for job in jobs for key in job.params)
+        if len({json.dumps(job.params.get(key), sort_keys=True) for job in jobs}) > 1
+    ]
+    # Only scalar results fit in a table, e.g. per-qubit arrays are left to the job view.
+    result_keys = list(
+        dict.fromkeys(
+            key
+            for job in jobs
+            for key, value in (job.result or {}).items()
+            if value is None or isinstance(value, (bool, int, float, str))
+        )
+    )
+    print(
+        tabulate(
+            [
+                [
+                    job.id,
+                    job.device_name,
+                    job.job_type,
+                    *(job.params.get(key) for key in varying_params),
+                    *((job.result or {}).get(key) for key in result_keys),
+                ]
+                for job in jobs
+            ],
+            headers=["Metriq-gym Job Id", "Device", "Type", *varying_params, *result_keys],
+            tablefmt="grid",
+        )
+    )
+
+
 def prompt_for_job(args: argparse.Namespace, job_manager: JobManager) -> MetriqGymJob | None:
     if args.job_id:
         return job_manager.get_job(args.job_id)
-    jobs = job_manager.get_jobs()
+    jobs = job_manager.get_jobs(
+        provider_name=getattr(args, "provider", None),
+        device_name=getattr(args, "device", None),
+        job_type=getattr(args, "job_type", None),
+        suite_id=getattr(args, "suite_id", None),
+        limit=getattr(args, "limit", None),
+        offset=getattr(args, "offset", 0),
+    )
     if not jobs:
         print("No jobs found.")
         return None
@@ -66,6 +131,18 @@ def prompt_for_job(args: argparse.Namespace, job_manager: JobManager) -> MetriqG
     return jobs[selected_index]
 
 
+def add_job_filter_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments used to filter and paginate the list of recorded jobs."""
+    parser.add_argument("--provider", type=str, help="Only list jobs dispatched to this provider")
+    parser.add_argument("--device", type=str, help="Only list jobs dispatched to this device")
+    parser.add_argument("--job_type", type=str, help="Only list jobs of this benchmark type")
+    parser.add_argument(
+        "--suite_id", type=str, help="Only list jobs dispatched as part of this suite or sweep"
+    )
+    parser.add_argument("--limit", type=int, help="Maximum number of jobs to list")
+    parser.add_argument("--offset", type=int, default=0, help="Number of jobs to skip")
+
+
 def parse_arguments() -> argparse.Namespace:
     """
     Parse command-line arguments for the quantum volume benchmark.
@@ -80,13 +157,12 @@ def parse_arguments() -> argparse.Namespace:
     dispatch_parser.add_argument(
         "input_file",
         type=str,
-        help="Path to the file containing the benchmark parameters",
+        help="Path to the file containing the benchmark parameters, possibly with sweeps",
     )
     dispatch_parser.add_argument(
         "-p",
         "--provider",
         type=str,
-        choices=get_providers(),
         help="String identifier for backend provider service",
     )
     dispatch_parser.add_argument(
@@ -95,11 +171,76 @@ def parse_arguments() -> argparse.Namespace:
         type=str,
         help="Backend to use",
     )
+    dispatch_parser.add_argument(
+        "--max_workers",
+        type=int,
+        default=1,
+        help="Number of local processes to prepare the benchmark circuits with",
+    )
+    dispatch_parser.add_argument(
+        "--refresh_device",
+        action="store_true",
+        help="Fetch the device topology and profile again instead of using the local cache",
+    )
+    dispatch_parser.add_argument(
+        "--pack",
+        action="store_true",
+        help="Pack the circuits of the benchmarks dispatched to a device into shared provider jobs",
+    )
+
+    suite_parser = subparsers.add_parser(
+        "suite", help="Dispatch every benchmark of a suite to every device of the suite"
+    )
+    suite_parser.add_argument(
+        "suite_file",
+        type=str,
+        help="Path to the file listing the benchmark parameters and the devices",
+    )
+    suite_parser.add_argument(
+        "--max_workers",
+        type=int,
+        default=1,
+        help="Number of local processes to prepare the benchmark circuits with",
+    )
+    suite_parser.add_argument(
+        "--max_submissions",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="Maximum number of jobs set up and submitted to the providers concurrently",
+    )
+    suite_parser.add_argument(
+        "--refresh_device",
+        action="store_true",
+        help="Fetch the device topology and profile again instead of using the local cache",
+    )
+    suite_parser.add_argument(
+        "--pack",
+        action="store_true",
+        help="Pack the circuits of the benchmarks dispatched to a device into shared provider jobs",
+    )
 
     poll_parser = subparsers.add_parser("poll", help="Poll jobs")
     poll_parser.add_argument("--job_id", type=str, required=False, help="Job ID to poll (optional)")
+    poll_parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Poll every job without a recorded result and record the completed ones",
+    )
+    poll_parser.add_argument(
+        "--recompute",
+        action="store_true",
+        help="Compute the benchmark result again even if one is already recorded",
+    )
+    add_job_filter_arguments(poll_parser)
+    poll_parser.add_argument(
+        "--max_workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="Maximum number of concurrent requests to the provider",
+    )
 
     view_parser = subparsers.add_parser("view", help="View jobs")
     view_parser.add_argument("--job_id", type=str, required=False, help="Job ID to view (optional)")
+    add_job_filter_arguments(view_parser)
 
     return parser.parse_args()
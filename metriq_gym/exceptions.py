@@ -1,2 +1,17 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from qbraid.runtime import JobStatus
+
+
 class QBraidSetupError(Exception):
     pass
+
+
+class ProviderJobError(Exception):
+    """A provider job ended without results, i.e. it failed or was cancelled."""
+
+    def __init__(self, job_id: str, status: "JobStatus"):
+        super().__init__(f"Provider job {job_id} ended with status {status.name}")
+        self.job_id = job_id
+        self.status = status
@@ -1,4 +1,5 @@
 from dataclasses import dataclass, field
+from typing import Callable
 
 import rustworkx as rx
 import numpy as np
@@ -12,16 +13,35 @@ class GraphColoring:
         num_nodes: Number of qubits (nodes) in the graph.
         edge_color_map: Maps each edge index to a color (integer).
         edge_index_map: Maps edge indices to actual qubit pairs.
+        color_edges: For each color, the (num_edges x 2) array of qubit pairs with that color, in
+            the order of `edge_color_map` (i.e. of the measurements in its BSEQ circuits).
+            Derived from the maps if not given.
         num_colors: Total number of colors assigned in the graph.
     """
 
     num_nodes: int
     edge_color_map: dict
     edge_index_map: dict
+    color_edges: list[np.ndarray] = field(default_factory=list)
     num_colors: int = field(init=False)
 
     def __post_init__(self):
-        self.num_colors = max(self.edge_color_map.values()) + 1
+        if not self.color_edges:
+            self.color_edges = _group_edges_by_color(self.edge_color_map, self.edge_index_map)
+        else:
+            self.color_edges = [
+                np.asarray(edges, dtype=np.int64).reshape(-1, 2) for edges in self.color_edges
+            ]
+        self.num_colors = len(self.color_edges)
+
+    def to_dict(self) -> dict:
+        """Serialize the coloring, including the per-color edge arrays."""
+        return {
+            "num_nodes": self.num_nodes,
+            "edge_color_map": dict(self.edge_color_map),
+            "edge_index_map": dict(self.edge_index_map),
+            "color_edges": [edges.tolist() for edges in self.color_edges],
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> "GraphColoring":
@@ -30,9 +50,22 @@ class GraphColoring:
             num_nodes=data["num_nodes"],
             edge_color_map={int(k): v for k, v in data["edge_color_map"].items()},
             edge_index_map={int(k): v for k, v in data["edge_index_map"].items()},
+            color_edges=data.get("color_edges", []),
         )
 
 
+def _group_edges_by_color(edge_color_map: dict, edge_index_map: dict) -> list[np.ndarray]:
+    edge_indices = list(edge_color_map)
+    colors = np.fromiter(edge_color_map.values(), dtype=np.int64, count=len(edge_indices))
+    pairs = np.array(
+        [edge_index_map[edge_idx][:2] for edge_idx in edge_indices], dtype=np.int64
+    ).reshape(-1, 2)
+    # A stable sort keeps the edges of each color in the order of edge_color_map.
+    order = np.argsort(colors, kind="stable")
+    counts = np.bincount(colors)
+    return np.split(pairs[order], np.cumsum(counts)[:-1]) if len(counts) else []
+
+
 def largest_connected_size(good_graph: rx.PyGraph) -> int:
     """Finds the size of the largest connected component in the CHSH subgraph.
 
@@ -49,7 +82,17 @@ def largest_connected_size(good_graph: rx.PyGraph) -> int:
     return len(largest_cc)
 
 
-def device_graph_coloring(topology_graph: rx.PyGraph) -> GraphColoring:
+EDGE_COLORING_STRATEGIES: dict[str, Callable[[rx.PyGraph], dict[int, int]]] = {
+    # Optimal (max degree) number of colors, bipartite graphs only.
+    "bipartite": rx.graph_bipartite_edge_color,
+    # At most max degree + 1 colors on any graph.
+    "misra_gries": rx.graph_misra_gries_edge_color,
+    # Fast heuristic, no bound beyond 2 * max degree - 1 colors.
+    "greedy": rx.graph_greedy_edge_color,
+}
+
+
+def device_graph_coloring(topology_graph: rx.PyGraph, strategy: str = "auto") -> GraphColoring:
     """Performs graph coloring for a quantum device's topology.
 
     The goal is to assign colors to edges such that no two adjacent edges have the same color.
@@ -59,15 +102,21 @@ def device_graph_coloring(topology_graph: rx.PyGraph) -> GraphColoring:
 
     Args:
         topology_graph: The topology graph (coupling map) of the quantum device.
+        strategy: Edge coloring algorithm, one of `EDGE_COLORING_STRATEGIES`, or "auto" to use
+            the bipartite algorithm when the graph is bipartite and Misra-Gries otherwise.
 
     Returns:
         GraphColoring: An object containing the coloring information.
     """
     num_nodes = topology_graph.num_nodes()
 
-    # Graphs are bipartite, so use that feature to prevent extra colors from greedy search.
-    # This graph is colored using a bipartite edge-coloring algorithm.
-    edge_color_map = rx.graph_bipartite_edge_color(topology_graph)
+    # Bipartite graphs (e.g. heavy-hex and square lattices) can be colored with the minimal number
+    # of colors; other topologies (e.g. all-to-all) fall back to Misra-Gries.
+    if strategy == "auto":
+        strategy = "bipartite" if rx.is_bipartite(topology_graph) else "misra_gries"
+    if strategy not in EDGE_COLORING_STRATEGIES:
+        raise ValueError(f"Unknown edge coloring strategy: {strategy}")
+    edge_color_map = EDGE_COLORING_STRATEGIES[strategy](topology_graph)
 
     # Get the index of the edges.
     edge_index_map = dict(topology_graph.edge_index_map())
@@ -1,8 +1,16 @@
-from qbraid import QuantumJob
-from qbraid.runtime.result_data import MeasCount, GateModelResultData
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from typing import TYPE_CHECKING
 
+# qbraid is only imported when needed, so that the CLI can read DEFAULT_MAX_WORKERS cheaply.
+if TYPE_CHECKING:
+    from qbraid import QuantumJob
+    from qbraid.runtime.result_data import MeasCount, GateModelResultData
 
-def flatten_counts(result_data: list[GateModelResultData]) -> list[MeasCount]:
+DEFAULT_MAX_WORKERS = 8
+
+
+def flatten_counts(result_data: list["GateModelResultData"]) -> list["MeasCount"]:
     """Flatten the measurement counts from a list of GateModelResultData objects.
 
     This is to seamlessly handle the different ways batching is handled on the provider side.
@@ -10,7 +18,7 @@ def flatten_counts(result_data: list[GateModelResultData]) -> list[MeasCount]:
     Example: if we dispatch a job with 2 circuits, IBM returns one result with a list of 2 MeasCount objects.
     If we dispatch the same job to AWS/Rigetti, we get 2 results each with a single MeasCount object.
     """
-    flat_counts: list[MeasCount] = []
+    flat_counts: list["MeasCount"] = []
     for result in result_data:
         if isinstance(result.measurement_counts, list):
             flat_counts.extend(result.measurement_counts)
@@ -19,7 +27,66 @@ def flatten_counts(result_data: list[GateModelResultData]) -> list[MeasCount]:
     return flat_counts
 
 
-def flatten_job_ids(quantum_job: QuantumJob | list[QuantumJob]) -> list[str]:
+def flatten_job_ids(quantum_job: "QuantumJob | list[QuantumJob]") -> list[str]:
+    from qbraid import QuantumJob
+
     return (
         [quantum_job.id] if isinstance(quantum_job, QuantumJob) else [job.id for job in quantum_job]
     )
+
+
+def fetch_results(
+    quantum_jobs: list["QuantumJob"], max_workers: int = DEFAULT_MAX_WORKERS
+) -> list["GateModelResultData"] | None:
+    """Check the status of the given jobs and download their results concurrently.
+
+    Each provider round trip (status check, result download) is issued from a pool of at most
+    `max_workers` threads. As soon as one job is found not to be completed, jobs that have not
+    been checked yet are skipped and no further results are downloaded.
+
+    Args:
+        quantum_jobs: The provider jobs making up a metriq-gym job.
+        max_workers: Maximum number of concurrent requests to the provider.
+
+    Returns:
+        The result data of each job, in the same order as `quantum_jobs`, or None if any of the
+        jobs is not completed yet.
+
+    Raises:
+        ProviderJobError: If a job failed or was cancelled, so its results will never be available.
+    """
+    from qbraid.runtime import JobStatus
+
+    from metriq_gym.exceptions import ProviderJobError
+    from metriq_gym.qplatform.job import record_job_metadata
+
+    not_completed = threading.Event()
+
+    def fetch(quantum_job: "QuantumJob") -> "GateModelResultData | None":
+        if not_completed.is_set():
+            return None
+        status = quantum_job.status()
+        if status in (JobStatus.FAILED, JobStatus.CANCELLED):
+            not_completed.set()
+            raise ProviderJobError(quantum_job.id, status)
+        if status != JobStatus.COMPLETED:
+            not_completed.set()
+            return None
+        if not_completed.is_set():
+            return None
+        result = quantum_job.result()
+        record_job_metadata(quantum_job, result)
+        return result.data
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [executor.submit(fetch, quantum_job) for quantum_job in quantum_jobs]
+        pending = False
+        for future in as_completed(futures):
+            # Jobs that were checked are all waited for, so that a failed job is reported even
+            # when another one is still pending.
+            if future.result() is None:
+                pending = True
+        return None if pending else [future.result() for future in futures]
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
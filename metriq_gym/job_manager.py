@@ -1,13 +1,21 @@
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime
 import json
 import os
 import pprint
-from typing import Any
+import sqlite3
+import sys
+from typing import TYPE_CHECKING, Any
 
 from tabulate import tabulate
 from metriq_gym.job_type import JobType
 
+# The array store and result cache pull in numpy and qbraid, which listing and viewing jobs do not
+# need, so they are only imported when first used.
+if TYPE_CHECKING:
+    from metriq_gym.array_store import ArrayStore
+    from metriq_gym.result_cache import ResultCache
+
 
 @dataclass
 class MetriqGymJob:
@@ -18,6 +26,12 @@ class MetriqGymJob:
     provider_name: str
     device_name: str
     dispatch_time: datetime
+    result: dict[str, Any] | None = None
+    result_version: int | None = None
+    completion_time: datetime | None = None
+    suite_id: str | None = None
+    # Status of a provider job that ended without results (FAILED or CANCELLED).
+    provider_status: str | None = None
 
     def to_table_row(self) -> list[str]:
         return [
@@ -29,7 +43,7 @@ class MetriqGymJob:
         ]
 
     def serialize(self) -> str:
-        return json.dumps(asdict(self), sort_keys=True, default=str)
+        return json.dumps(asdict(self), sort_keys=True, default=_json_default)
 
     @staticmethod
     def deserialize(data: str) -> "MetriqGymJob":
@@ -37,6 +51,8 @@ class MetriqGymJob:
         job = MetriqGymJob(**job_dict)
         job.job_type = JobType(job_dict["job_type"])
         job.dispatch_time = datetime.fromisoformat(job_dict["dispatch_time"])
+        if job.completion_time is not None:
+            job.completion_time = datetime.fromisoformat(job_dict["completion_time"])
         return job
 
     def __str__(self) -> str:
@@ -49,39 +65,315 @@ class MetriqGymJob:
             ["provider_job_ids", pprint.pformat(self.data["provider_job_ids"])],
             ["dispatch_time", self.dispatch_time.isoformat()],
         ]
+        if self.suite_id is not None:
+            rows.append(["suite_id", self.suite_id])
+        if self.provider_status is not None:
+            rows.append(["provider_status", self.provider_status])
+        if self.result is not None and self.completion_time is not None:
+            rows += [
+                ["result", pprint.pformat(self.result)],
+                ["completion_time", self.completion_time.isoformat()],
+            ]
         return tabulate(rows, tablefmt="fancy_grid")
 
 
-# TODO: https://github.com/unitaryfoundation/metriq-gym/issues/51
-class JobManager:
-    jobs: list[MetriqGymJob]
-    jobs_file = ".metriq_gym_jobs.jsonl"
+def _json_default(obj: Any) -> Any:
+    # NumPy values (e.g. in benchmark results) are stored as the equivalent Python objects. There
+    # are none unless NumPy was already imported.
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    return str(obj)
+
+
+class JobStore:
+    """Storage backend for metriq-gym job records.
+
+    Listings are returned in dispatch (insertion) order and can be filtered on the indexed
+    attributes of a job and paginated with `limit`/`offset`.
+    """
+
+    def add(self, job: MetriqGymJob) -> None:
+        raise NotImplementedError
 
-    def __init__(self):
-        self._load_jobs()
+    def update(self, job: MetriqGymJob) -> None:
+        raise NotImplementedError
 
-    def _load_jobs(self):
-        self.jobs = []
-        if os.path.exists(self.jobs_file):
-            with open(self.jobs_file) as file:
+    def get(self, job_id: str) -> MetriqGymJob | None:
+        raise NotImplementedError
+
+    def query(
+        self,
+        provider_name: str | None = None,
+        device_name: str | None = None,
+        job_type: str | None = None,
+        dispatched_after: datetime | None = None,
+        suite_id: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[MetriqGymJob]:
+        raise NotImplementedError
+
+
+class JsonlJobStore(JobStore):
+    """Job store backed by an append-only JSON Lines file.
+
+    The whole file is parsed on construction; lookups by id then go through an in-memory index.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._jobs: list[MetriqGymJob] = []
+        self._index: dict[str, MetriqGymJob] = {}
+        if os.path.exists(self.path):
+            with open(self.path) as file:
                 for line in file:
                     try:
                         job = MetriqGymJob.deserialize(line.strip())
-                        self.jobs.append(job)
                     except json.JSONDecodeError:
                         continue
+                    self._jobs.append(job)
+                    self._index[job.id] = job
 
-    def add_job(self, job: MetriqGymJob) -> str:
-        self.jobs.append(job)
-        with open(self.jobs_file, "a") as file:
+    def add(self, job: MetriqGymJob) -> None:
+        self._jobs.append(job)
+        self._index[job.id] = job
+        with open(self.path, "a") as file:
             file.write(job.serialize() + "\n")
+
+    def update(self, job: MetriqGymJob) -> None:
+        self._jobs = [job if stored_job.id == job.id else stored_job for stored_job in self._jobs]
+        self._index[job.id] = job
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as file:
+            file.writelines(stored_job.serialize() + "\n" for stored_job in self._jobs)
+        os.replace(tmp_path, self.path)
+
+    def get(self, job_id: str) -> MetriqGymJob | None:
+        return self._index.get(job_id)
+
+    def query(
+        self,
+        provider_name: str | None = None,
+        device_name: str | None = None,
+        job_type: str | None = None,
+        dispatched_after: datetime | None = None,
+        suite_id: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[MetriqGymJob]:
+        jobs = [
+            job
+            for job in self._jobs
+            if (provider_name is None or job.provider_name == provider_name)
+            and (device_name is None or job.device_name == device_name)
+            and (job_type is None or job.job_type == job_type)
+            and (dispatched_after is None or job.dispatch_time >= dispatched_after)
+            and (suite_id is None or job.suite_id == suite_id)
+        ]
+        return jobs[offset:] if limit is None else jobs[offset : offset + limit]
+
+
+class SqliteJobStore(JobStore):
+    """Job store backed by an embedded SQLite database.
+
+    Job records are stored in serialized form alongside indexed columns for the job id, provider,
+    device, job type, dispatch time and suite, so lookups and filtered listings do not have to read
+    the whole store.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            job_type TEXT NOT NULL,
+            provider_name TEXT NOT NULL,
+            device_name TEXT NOT NULL,
+            dispatch_time TEXT NOT NULL,
+            record TEXT NOT NULL,
+            suite_id TEXT
+        );
+        CREATE INDEX IF NOT EXISTS jobs_job_type ON jobs (job_type);
+        CREATE INDEX IF NOT EXISTS jobs_provider_name ON jobs (provider_name);
+        CREATE INDEX IF NOT EXISTS jobs_device_name ON jobs (device_name);
+        CREATE INDEX IF NOT EXISTS jobs_dispatch_time ON jobs (dispatch_time);
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection = sqlite3.connect(self.path)
+        with self._connection:
+            self._connection.executescript(self.SCHEMA)
+            columns = {row[1] for row in self._connection.execute("PRAGMA table_info(jobs)")}
+            if "suite_id" not in columns:
+                # Stores created before the suite column: fill it in from the stored records.
+                self._connection.execute("ALTER TABLE jobs ADD COLUMN suite_id TEXT")
+                self._connection.execute(
+                    "UPDATE jobs SET suite_id = json_extract(record, '$.suite_id')"
+                )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS jobs_suite_id ON jobs (suite_id)")
+
+    def add(self, job: MetriqGymJob) -> None:
+        self.add_many([job])
+
+    def add_many(self, jobs: list[MetriqGymJob]) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        job.id,
+                        str(job.job_type),
+                        job.provider_name,
+                        job.device_name,
+                        job.dispatch_time.isoformat(),
+                        job.serialize(),
+                        job.suite_id,
+                    )
+                    for job in jobs
+                ],
+            )
+
+    def update(self, job: MetriqGymJob) -> None:
+        with self._connection:
+            self._connection.execute(
+                "UPDATE jobs SET record = ? WHERE id = ?", (job.serialize(), job.id)
+            )
+
+    def get(self, job_id: str) -> MetriqGymJob | None:
+        row = self._connection.execute("SELECT record FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return MetriqGymJob.deserialize(row[0]) if row else None
+
+    def query(
+        self,
+        provider_name: str | None = None,
+        device_name: str | None = None,
+        job_type: str | None = None,
+        dispatched_after: datetime | None = None,
+        suite_id: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[MetriqGymJob]:
+        conditions: list[str] = []
+        values: list[Any] = []
+        for column, value in [
+            ("provider_name", provider_name),
+            ("device_name", device_name),
+            ("job_type", job_type),
+            ("suite_id", suite_id),
+        ]:
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                values.append(str(value))
+        if dispatched_after is not None:
+            conditions.append("dispatch_time >= ?")
+            values.append(dispatched_after.isoformat())
+        sql = "SELECT record FROM jobs"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY rowid LIMIT ? OFFSET ?"
+        values += [-1 if limit is None else limit, offset]
+        return [MetriqGymJob.deserialize(row[0]) for row in self._connection.execute(sql, values)]
+
+
+def migrate_jsonl_store(jsonl_path: str, store: SqliteJobStore, array_store: "ArrayStore") -> int:
+    """Import every job from a JSON Lines job file into a SQLite job store.
+
+    Large numeric arrays in the job data are written to the array store, as for new jobs.
+
+    Args:
+        jsonl_path: Path to the legacy JSON Lines job file.
+        store: The SQLite store to import into.
+        array_store: The array store holding the large arrays of the jobs.
+
+    Returns:
+        The number of jobs imported.
+    """
+    jobs = JsonlJobStore(jsonl_path).query()
+    store.add_many([replace(job, data=array_store.externalize(job.data)) for job in jobs])
+    return len(jobs)
+
+
+def open_job_store(path: str) -> JobStore:
+    """Open the job store at `path`, choosing the backend from the file extension."""
+    if path.endswith(".jsonl"):
+        return JsonlJobStore(path)
+    return SqliteJobStore(path)
+
+
+class JobManager:
+    jobs_file = ".metriq_gym_jobs.db"
+    legacy_jobs_file = ".metriq_gym_jobs.jsonl"
+    arrays_dir = ".metriq_gym_arrays"
+    results_dir = ".metriq_gym_results"
+
+    def __init__(
+        self,
+        store: JobStore | None = None,
+        array_store: "ArrayStore | None" = None,
+        result_cache: "ResultCache | None" = None,
+    ):
+        self._array_store = array_store
+        self._result_cache = result_cache
+        if store is None:
+            migrate = not os.path.exists(self.jobs_file) and os.path.exists(self.legacy_jobs_file)
+            store = open_job_store(self.jobs_file)
+            if migrate and isinstance(store, SqliteJobStore):
+                migrate_jsonl_store(self.legacy_jobs_file, store, self.array_store)
+        self.store = store
+
+    @property
+    def array_store(self) -> "ArrayStore":
+        if self._array_store is None:
+            from metriq_gym.array_store import ArrayStore
+
+            self._array_store = ArrayStore(self.arrays_dir)
+        return self._array_store
+
+    @property
+    def result_cache(self) -> "ResultCache":
+        if self._result_cache is None:
+            from metriq_gym.result_cache import DEFAULT_MAX_BYTES, ResultCache
+
+            self._result_cache = ResultCache(
+                os.environ.get("METRIQ_GYM_RESULT_CACHE_DIR", self.results_dir),
+                int(os.environ.get("METRIQ_GYM_RESULT_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+            )
+        return self._result_cache
+
+    def add_job(self, job: MetriqGymJob) -> str:
+        """Record a job. Large numeric arrays in its data are written to the array store."""
+        self.store.add(replace(job, data=self.array_store.externalize(job.data)))
         return job.id
 
-    def get_jobs(self) -> list[MetriqGymJob]:
-        return self.jobs
+    def update_job(self, job: MetriqGymJob) -> None:
+        self.store.update(replace(job, data=self.array_store.externalize(job.data)))
+
+    def load_job_data(self, job: MetriqGymJob) -> dict[str, Any]:
+        """Return the data of a job with array store references memory-mapped in."""
+        return self.array_store.resolve(job.data)
+
+    def get_jobs(
+        self,
+        provider_name: str | None = None,
+        device_name: str | None = None,
+        job_type: str | None = None,
+        dispatched_after: datetime | None = None,
+        suite_id: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[MetriqGymJob]:
+        return self.store.query(
+            provider_name=provider_name,
+            device_name=device_name,
+            job_type=job_type,
+            dispatched_after=dispatched_after,
+            suite_id=suite_id,
+            limit=limit,
+            offset=offset,
+        )
 
     def get_job(self, job_id: str) -> MetriqGymJob:
-        for job in self.jobs:
-            if job.id == job_id:
-                return job
-        raise ValueError(f"Job with id {job_id} not found")
+        job = self.store.get(job_id)
+        if job is None:
+            raise ValueError(f"Job with id {job_id} not found")
+        return job
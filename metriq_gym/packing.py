@@ -0,0 +1,205 @@
+"""Packing of the circuits of several benchmarks into shared provider jobs.
+
+Each provider job waits in the provider queue, so benchmarks dispatched to the same device can have
+their circuits set aside and submitted together once all of them are dispatched. The data of each
+benchmark then lists the shared provider jobs along with where its own circuits are in their
+results (`BenchmarkData.circuit_indices`), which `unpack_results` uses at poll time.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import itertools
+from typing import TYPE_CHECKING, Any
+
+from metriq_gym.helpers.task_helpers import flatten_counts, flatten_job_ids
+
+if TYPE_CHECKING:
+    from qbraid import GateModelResultData, QuantumDevice
+    from qiskit import QuantumCircuit
+
+PLACEHOLDER_PREFIX = "packed:"
+
+_packer: ContextVar["CircuitPacker | None"] = ContextVar("circuit_packer", default=None)
+
+
+def run_circuits(
+    device: "QuantumDevice", circuits: "QuantumCircuit | list[QuantumCircuit]", shots: int
+) -> list[str]:
+    """Run circuits on a device and return the ids of the resulting provider jobs.
+
+    Within `packing(device)`, the circuits are set aside instead and a placeholder id is returned,
+    which `CircuitPacker.resolve` replaces once the packed circuits are submitted.
+    """
+    packer = _packer.get()
+    if packer is None or packer.device is not device:
+        return flatten_job_ids(device.run(circuits, shots=shots))
+    return [packer.add(circuits if isinstance(circuits, list) else [circuits], shots)]
+
+
+@dataclass
+class _Submission:
+    shots: int
+    registers: tuple[str, ...]
+    circuits: list["QuantumCircuit"] = field(default_factory=list)
+    job_ids: list[str] = field(default_factory=list)
+
+
+class CircuitPacker:
+    """Gathers the circuits run on a device into as few provider jobs as the device accepts.
+
+    Circuits run with the same number of shots and measured into classical registers of the same
+    names share provider jobs of up to `max_circuits` circuits each. Providers such as IBM read the
+    measurement counts of all the circuits of a job from the same register names.
+
+    Attributes:
+        device: Device the circuits are run on.
+        max_circuits: Maximum number of circuits per provider job, None if unlimited.
+    """
+
+    def __init__(self, device: "QuantumDevice", max_circuits: int | None = None):
+        self.device = device
+        self.max_circuits = max_circuits
+        self._submissions: list[_Submission] = []
+        # Submission and position within it of each circuit, for each placeholder id.
+        self._placements: list[list[tuple[int, int]]] = []
+
+    def add(self, circuits: list["QuantumCircuit"], shots: int) -> str:
+        """Set circuits aside and return the placeholder id standing for their provider jobs."""
+        placements = []
+        for circuit in circuits:
+            registers = _register_names(circuit)
+            index = next(
+                (
+                    index
+                    for index, submission in enumerate(self._submissions)
+                    if submission.shots == shots
+                    and submission.registers == registers
+                    and (self.max_circuits is None or len(submission.circuits) < self.max_circuits)
+                ),
+                None,
+            )
+            if index is None:
+                index = len(self._submissions)
+                self._submissions.append(_Submission(shots, registers))
+            placements.append((index, len(self._submissions[index].circuits)))
+            self._submissions[index].circuits.append(circuit)
+        self._placements.append(placements)
+        return f"{PLACEHOLDER_PREFIX}{len(self._placements) - 1}"
+
+    @property
+    def num_submissions(self) -> int:
+        return len(self._submissions)
+
+    @contextmanager
+    def rollback_on_error(self) -> Iterator[None]:
+        """Drop the circuits set aside within the block if it raises, e.g. a failed dispatch."""
+        num_placements = len(self._placements)
+        num_circuits = [len(submission.circuits) for submission in self._submissions]
+        try:
+            yield
+        except BaseException:
+            # Circuits are only ever appended, so those set aside in the block come last.
+            del self._placements[num_placements:]
+            del self._submissions[len(num_circuits) :]
+            for submission, num in zip(self._submissions, num_circuits):
+                del submission.circuits[num:]
+            raise
+
+    def submit(self) -> list[Exception]:
+        """Submit the circuits set aside so far that have not been submitted yet.
+
+        A submission that fails does not stop the others; it is tried again on the next call.
+
+        Returns:
+            The errors of the submissions that failed.
+        """
+        errors = []
+        for submission in self._submissions:
+            if not submission.job_ids:
+                try:
+                    submission.job_ids = flatten_job_ids(
+                        self.device.run(submission.circuits, shots=submission.shots)
+                    )
+                except Exception as err:
+                    errors.append(err)
+        return errors
+
+    @staticmethod
+    def is_packed(data: dict[str, Any]) -> bool:
+        """Whether the data of a dispatched benchmark refers to circuits set aside by a packer."""
+        return any(job_id.startswith(PLACEHOLDER_PREFIX) for job_id in data["provider_job_ids"])
+
+    def is_submitted(self, data: dict[str, Any]) -> bool:
+        """Whether all the circuits of a dispatched benchmark were submitted."""
+        return all(self._submissions[index].job_ids for index, _ in self._placements_of(data))
+
+    def resolve(self, data: dict[str, Any]) -> None:
+        """Point the data of a dispatched benchmark to the provider jobs holding its circuits.
+
+        The placeholder ids are replaced by the ids of the provider jobs holding the circuits of the
+        benchmark, and `circuit_indices` records the position of each of its circuits, in the order
+        they were run, among the measurement counts of these jobs. Data without placeholder ids is
+        left as is.
+        """
+        if not self.is_packed(data):
+            return
+        placements = self._placements_of(data)
+        used = sorted({index for index, _ in placements})
+        offsets = dict(
+            zip(
+                used,
+                itertools.accumulate(
+                    (len(self._submissions[index].circuits) for index in used), initial=0
+                ),
+            )
+        )
+        data["provider_job_ids"] = [
+            job_id for index in used for job_id in self._submissions[index].job_ids
+        ]
+        data["circuit_indices"] = [offsets[index] + position for index, position in placements]
+
+    def _placements_of(self, data: dict[str, Any]) -> list[tuple[int, int]]:
+        return [
+            placement
+            for job_id in data["provider_job_ids"]
+            if job_id.startswith(PLACEHOLDER_PREFIX)
+            for placement in self._placements[int(job_id.removeprefix(PLACEHOLDER_PREFIX))]
+        ]
+
+
+def _register_names(circuit: "QuantumCircuit") -> tuple[str, ...]:
+    # Circuits of other frameworks (e.g. Braket) have no named classical registers.
+    return tuple(register.name for register in getattr(circuit, "cregs", ()))
+
+
+@contextmanager
+def packing(device: "QuantumDevice") -> Iterator[CircuitPacker]:
+    """Set aside the circuits run on `device` through `run_circuits` in the yielded packer."""
+    from metriq_gym.qplatform.device import max_circuits_per_job
+
+    packer = CircuitPacker(device, max_circuits_per_job(device))
+    token = _packer.set(packer)
+    try:
+        yield packer
+    finally:
+        _packer.reset(token)
+
+
+def unpack_results(
+    result_data: list["GateModelResultData"], circuit_indices: list[int]
+) -> list["GateModelResultData"]:
+    """Select the measurement counts of the circuits of one benchmark from packed provider jobs.
+
+    Args:
+        result_data: Result data of the provider jobs holding the circuits of the benchmark.
+        circuit_indices: Position of each circuit of the benchmark among the measurement counts.
+
+    Returns:
+        One result per circuit of the benchmark, in the order the benchmark ran them.
+    """
+    from qbraid import GateModelResultData
+
+    counts = flatten_counts(result_data)
+    return [GateModelResultData(measurement_counts=counts[int(index)]) for index in circuit_indices]
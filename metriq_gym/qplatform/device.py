@@ -1,9 +1,13 @@
+from dataclasses import dataclass
 from functools import singledispatch
 from typing import cast
 
 import networkx as nx
-from qbraid import QuantumDevice
-from qbraid.runtime import BraketDevice, QiskitBackend
+import numpy as np
+from qbraid import QuantumDevice, QuantumJob
+from qbraid.runtime import BraketDevice, QiskitBackend, QiskitJob
+from qiskit import QuantumCircuit
+from qiskit_ibm_runtime import SamplerV2
 import rustworkx as rx
 
 
@@ -36,3 +40,87 @@ def _(device: BraketDevice) -> rx.PyGraph:
         rx.PyGraph,
         rx.networkx_converter(nx.Graph(device._device.topology_graph.to_undirected())),
     )
+
+
+### Run a parameterized circuit once per row of parameter values, bound on the provider side ###
+# The circuit must already be prepared for the device with `device.apply_runtime_profile`.
+@singledispatch
+def run_parameterized(
+    device: QuantumDevice, circuit: QuantumCircuit, parameter_values: np.ndarray, shots: int
+) -> QuantumJob:
+    raise NotImplementedError(
+        f"Parameterized runs not implemented for device of type {type(device)}"
+    )
+
+
+@run_parameterized.register
+def _(
+    device: QiskitBackend, circuit: QuantumCircuit, parameter_values: np.ndarray, shots: int
+) -> QuantumJob:
+    # A single Sampler PUB: the template and a (num_runs x num_parameters) array whose columns
+    # follow the order of circuit.parameters.
+    job = SamplerV2(mode=device._backend).run([(circuit, parameter_values)], shots=shots)
+    return QiskitJob(job.job_id(), job=job, device=device)
+
+
+def supports_parameterized_runs(device: QuantumDevice) -> bool:
+    """Whether `run_parameterized` is implemented for the type of `device`."""
+    return run_parameterized.dispatch(type(device)) is not run_parameterized.dispatch(object)
+
+
+### Maximum number of circuits a single job on the device can hold, None if unknown or unlimited ###
+@singledispatch
+def max_circuits_per_job(device: QuantumDevice) -> int | None:
+    return None
+
+
+@max_circuits_per_job.register
+def _(device: QiskitBackend) -> int | None:
+    return device._backend.max_circuits
+
+
+@dataclass
+class DeviceMetadata:
+    """Device properties needed to prepare benchmark circuits.
+
+    Attributes:
+        provider_name: Name of the provider of the device.
+        device_id: Identifier of the device.
+        version: Backend version of the device, if known.
+        num_qubits: Number of qubits of the device, if known.
+        basis_gates: Native gates of the device.
+        num_nodes: Number of nodes of the connectivity graph.
+        edges: The (num_edges x 2) array of connected qubit pairs.
+    """
+
+    provider_name: str
+    device_id: str
+    version: str | None
+    num_qubits: int | None
+    basis_gates: list[str]
+    num_nodes: int
+    edges: np.ndarray
+
+    def connectivity_graph(self) -> rx.PyGraph:
+        graph = rx.PyGraph(multigraph=False)
+        graph.add_nodes_from(range(self.num_nodes))
+        graph.add_edges_from_no_data([(int(q0), int(q1)) for q0, q1 in self.edges])
+        return graph
+
+
+def device_metadata(device: QuantumDevice) -> DeviceMetadata:
+    """Fetch the metadata of a device from its backend."""
+    try:
+        device_version: str | None = version(device)
+    except NotImplementedError:
+        device_version = None
+    graph = connectivity_graph(device)
+    return DeviceMetadata(
+        provider_name=device.profile.provider_name or "",
+        device_id=device.id,
+        version=device_version,
+        num_qubits=device.num_qubits,
+        basis_gates=sorted(device.profile.basis_gates or []),
+        num_nodes=graph.num_nodes(),
+        edges=np.array(graph.edge_list(), dtype=np.int64).reshape(-1, 2),
+    )
@@ -0,0 +1,95 @@
+"""Local cache of device metadata."""
+
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+from qbraid import QuantumDevice
+
+from metriq_gym.qplatform.device import DeviceMetadata, device_metadata, version
+
+DEFAULT_DEVICE_CACHE_DIR = ".metriq_gym_devices"
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+
+class DeviceMetadataCache:
+    """Stores the connectivity graph and profile of devices on disk.
+
+    Entries are compressed `.npz` files keyed by provider, device and backend version, so a new
+    backend version is fetched right away. Entries older than `ttl_seconds` are fetched again.
+
+    Attributes:
+        directory: Directory holding the cache entries.
+        ttl_seconds: Time after which an entry is considered stale.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+
+    def _path(self, device: QuantumDevice) -> str:
+        try:
+            device_version = version(device)
+        except NotImplementedError:
+            device_version = ""
+        key = f"{device.profile.provider_name}:{device.id}:{device_version}"
+        return os.path.join(self.directory, f"{hashlib.sha256(key.encode()).hexdigest()}.npz")
+
+    def get(self, device: QuantumDevice) -> DeviceMetadata | None:
+        """Return the cached metadata of `device`, or None if missing or stale."""
+        try:
+            with np.load(self._path(device)) as entry:
+                if time.time() - float(entry["fetched_at"]) > self.ttl_seconds:
+                    return None
+                num_qubits = int(entry["num_qubits"])
+                return DeviceMetadata(
+                    provider_name=str(entry["provider_name"]),
+                    device_id=str(entry["device_id"]),
+                    version=str(entry["version"]) if entry["has_version"] else None,
+                    num_qubits=None if num_qubits < 0 else num_qubits,
+                    basis_gates=entry["basis_gates"].tolist(),
+                    num_nodes=int(entry["num_nodes"]),
+                    edges=entry["edges"],
+                )
+        except FileNotFoundError:
+            return None
+
+    def put(self, device: QuantumDevice, metadata: DeviceMetadata) -> None:
+        path = self._path(device)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as file:
+            np.savez_compressed(
+                file,
+                fetched_at=np.array(time.time()),
+                provider_name=np.array(metadata.provider_name),
+                device_id=np.array(metadata.device_id),
+                has_version=np.array(metadata.version is not None),
+                version=np.array(metadata.version or ""),
+                num_qubits=np.array(-1 if metadata.num_qubits is None else metadata.num_qubits),
+                basis_gates=np.array(metadata.basis_gates, dtype=str),
+                num_nodes=np.array(metadata.num_nodes),
+                edges=metadata.edges,
+            )
+        os.replace(tmp_path, path)
+
+
+def load_device_metadata(
+    device: QuantumDevice, refresh: bool = False, cache: DeviceMetadataCache | None = None
+) -> DeviceMetadata:
+    """Return the metadata of `device`, from the local cache unless missing, stale or `refresh`.
+
+    The cache location and time to live default to the `METRIQ_GYM_DEVICE_CACHE_DIR` and
+    `METRIQ_GYM_DEVICE_CACHE_TTL` (in seconds) environment variables.
+    """
+    cache = cache or DeviceMetadataCache(
+        os.environ.get("METRIQ_GYM_DEVICE_CACHE_DIR", DEFAULT_DEVICE_CACHE_DIR),
+        float(os.environ.get("METRIQ_GYM_DEVICE_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+    )
+    metadata = None if refresh else cache.get(device)
+    if metadata is None:
+        metadata = device_metadata(device)
+        cache.put(device, metadata)
+    return metadata
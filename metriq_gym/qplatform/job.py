@@ -1,35 +1,223 @@
+from dataclasses import dataclass
+from datetime import datetime
 from functools import singledispatch
+import threading
+from typing import Any
+import weakref
 
 from qbraid import QuantumJob
-from qbraid.runtime import QiskitJob, AzureQuantumJob, BraketQuantumTask
+from qbraid.runtime import (
+    AzureQuantumJob,
+    BraketQuantumTask,
+    GateModelResultData,
+    JobStatus,
+    QiskitJob,
+    Result,
+)
+from qbraid.runtime.aws.job import AWS_TASK_STATUS_MAP
 from qiskit_ibm_runtime.execution_span import ExecutionSpans
 
 
-@singledispatch
-def execution_time(quantum_job: QuantumJob) -> float:
-    raise NotImplementedError(f"Execution time not implemented for type {type(quantum_job)}")
+class CachedQuantumJob(QuantumJob):
+    """A completed provider job whose result data and timing were stored locally.
+
+    It stands in for the provider job once its results have been downloaded, so that
+    introspection functions do not need to reach the provider again.
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        device_id: str,
+        result_data: GateModelResultData,
+        metadata: "JobMetadata | None" = None,
+    ):
+        super().__init__(job_id)
+        self.device_id = device_id
+        self.result_data = result_data
+        self.metadata = metadata or JobMetadata()
+
+    def status(self) -> JobStatus:
+        return JobStatus.COMPLETED
+
+    def result(self) -> Result:
+        return Result(device_id=self.device_id, job_id=self.id, success=True, data=self.result_data)
+
+    def cancel(self) -> None:
+        raise NotImplementedError("A cached job is already completed")
+
+
+@dataclass
+class JobMetadata:
+    """Status and timing of a provider job, in the same terms for every provider.
 
+    Each provider fills in what it reports. A field left to None is unknown; fields the provider
+    does not report at all are also listed in `unavailable`.
 
-@execution_time.register
-def _(quantum_job: QiskitJob) -> float:
-    execution_spans: ExecutionSpans = quantum_job._job.result().metadata["execution"][
-        "execution_spans"
-    ]
-    return (execution_spans.stop - execution_spans.start).total_seconds()
+    Attributes:
+        status: Status of the job.
+        queued_at: Time the job was submitted to the provider queue.
+        started_at: Time the provider started processing the job (e.g. compiling it).
+        execution_start: Time the device started executing the job.
+        execution_end: Time the device finished executing the job.
+        ended_at: Time the job reached a final state.
+        execution_duration: Execution time reported as a duration, in seconds, by providers that
+            do not report when the execution started and ended.
+        circuit_spans: Execution start and end of each circuit of the job, in submission order.
+        unavailable: Names of the fields the provider does not report.
+    """
 
+    status: JobStatus | None = None
+    queued_at: datetime | None = None
+    started_at: datetime | None = None
+    execution_start: datetime | None = None
+    execution_end: datetime | None = None
+    ended_at: datetime | None = None
+    execution_duration: float | None = None
+    circuit_spans: list[tuple[datetime, datetime]] | None = None
+    unavailable: frozenset[str] = frozenset()
 
-@execution_time.register
-def _(quantum_job: AzureQuantumJob) -> float:
-    start_time = quantum_job._job.details.begin_execution_time
-    end_time = quantum_job._job.details.end_execution_time
-    if start_time is None or end_time is None:
+    def execution_time(self) -> float:
+        """Time the device spent executing the job, in seconds, excluding queueing."""
+        if self.execution_start is not None and self.execution_end is not None:
+            return (self.execution_end - self.execution_start).total_seconds()
+        if self.execution_duration is not None:
+            return self.execution_duration
         raise ValueError("Execution time not available")
-    return (end_time - start_time).total_seconds()
+
+    def completion_time(self) -> datetime:
+        """Time the job finished, i.e. when its results became available."""
+        end = self.ended_at or self.execution_end
+        if end is None:
+            raise ValueError("Completion time not available")
+        return end
+
+
+### Metadata of a provider job, parsed from the details attached to its result, or fetched ###
+@singledispatch
+def provider_job_metadata(
+    quantum_job: QuantumJob, details: dict[str, Any] | None = None
+) -> JobMetadata:
+    raise NotImplementedError(f"Job metadata not implemented for type {type(quantum_job)}")
+
+
+@provider_job_metadata.register
+def _(quantum_job: CachedQuantumJob, details: dict[str, Any] | None = None) -> JobMetadata:
+    return quantum_job.metadata
+
+
+@provider_job_metadata.register
+def _(quantum_job: QiskitJob, details: dict[str, Any] | None = None) -> JobMetadata:
+    if details is None:
+        details = quantum_job._job.result().metadata
+    execution_spans: ExecutionSpans = details["execution"]["execution_spans"]
+    circuit_spans = []
+    for pub_idx in sorted(execution_spans.pub_idxs):
+        pub_spans = [span for span in execution_spans if span.contains_pub(pub_idx)]
+        circuit_spans.append(
+            (min(span.start for span in pub_spans), max(span.stop for span in pub_spans))
+        )
+    # Queueing and job-level timestamps are not part of the result metadata: IBM Runtime jobs
+    # report them in their metrics, other jobs (e.g. local simulators) not at all.
+    unavailable = {"execution_duration"}
+    timestamps: dict[str, Any] = {}
+    if hasattr(quantum_job._job, "metrics"):
+        timestamps = quantum_job._job.metrics().get("timestamps") or {}
+    else:
+        unavailable |= {"queued_at", "started_at", "ended_at"}
+    return JobMetadata(
+        status=JobStatus.COMPLETED,
+        queued_at=_parse_timestamp(timestamps.get("created")),
+        started_at=_parse_timestamp(timestamps.get("running")),
+        execution_start=execution_spans.start,
+        execution_end=execution_spans.stop,
+        ended_at=_parse_timestamp(timestamps.get("finished")),
+        circuit_spans=circuit_spans,
+        unavailable=frozenset(unavailable),
+    )
+
+
+def _parse_timestamp(value: Any) -> datetime | None:
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value) if isinstance(value, str) else None
+
+
+@provider_job_metadata.register
+def _(quantum_job: AzureQuantumJob, details: dict[str, Any] | None = None) -> JobMetadata:
+    job_details = quantum_job._job.details
+    return JobMetadata(
+        queued_at=job_details.creation_time,
+        execution_start=job_details.begin_execution_time,
+        execution_end=job_details.end_execution_time,
+        ended_at=job_details.end_execution_time,
+        unavailable=frozenset({"started_at", "execution_duration", "circuit_spans"}),
+    )
+
+
+@provider_job_metadata.register
+def _(quantum_job: BraketQuantumTask, details: dict[str, Any] | None = None) -> JobMetadata:
+    if details is None:
+        details = quantum_job._task.metadata()
+    status = AWS_TASK_STATUS_MAP.get(details.get("status", ""), JobStatus.UNKNOWN)
+    # Braket only timestamps the creation and the end of a task, which includes queueing.
+    # Simulators report how long the execution took in the task result (already downloaded by
+    # the time the task is completed).
+    unavailable = {"started_at", "execution_start", "execution_end", "circuit_spans"}
+    execution_duration = None
+    if status == JobStatus.COMPLETED:
+        simulator_metadata = quantum_job._task.result().additional_metadata.simulatorMetadata
+        if simulator_metadata is not None:
+            execution_duration = simulator_metadata.executionDuration / 1000
+    if execution_duration is None:
+        unavailable.add("execution_duration")
+    return JobMetadata(
+        status=status,
+        queued_at=details.get("createdAt"),
+        ended_at=details.get("endedAt"),
+        execution_duration=execution_duration,
+        unavailable=frozenset(unavailable),
+    )
+
+
+_job_metadata: "weakref.WeakKeyDictionary[QuantumJob, JobMetadata]" = weakref.WeakKeyDictionary()
+# Details attached to the results of jobs, parsed into their metadata when it is first requested.
+_job_details: "weakref.WeakKeyDictionary[QuantumJob, dict[str, Any]]" = weakref.WeakKeyDictionary()
+_job_metadata_lock = threading.Lock()
+
+
+def _remember(quantum_job: QuantumJob, metadata: JobMetadata) -> None:
+    # Only the metadata of finished jobs is final and can be reused.
+    if metadata.execution_end is not None or metadata.ended_at is not None:
+        with _job_metadata_lock:
+            _job_metadata[quantum_job] = metadata
+
+
+def job_metadata(quantum_job: QuantumJob) -> JobMetadata:
+    """Return the metadata of a provider job, requesting it from the provider at most once."""
+    with _job_metadata_lock:
+        metadata = _job_metadata.get(quantum_job)
+        details = _job_details.get(quantum_job)
+    if metadata is None:
+        metadata = provider_job_metadata(quantum_job, details)
+        _remember(quantum_job, metadata)
+    return metadata
+
+
+def record_job_metadata(quantum_job: QuantumJob, result: Result) -> None:
+    """Keep the details the provider attached to the result of a job, to avoid fetching them again.
+
+    Nothing is requested from the provider here: what the details leave out (e.g. the timestamps
+    of IBM Runtime jobs) is only requested along with the rest of the metadata by `job_metadata`.
+    """
+    if result.details:
+        with _job_metadata_lock:
+            _job_details[quantum_job] = result.details
+
+
+def execution_time(quantum_job: QuantumJob) -> float:
+    return job_metadata(quantum_job).execution_time()
 
 
-@execution_time.register
-def _(quantum_job: BraketQuantumTask) -> float:
-    # TODO: for speed benchmarking, we need 'execution' metadata instead of 'createdAt' and 'endedAt'
-    return (
-        quantum_job._task.metadata()["endedAt"] - quantum_job._task.metadata()["createdAt"]
-    ).total_seconds()
+def completion_time(quantum_job: QuantumJob) -> datetime:
+    return job_metadata(quantum_job).completion_time()
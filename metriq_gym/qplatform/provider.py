@@ -0,0 +1,20 @@
+from functools import singledispatch
+from typing import Any
+
+from qbraid.runtime import AzureQuantumProvider, QiskitRuntimeProvider, QuantumProvider
+
+
+### Keyword arguments for qbraid.runtime.load_job reusing the provider's authenticated session ###
+@singledispatch
+def job_loader_kwargs(provider: QuantumProvider) -> dict[str, Any]:
+    return {}
+
+
+@job_loader_kwargs.register
+def _(provider: QiskitRuntimeProvider) -> dict[str, Any]:
+    return {"service": provider.runtime_service}
+
+
+@job_loader_kwargs.register
+def _(provider: AzureQuantumProvider) -> dict[str, Any]:
+    return {"workspace": provider.workspace}
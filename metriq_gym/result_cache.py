@@ -0,0 +1,198 @@
+"""Local cache of the results downloaded from providers."""
+
+from datetime import datetime, timezone
+import hashlib
+import logging
+import os
+import threading
+
+import numpy as np
+from qbraid import QuantumJob
+from qbraid.runtime import GateModelResultData, JobStatus
+from qbraid.runtime.result_data import MeasCount
+
+from metriq_gym.qplatform.job import CachedQuantumJob, JobMetadata, job_metadata
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+_TIMESTAMP_FIELDS = ["queued_at", "started_at", "execution_start", "execution_end", "ended_at"]
+
+
+def _to_timestamp(time: datetime | None) -> float:
+    return np.nan if time is None else time.timestamp()
+
+
+def _from_timestamp(timestamp: float) -> datetime | None:
+    return None if np.isnan(timestamp) else datetime.fromtimestamp(timestamp, timezone.utc)
+
+
+def _metadata_arrays(metadata: JobMetadata) -> dict[str, np.ndarray]:
+    arrays = {name: np.array(_to_timestamp(getattr(metadata, name))) for name in _TIMESTAMP_FIELDS}
+    arrays["status"] = np.array("" if metadata.status is None else metadata.status.name)
+    arrays["execution_duration"] = np.array(
+        np.nan if metadata.execution_duration is None else metadata.execution_duration
+    )
+    arrays["has_circuit_spans"] = np.array(metadata.circuit_spans is not None)
+    arrays["circuit_spans"] = np.array(
+        [[start.timestamp(), stop.timestamp()] for start, stop in metadata.circuit_spans or []],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+    arrays["unavailable"] = np.array(sorted(metadata.unavailable), dtype=str)
+    return arrays
+
+
+def _metadata_from_entry(entry: np.lib.npyio.NpzFile) -> JobMetadata:
+    status = str(entry["status"])
+    execution_duration = float(entry["execution_duration"])
+    circuit_spans = None
+    if entry["has_circuit_spans"]:
+        circuit_spans = [
+            (
+                datetime.fromtimestamp(start, timezone.utc),
+                datetime.fromtimestamp(stop, timezone.utc),
+            )
+            for start, stop in entry["circuit_spans"].tolist()
+        ]
+    return JobMetadata(
+        status=JobStatus[status] if status else None,
+        **{name: _from_timestamp(float(entry[name])) for name in _TIMESTAMP_FIELDS},
+        execution_duration=None if np.isnan(execution_duration) else execution_duration,
+        circuit_spans=circuit_spans,
+        unavailable=frozenset(entry["unavailable"].tolist()),
+    )
+
+
+class ResultCache:
+    """Stores the measurement counts and timing metadata of completed provider jobs on disk.
+
+    Completed provider jobs are immutable, so entries never need to be invalidated. Each entry is
+    a compressed `.npz` file keyed by provider and provider job id. Reading an entry marks it as
+    recently used; once the cache grows over `max_bytes`, least recently used entries are evicted.
+
+    Attributes:
+        directory: Directory holding the cache entries.
+        max_bytes: Size cap of the cache.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, provider_name: str, job_id: str) -> str:
+        digest = hashlib.sha256(f"{provider_name}:{job_id}".encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.npz")
+
+    def get(self, provider_name: str, job_id: str) -> CachedQuantumJob | None:
+        """Return the cached job, or None if it is not in the cache."""
+        path = self._path(provider_name, job_id)
+        try:
+            with np.load(path) as entry:
+                num_experiments = int(entry["num_experiments"])
+                counts = [
+                    MeasCount(zip(entry[f"keys_{i}"].tolist(), entry[f"values_{i}"].tolist()))
+                    for i in range(num_experiments)
+                ]
+                batched = bool(entry["batched"])
+                device_id = str(entry["device_id"])
+                metadata = _metadata_from_entry(entry)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        if batched:
+            measurement_counts: list[MeasCount] | MeasCount | None = counts
+        else:
+            measurement_counts = counts[0] if counts else None
+        return CachedQuantumJob(
+            job_id,
+            device_id,
+            GateModelResultData(measurement_counts=measurement_counts),
+            metadata,
+        )
+
+    def get_many(self, provider_name: str, job_ids: list[str]) -> list[CachedQuantumJob] | None:
+        """Return the cached jobs, or None unless all of them are in the cache."""
+        cached_jobs = []
+        for job_id in job_ids:
+            cached_job = self.get(provider_name, job_id)
+            if cached_job is None:
+                return None
+            cached_jobs.append(cached_job)
+        return cached_jobs
+
+    def put(
+        self,
+        provider_name: str,
+        quantum_job: QuantumJob,
+        result_data: GateModelResultData,
+        device_id: str = "",
+    ) -> CachedQuantumJob:
+        """Store the result data and timing metadata of a completed provider job.
+
+        Timing metadata that the provider does not report is stored as empty. Any other error
+        fetching it, e.g. a network error, is raised without writing the entry, so that the next
+        poll tries again.
+
+        Returns:
+            The cached job standing in for `quantum_job`.
+        """
+        try:
+            metadata = job_metadata(quantum_job)
+        except (NotImplementedError, ValueError, KeyError):
+            # Timing metadata is not available for every provider and device, and providers leave
+            # out some of its fields for some devices.
+            metadata = JobMetadata()
+        measurement_counts = result_data.measurement_counts
+        batched = isinstance(measurement_counts, list)
+        counts: list[MeasCount]
+        if measurement_counts is None:
+            counts = []
+        else:
+            counts = measurement_counts if batched else [measurement_counts]
+
+        arrays = {
+            "num_experiments": np.array(len(counts)),
+            "batched": np.array(batched),
+            "device_id": np.array(device_id),
+            **_metadata_arrays(metadata),
+        }
+        for i, experiment_counts in enumerate(counts):
+            arrays[f"keys_{i}"] = np.array(list(experiment_counts.keys()), dtype=str)
+            arrays[f"values_{i}"] = np.array(list(experiment_counts.values()), dtype=np.int64)
+
+        path = self._path(provider_name, quantum_job.id)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as file:
+            np.savez_compressed(file, **arrays)
+        os.replace(tmp_path, path)
+        self._evict(keep=path)
+        return CachedQuantumJob(
+            quantum_job.id,
+            device_id,
+            GateModelResultData(measurement_counts=measurement_counts),
+            metadata,
+        )
+
+    def _evict(self, keep: str) -> None:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+            logger.debug(f"Evicted {path} from the result cache")
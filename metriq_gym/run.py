@@ -1,35 +1,44 @@
 import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import asdict
 from datetime import datetime
 import sys
 import logging
+from typing import TYPE_CHECKING, Any
 import uuid
 from dotenv import load_dotenv
 
-from qbraid import QbraidError
-from qbraid.runtime import (
-    get_providers,
-    GateModelResultData,
-    JobStatus,
-    QuantumDevice,
-    QuantumProvider,
-    load_job,
-    load_provider,
+from metriq_gym.benchmarks import (
+    BENCHMARK_DATA_CLASSES,
+    BENCHMARK_HANDLERS,
+    BENCHMARK_RESULT_CLASSES,
 )
-
-from metriq_gym.benchmarks import BENCHMARK_DATA_CLASSES, BENCHMARK_HANDLERS
-from metriq_gym.benchmarks.benchmark import Benchmark, BenchmarkData
-from metriq_gym.cli import parse_arguments, prompt_for_job
-from metriq_gym.exceptions import QBraidSetupError
+from metriq_gym.cli import (
+    list_group_results,
+    list_jobs,
+    list_poll_outcomes,
+    parse_arguments,
+    prompt_for_job,
+)
+from metriq_gym.exceptions import ProviderJobError, QBraidSetupError
+from metriq_gym.helpers.task_helpers import DEFAULT_MAX_WORKERS, fetch_results
 from metriq_gym.job_manager import JobManager, MetriqGymJob
-from metriq_gym.schema_validator import load_and_validate, validate_and_create_model
 from metriq_gym.job_type import JobType
 
+# qbraid, the benchmarks and the schema validation take seconds to import, so each command
+# imports what it uses when it runs: viewing jobs needs none of them.
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+    from qbraid.runtime import QuantumDevice, QuantumProvider
+
+    from metriq_gym.benchmarks.benchmark import Benchmark, BenchmarkData, BenchmarkResult
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("metriq_gym")
 
 
-def setup_device(provider_name: str, backend_name: str) -> QuantumDevice:
+def setup_device(provider_name: str, backend_name: str) -> "QuantumDevice":
     """
     Setup a QBraid device with id backend_name from specified provider.
 
@@ -39,6 +48,9 @@ def setup_device(provider_name: str, backend_name: str) -> QuantumDevice:
     Raises:
         QBraidSetupError: If no device matching the name is found in the provider.
     """
+    from qbraid import QbraidError
+    from qbraid.runtime import get_providers, load_provider
+
     try:
         provider: QuantumProvider = load_provider(provider_name)
     except QbraidError:
@@ -57,61 +69,431 @@ def setup_device(provider_name: str, backend_name: str) -> QuantumDevice:
     return device
 
 
-def setup_benchmark(args, params, job_type: JobType) -> Benchmark:
+def setup_benchmark(args, params, job_type: JobType) -> "Benchmark":
     return BENCHMARK_HANDLERS[job_type](args, params)
 
 
-def setup_job_data_class(job_type: JobType) -> type[BenchmarkData]:
+def setup_job_data_class(job_type: JobType) -> "type[BenchmarkData]":
     return BENCHMARK_DATA_CLASSES[job_type]
 
 
+def setup_result_class(job_type: JobType) -> "type[BenchmarkResult]":
+    return BENCHMARK_RESULT_CLASSES[job_type]
+
+
+def dispatch_benchmark(
+    args: argparse.Namespace,
+    params: "BaseModel",
+    device: "QuantumDevice",
+    provider_name: str,
+    device_name: str,
+    suite_id: str | None = None,
+) -> MetriqGymJob:
+    """Dispatch a benchmark to a device and return the record of the resulting job."""
+    job_type = JobType(params.benchmark_name)
+    handler: Benchmark = setup_benchmark(args, params, job_type)
+    job_data: BenchmarkData = handler.dispatch_handler(device)
+    return MetriqGymJob(
+        id=str(uuid.uuid4()),
+        job_type=job_type,
+        params=params.model_dump(),
+        data=asdict(job_data),
+        provider_name=provider_name,
+        device_name=device_name,
+        dispatch_time=datetime.now(),
+        suite_id=suite_id,
+    )
+
+
+def dispatch_packed(
+    args: argparse.Namespace,
+    models: "list[BaseModel]",
+    device: "QuantumDevice",
+    provider_name: str,
+    device_name: str,
+    suite_id: str | None = None,
+) -> list[MetriqGymJob]:
+    """Dispatch benchmarks to a device, packing their circuits into shared provider jobs.
+
+    The circuits the benchmarks run are submitted once all of them are dispatched, in as few
+    provider jobs as the device accepts (see `metriq_gym.packing`). Benchmarks that do not pack
+    their circuits, such as CLOPS, submit their own jobs as usual. A benchmark that fails is
+    reported without affecting the others, as is one whose packed circuits fail to be submitted.
+
+    Returns:
+        The records of the dispatched jobs.
+    """
+    from metriq_gym.packing import packing
+
+    metriq_jobs = []
+    with packing(device) as packer:
+        for params in models:
+            try:
+                with packer.rollback_on_error():
+                    metriq_jobs.append(
+                        dispatch_benchmark(
+                            args, params, device, provider_name, device_name, suite_id
+                        )
+                    )
+            except Exception as err:
+                logger.error(f"Failed to dispatch {params.benchmark_name} to {device_name}: {err}")
+    for submit_error in packer.submit():
+        logger.error(f"Failed to submit packed circuits to {device_name}: {submit_error}")
+    dispatched_jobs = []
+    for metriq_job in metriq_jobs:
+        if not packer.is_submitted(metriq_job.data):
+            logger.error(
+                f"Failed to dispatch {metriq_job.job_type.value} to {device_name}: its packed "
+                "circuits were not all submitted"
+            )
+            continue
+        packer.resolve(metriq_job.data)
+        dispatched_jobs.append(metriq_job)
+    logger.info(
+        f"Packed the circuits of {len(metriq_jobs)} benchmarks into {packer.num_submissions} "
+        f"submissions to {device_name}."
+    )
+    return dispatched_jobs
+
+
 def dispatch_job(args: argparse.Namespace, job_manager: JobManager) -> None:
+    """Dispatch the benchmark of an input file to a device.
+
+    An input file with parameter sweeps expands into one job per point of the sweep grid. These
+    are dispatched to the device, set up once, and recorded with the same suite id. A point that
+    fails to dispatch is reported without affecting the others. With `args.pack`, the circuits of
+    the points are packed into shared provider jobs (see `dispatch_packed`).
+    """
+    from metriq_gym.schema_validator import load_json_file, validate_and_create_model, validate_many
+    from metriq_gym.sweep import expand_sweep
+
     logger.info("Starting job dispatch...")
     try:
         device = setup_device(args.provider, args.device)
     except QBraidSetupError:
         return
 
-    params = load_and_validate(args.input_file)
-    logger.info(f"Dispatching {params.benchmark_name} benchmark job on {args.device} device...")
+    points = expand_sweep(load_json_file(args.input_file))
+    if len(points) == 1:
+        if getattr(args, "pack", False):
+            logger.warning("Nothing to pack: the input file has no parameter sweep.")
+        params = validate_and_create_model(points[0])
+        logger.info(f"Dispatching {params.benchmark_name} benchmark job on {args.device} device...")
+        job_id = job_manager.add_job(
+            dispatch_benchmark(args, params, device, args.provider, args.device)
+        )
+        print(f"Job dispatched with ID: {job_id}")
+        return
 
-    job_type = JobType(params.benchmark_name)
-    handler: Benchmark = setup_benchmark(args, params, job_type)
-    job_data: BenchmarkData = handler.dispatch_handler(device)
-    job_id = job_manager.add_job(
-        MetriqGymJob(
-            id=str(uuid.uuid4()),
-            job_type=job_type,
-            params=params.model_dump(),
-            data=asdict(job_data),
-            provider_name=args.provider,
-            device_name=args.device,
-            dispatch_time=datetime.now(),
+    models = validate_many(points)
+    suite_id = str(uuid.uuid4())
+    logger.info(
+        f"Dispatching a sweep of {len(models)} {models[0].benchmark_name} benchmark jobs on "
+        f"{args.device} device..."
+    )
+    if getattr(args, "pack", False):
+        metriq_jobs = dispatch_packed(args, models, device, args.provider, args.device, suite_id)
+        for metriq_job in metriq_jobs:
+            job_manager.add_job(metriq_job)
+    else:
+        metriq_jobs = []
+        for params in models:
+            try:
+                metriq_job = dispatch_benchmark(
+                    args, params, device, args.provider, args.device, suite_id
+                )
+            except Exception as err:
+                logger.error(f"Failed to dispatch sweep point {params.model_dump()}: {err}")
+                continue
+            job_manager.add_job(metriq_job)
+            metriq_jobs.append(metriq_job)
+    list_jobs(metriq_jobs)
+    print(f"Dispatched {len(metriq_jobs)} of {len(models)} jobs with suite ID: {suite_id}")
+
+
+def dispatch_suite(args: argparse.Namespace, job_manager: JobManager) -> None:
+    """Dispatch every benchmark configuration of a suite to every device of the suite.
+
+    The device-independent preparation of the configurations that have one (e.g. simulating
+    Quantum Volume circuits) runs first, in up to `args.max_workers` processes. Devices are then set up and jobs
+    submitted from up to `args.max_submissions` threads. A configuration or device that fails is
+    reported without affecting the others. All dispatched jobs are recorded with the same suite id.
+    With `args.pack`, the circuits of the benchmarks dispatched to a device are packed into shared
+    provider jobs (see `dispatch_packed`).
+    """
+    from metriq_gym.schema_validator import validate_and_create_model
+    from metriq_gym.suite import SuiteDevice, load_suite, needs_preparation, prepare_benchmark
+
+    suite = load_suite(args.suite_file)
+    suite_id = str(uuid.uuid4())
+    logger.info(
+        f"Dispatching suite '{suite.name}': {len(suite.benchmarks)} benchmarks on "
+        f"{len(suite.devices)} devices..."
+    )
+
+    to_prepare = [params for params in suite.benchmarks if needs_preparation(params)]
+    if to_prepare:
+        with ProcessPoolExecutor(max_workers=args.max_workers) as process_executor:
+            futures = [
+                process_executor.submit(prepare_benchmark, args, params) for params in to_prepare
+            ]
+            for params, future in zip(to_prepare, futures):
+                try:
+                    future.result()
+                except Exception as err:
+                    # The dispatch handlers redo the preparation they need, so this is not fatal.
+                    logger.warning(
+                        f"Failed to prepare {params['benchmark_name']} ahead of time: {err}"
+                    )
+
+    def setup(suite_device: SuiteDevice) -> "QuantumDevice | None":
+        try:
+            return setup_device(suite_device.provider, suite_device.device)
+        except Exception as err:
+            logger.error(f"Failed to set up device {suite_device.device}: {err}")
+            return None
+
+    models = [validate_and_create_model(params) for params in suite.benchmarks]
+
+    def dispatch(entry: "tuple[BaseModel, SuiteDevice, QuantumDevice]") -> MetriqGymJob | None:
+        params, suite_device, device = entry
+        try:
+            return dispatch_benchmark(
+                args, params, device, suite_device.provider, suite_device.device, suite_id
+            )
+        except Exception as err:
+            logger.error(
+                f"Failed to dispatch {params.benchmark_name} to {suite_device.device}: {err}"
+            )
+            return None
+
+    def dispatch_packed_to(entry: "tuple[SuiteDevice, QuantumDevice]") -> list[MetriqGymJob]:
+        suite_device, device = entry
+        return dispatch_packed(
+            args, models, device, suite_device.provider, suite_device.device, suite_id
         )
+
+    with ThreadPoolExecutor(max_workers=args.max_submissions) as thread_executor:
+        devices = list(thread_executor.map(setup, suite.devices))
+        available = [
+            (suite_device, device)
+            for suite_device, device in zip(suite.devices, devices)
+            if device is not None
+        ]
+        metriq_jobs: list[MetriqGymJob | None]
+        if getattr(args, "pack", False):
+            # All the benchmarks of a device are dispatched from one thread, to pack their circuits.
+            metriq_jobs = [
+                metriq_job
+                for device_jobs in thread_executor.map(dispatch_packed_to, available)
+                for metriq_job in device_jobs
+            ]
+        else:
+            entries = [(params, *entry) for params in models for entry in available]
+            metriq_jobs = list(thread_executor.map(dispatch, entries))
+
+    # Jobs are recorded from this thread: the job store is not shared across threads.
+    dispatched_jobs = [metriq_job for metriq_job in metriq_jobs if metriq_job is not None]
+    for metriq_job in dispatched_jobs:
+        job_manager.add_job(metriq_job)
+    list_jobs(dispatched_jobs)
+    num_jobs = len(suite.benchmarks) * len(suite.devices)
+    print(f"Dispatched {len(dispatched_jobs)} of {num_jobs} jobs with suite ID: {suite_id}")
+
+
+def poll_metriq_job(
+    args: argparse.Namespace,
+    job_manager: JobManager,
+    metriq_job: MetriqGymJob,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    loader_kwargs: dict[str, Any] | None = None,
+) -> "BenchmarkResult | None":
+    """Fetch the provider results of a metriq-gym job and compute its benchmark result.
+
+    Args:
+        args: Parsed command-line arguments.
+        job_manager: The job manager holding the job record.
+        metriq_job: The job to poll.
+        max_workers: Maximum number of concurrent requests to the provider.
+        loader_kwargs: Extra keyword arguments for loading the provider jobs, e.g. to reuse an
+            authenticated provider session.
+
+    Returns:
+        The benchmark result, or None if the provider jobs are not all completed yet.
+    """
+    from qbraid.runtime import load_job
+
+    from metriq_gym.schema_validator import validate_and_create_model
+
+    job_type: JobType = JobType(metriq_job.job_type)
+    handler = setup_benchmark(args, validate_and_create_model(metriq_job.params), job_type)
+    provider_job_ids = metriq_job.data["provider_job_ids"]
+    cached_jobs = job_manager.result_cache.get_many(metriq_job.provider_name, provider_job_ids)
+    if cached_jobs is None:
+        loader_kwargs = {**(loader_kwargs or {}), **metriq_job.data}
+        quantum_jobs = [
+            load_job(job_id, provider=metriq_job.provider_name, **loader_kwargs)
+            for job_id in provider_job_ids
+        ]
+        result_data = fetch_results(quantum_jobs, max_workers=max_workers)
+        if result_data is None:
+            return None
+        cached_jobs = [
+            job_manager.result_cache.put(
+                metriq_job.provider_name, quantum_job, data, metriq_job.device_name
+            )
+            for quantum_job, data in zip(quantum_jobs, result_data)
+        ]
+    job_data: BenchmarkData = setup_job_data_class(job_type)(
+        **job_manager.load_job_data(metriq_job)
     )
-    print(f"Job dispatched with ID: {job_id}")
+    result_data = [cached_job.result().data for cached_job in cached_jobs]
+    if job_data.circuit_indices is not None:
+        from metriq_gym.packing import unpack_results
+
+        # The provider jobs are shared with other benchmarks packed along with this one.
+        result_data = unpack_results(result_data, job_data.circuit_indices)
+    return handler.poll_handler(job_data, result_data, list(cached_jobs))
+
+
+def recorded_result(metriq_job: MetriqGymJob) -> "BenchmarkResult | None":
+    """Return the recorded result of a job, or None if there is none for the current schema."""
+    result_class = setup_result_class(JobType(metriq_job.job_type))
+    if metriq_job.result is None or metriq_job.result_version != result_class.schema_version:
+        return None
+    return result_class(**metriq_job.result)
+
+
+def record_result(
+    job_manager: JobManager, metriq_job: MetriqGymJob, result: "BenchmarkResult"
+) -> None:
+    metriq_job.result = asdict(result)
+    metriq_job.result_version = result.schema_version
+    metriq_job.completion_time = datetime.now()
+    metriq_job.provider_status = None
+    job_manager.update_job(metriq_job)
+
+
+def record_provider_status(job_manager: JobManager, metriq_job: MetriqGymJob, status: str) -> None:
+    """Record that the provider jobs of a job ended without results, so it is not polled again."""
+    metriq_job.provider_status = status
+    job_manager.update_job(metriq_job)
 
 
 def poll_job(args: argparse.Namespace, job_manager: JobManager) -> None:
     metriq_job = prompt_for_job(args, job_manager)
     if not metriq_job:
         return
-    logger.info("Polling job...")
-    job_type: JobType = JobType(metriq_job.job_type)
-    job_data: BenchmarkData = setup_job_data_class(job_type)(**metriq_job.data)
-    handler = setup_benchmark(args, validate_and_create_model(metriq_job.params), job_type)
-    quantum_jobs = [
-        load_job(job_id, provider=metriq_job.provider_name, **asdict(job_data))
-        for job_id in job_data.provider_job_ids
+    if metriq_job.provider_status is not None and not args.recompute:
+        print(f"Job ended on the provider side with status {metriq_job.provider_status}.")
+        return
+    result = None if args.recompute else recorded_result(metriq_job)
+    if result is None:
+        logger.info("Polling job...")
+        try:
+            result = poll_metriq_job(args, job_manager, metriq_job, args.max_workers)
+        except ProviderJobError as err:
+            record_provider_status(job_manager, metriq_job, err.status.name)
+            print(f"Job ended on the provider side with status {err.status.name}: {err}")
+            return
+        if result is None:
+            print("Job is not yet completed. Please try again later.")
+            return
+        record_result(job_manager, metriq_job, result)
+    print(result)
+
+
+def poll_provider_jobs(
+    args: argparse.Namespace,
+    job_manager: JobManager,
+    provider_name: str,
+    metriq_jobs: list[MetriqGymJob],
+) -> "list[tuple[MetriqGymJob, str, BenchmarkResult | None]]":
+    """Poll jobs dispatched to the same provider, at most `args.max_workers` at a time.
+
+    The provider is set up once and its session is shared by all the jobs. A job that fails to
+    be polled is reported as such without affecting the others.
+
+    Returns:
+        A (job, status, result) tuple for each job, where result is None unless the job completed.
+        The status is COMPLETED, PENDING, the FAILED or CANCELLED status of a provider job that
+        ended without results, or ERROR if the job could not be polled.
+    """
+    from qbraid import QbraidError
+    from qbraid.runtime import load_provider
+
+    from metriq_gym.qplatform.provider import job_loader_kwargs
+
+    try:
+        loader_kwargs = job_loader_kwargs(load_provider(provider_name))
+    except QbraidError:
+        logger.warning(f"Could not set up provider '{provider_name}', loading jobs individually.")
+        loader_kwargs = {}
+
+    def poll(metriq_job: MetriqGymJob) -> "tuple[MetriqGymJob, str, BenchmarkResult | None]":
+        try:
+            # Provider jobs of a single metriq-gym job are fetched sequentially so that the
+            # number of concurrent requests to the provider stays within args.max_workers.
+            result = poll_metriq_job(args, job_manager, metriq_job, 1, loader_kwargs)
+        except ProviderJobError as err:
+            logger.error(f"Job {metriq_job.id} ended without results: {err}")
+            return metriq_job, err.status.name, None
+        except Exception as err:
+            logger.error(f"Failed to poll job {metriq_job.id}: {err}")
+            return metriq_job, "ERROR", None
+        return metriq_job, "COMPLETED" if result is not None else "PENDING", result
+
+    with ThreadPoolExecutor(max_workers=args.max_workers) as executor:
+        return list(executor.map(poll, metriq_jobs))
+
+
+def poll_all_jobs(args: argparse.Namespace, job_manager: JobManager) -> None:
+    """Poll every job without a recorded result and record the results of completed ones.
+
+    Jobs whose provider jobs failed or were cancelled are recorded as such and not polled again.
+    With `args.recompute`, all jobs are polled and their results computed again.
+    """
+    metriq_jobs = [
+        metriq_job
+        for metriq_job in job_manager.get_jobs(
+            provider_name=args.provider,
+            device_name=args.device,
+            job_type=args.job_type,
+            suite_id=getattr(args, "suite_id", None),
+        )
+        if args.recompute
+        or (recorded_result(metriq_job) is None and metriq_job.provider_status is None)
     ]
-    if all(task.status() == JobStatus.COMPLETED for task in quantum_jobs):
-        result_data: list[GateModelResultData] = [task.result().data for task in quantum_jobs]
-        print(handler.poll_handler(job_data, result_data, quantum_jobs))
-    else:
-        print("Job is not yet completed. Please try again later.")
+    if not metriq_jobs:
+        print("No pending jobs found.")
+        return
+    jobs_by_provider: dict[str, list[MetriqGymJob]] = defaultdict(list)
+    for metriq_job in metriq_jobs:
+        jobs_by_provider[metriq_job.provider_name].append(metriq_job)
+    logger.info(f"Polling {len(metriq_jobs)} jobs across {len(jobs_by_provider)} providers...")
+
+    with ThreadPoolExecutor(max_workers=len(jobs_by_provider)) as executor:
+        outcomes = [
+            outcome
+            for provider_outcomes in executor.map(
+                lambda item: poll_provider_jobs(args, job_manager, *item),
+                jobs_by_provider.items(),
+            )
+            for outcome in provider_outcomes
+        ]
+
+    for metriq_job, status, result in outcomes:
+        if result is not None:
+            record_result(job_manager, metriq_job, result)
+        elif status in ("FAILED", "CANCELLED"):
+            record_provider_status(job_manager, metriq_job, status)
+    list_poll_outcomes([(metriq_job, status) for metriq_job, status, _ in outcomes])
 
 
 def view_job(args: argparse.Namespace, job_manager: JobManager) -> None:
+    if getattr(args, "suite_id", None) and not args.job_id:
+        list_group_results(job_manager.get_jobs(suite_id=args.suite_id))
+        return
     metriq_job = prompt_for_job(args, job_manager)
     if metriq_job:
         print(metriq_job)
@@ -125,10 +507,15 @@ def main() -> int:
 
     if args.action == "dispatch":
         dispatch_job(args, job_manager)
+    elif args.action == "suite":
+        dispatch_suite(args, job_manager)
     elif args.action == "view":
         view_job(args, job_manager)
     elif args.action == "poll":
-        poll_job(args, job_manager)
+        if args.all:
+            poll_all_jobs(args, job_manager)
+        else:
+            poll_job(args, job_manager)
     else:
         logging.error("Invalid action specified. Run with --help for usage information.")
         return 1
@@ -1,7 +1,12 @@
+from dataclasses import dataclass
+from functools import lru_cache
 import json
 import os
 from typing import Any
-from jsonschema import validate
+from jsonschema import ValidationError
+from jsonschema.exceptions import best_match
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
 from pydantic import BaseModel, create_model
 
 from metriq_gym.benchmarks import SCHEMA_MAPPING
@@ -19,14 +24,17 @@ def load_json_file(file_path: str) -> dict:
         return json.load(file)
 
 
-def load_schema(benchmark_name: str, schema_dir: str = DEFAULT_SCHEMA_DIR) -> dict:
-    """Load a JSON schema based on the benchmark name."""
+def schema_path(benchmark_name: str, schema_dir: str = DEFAULT_SCHEMA_DIR) -> str:
+    """Return the path of the JSON schema of a benchmark."""
     schema_filename = SCHEMA_MAPPING.get(JobType(benchmark_name))
     if not schema_filename:
         raise ValueError(f"Unsupported benchmark: {benchmark_name}")
+    return os.path.join(schema_dir, schema_filename)
+
 
-    schema_path = os.path.join(schema_dir, schema_filename)
-    return load_json_file(schema_path)
+def load_schema(benchmark_name: str, schema_dir: str = DEFAULT_SCHEMA_DIR) -> dict:
+    """Load a JSON schema based on the benchmark name."""
+    return load_json_file(schema_path(benchmark_name, schema_dir))
 
 
 def create_pydantic_model(schema: dict[str, Any]) -> Any:
@@ -39,22 +47,91 @@ def create_pydantic_model(schema: dict[str, Any]) -> Any:
         "array": (list, ...),
         "object": (dict, ...),
     }
-    fields = {k: type_mapping[v["type"]] for k, v in schema["properties"].items()}
+    required = set(schema.get("required", []))
+    fields: dict[str, Any] = {}
+    for k, v in schema["properties"].items():
+        field_type = type_mapping[v["type"]][0]
+        if k in required:
+            fields[k] = (field_type, ...)
+        elif "default" in v:
+            fields[k] = (field_type, v["default"])
+        else:
+            fields[k] = (field_type | None, None)
     model = create_model(schema["title"], **fields)
     model.model_rebuild()
     return model
 
 
+@dataclass(frozen=True)
+class CompiledSchema:
+    """The schema of a benchmark along with its validator and parameter model.
+
+    Attributes:
+        schema: The JSON schema.
+        validator: A `jsonschema` validator for the schema, checked once when built.
+        model: The Pydantic model of the benchmark parameters.
+    """
+
+    schema: dict[str, Any]
+    validator: Validator
+    model: type[BaseModel]
+
+    def validate(self, params: dict[str, Any]) -> BaseModel:
+        """Validate parameters against the schema and return them as a model instance.
+
+        Raises the same ValidationError as `jsonschema.validate` if validation fails.
+        """
+        error = best_match(self.validator.iter_errors(params))
+        if error is not None:
+            raise error
+        return self.model(**params)
+
+
+@lru_cache(maxsize=None)
+def _compile_schema(path: str) -> CompiledSchema:
+    schema = load_json_file(path)
+    validator_class = validator_for(schema)
+    validator_class.check_schema(schema)
+    return CompiledSchema(schema, validator_class(schema), create_pydantic_model(schema))
+
+
+def compiled_schema(benchmark_name: str, schema_dir: str = DEFAULT_SCHEMA_DIR) -> CompiledSchema:
+    """Return the compiled schema of a benchmark, built once per process and schema file."""
+    return _compile_schema(schema_path(benchmark_name, schema_dir))
+
+
 def validate_and_create_model(
     params: dict[str, Any], schema_dir: str = DEFAULT_SCHEMA_DIR
 ) -> BaseModel:
     if params.get(BENCHMARK_NAME_KEY) is None:
         raise ValueError(f"Missing {BENCHMARK_NAME_KEY} key in input file.")
-    schema = load_schema(params[BENCHMARK_NAME_KEY], schema_dir)
-    validate(params, schema)
+    return compiled_schema(params[BENCHMARK_NAME_KEY], schema_dir).validate(params)
 
-    model = create_pydantic_model(schema)
-    return model(**params)
+
+def validate_many(
+    params_list: list[dict[str, Any]], schema_dir: str = DEFAULT_SCHEMA_DIR
+) -> list[BaseModel]:
+    """Validate the parameters of many benchmarks, e.g. the entries of a suite file.
+
+    Each schema is compiled at most once, however many entries use it.
+
+    Returns:
+        The parameters of each entry as a model instance, in the same order as `params_list`.
+
+    Raises:
+        ValueError: If an entry has no benchmark name or an unsupported one.
+        ValidationError: If an entry is invalid. Its path starts with the entry index.
+    """
+    models = []
+    for index, params in enumerate(params_list):
+        if params.get(BENCHMARK_NAME_KEY) is None:
+            raise ValueError(f"Missing {BENCHMARK_NAME_KEY} key in entry {index}.")
+        try:
+            models.append(compiled_schema(params[BENCHMARK_NAME_KEY], schema_dir).validate(params))
+        except ValidationError as error:
+            error.path.appendleft(index)
+            raise
+    return models
 
 
 def load_and_validate(file_path: str, schema_dir: str = DEFAULT_SCHEMA_DIR) -> BaseModel:
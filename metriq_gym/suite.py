@@ -0,0 +1,93 @@
+"""Suites of benchmark configurations dispatched to several devices."""
+
+import argparse
+from dataclasses import dataclass
+import os
+from typing import Any
+
+import numpy as np
+from jsonschema import validate
+
+from metriq_gym.benchmarks import BENCHMARK_HANDLERS
+from metriq_gym.benchmarks.benchmark import Benchmark
+from metriq_gym.job_type import JobType
+from metriq_gym.schema_validator import (
+    BENCHMARK_NAME_KEY,
+    DEFAULT_SCHEMA_DIR,
+    load_json_file,
+    validate_and_create_model,
+    validate_many,
+)
+from metriq_gym.sweep import expand_sweep
+
+SUITE_SCHEMA_FILE = "suite.schema.json"
+
+
+@dataclass
+class SuiteDevice:
+    """A device targeted by a suite.
+
+    Attributes:
+        provider: String identifier of the provider of the device.
+        device: Identifier of the device.
+    """
+
+    provider: str
+    device: str
+
+
+@dataclass
+class Suite:
+    """Benchmark configurations, each dispatched to every device of the suite.
+
+    Attributes:
+        name: Name of the suite.
+        benchmarks: Parameters of each benchmark configuration.
+        devices: Devices to dispatch the benchmarks to.
+    """
+
+    name: str
+    benchmarks: list[dict[str, Any]]
+    devices: list[SuiteDevice]
+
+
+def load_suite(file_path: str, schema_dir: str = DEFAULT_SCHEMA_DIR) -> Suite:
+    """Load a suite file and validate it, along with every benchmark configuration it lists.
+
+    Configurations with parameter sweeps are expanded into one configuration per point of the sweep
+    grid. Configurations with an optional `seed` parameter left out get one drawn here, so that every
+    device runs the same circuits and the circuits are only prepared once.
+
+    Raises a ValidationError if validation fails.
+    """
+    suite = load_json_file(file_path)
+    validate(suite, load_json_file(os.path.join(schema_dir, SUITE_SCHEMA_FILE)))
+    points = [point for params in suite["benchmarks"] for point in expand_sweep(params)]
+    benchmarks = []
+    for params, model in zip(points, validate_many(points, schema_dir)):
+        if "seed" in type(model).model_fields and params.get("seed") is None:
+            params = {**params, "seed": int(np.random.SeedSequence().generate_state(1)[0])}
+        benchmarks.append(params)
+    return Suite(
+        name=suite.get("suite_name", os.path.splitext(os.path.basename(file_path))[0]),
+        benchmarks=benchmarks,
+        devices=[SuiteDevice(**device) for device in suite["devices"]],
+    )
+
+
+def needs_preparation(params: dict[str, Any]) -> bool:
+    """Whether the benchmark of a configuration has device-independent preparation to run."""
+    return BENCHMARK_HANDLERS[JobType(params[BENCHMARK_NAME_KEY])].prepare is not Benchmark.prepare
+
+
+def prepare_benchmark(args: argparse.Namespace, params: dict[str, Any]) -> None:
+    """Run the device-independent preparation of a benchmark configuration.
+
+    Meant to run in a worker process: the parameters are passed as a plain dictionary since the
+    parameter models are created at runtime and cannot be pickled. Work is not spread over further
+    processes from there.
+    """
+    handler = BENCHMARK_HANDLERS[JobType(params[BENCHMARK_NAME_KEY])](
+        argparse.Namespace(**{**vars(args), "max_workers": 1}), validate_and_create_model(params)
+    )
+    handler.prepare()
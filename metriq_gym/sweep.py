@@ -0,0 +1,46 @@
+"""Expansion of parameter sweeps in benchmark input files."""
+
+import itertools
+import math
+from typing import Any
+
+SWEEP_KEY = "sweep"
+
+
+def is_sweep(value: Any) -> bool:
+    """Whether a parameter value is a sweep, i.e. `{"sweep": [...]}` or `{"sweep": {...}}`."""
+    return isinstance(value, dict) and set(value) == {SWEEP_KEY}
+
+
+def sweep_values(value: dict[str, Any]) -> list[Any]:
+    """Return the values a sweep takes.
+
+    A sweep either lists its values, e.g. `{"sweep": [4, 8, 16]}`, or gives an inclusive range,
+    e.g. `{"sweep": {"from": 4, "to": 16, "step": 2}}` (the step defaults to 1).
+    """
+    spec = value[SWEEP_KEY]
+    if isinstance(spec, list):
+        values = spec
+    elif isinstance(spec, dict) and {"from", "to"} <= set(spec) <= {"from", "to", "step"}:
+        start, stop, step = spec["from"], spec["to"], spec.get("step", 1)
+        if step <= 0:
+            raise ValueError(f"Sweep step must be positive, got {step}.")
+        # A small tolerance keeps the end point of float ranges despite rounding errors.
+        values = [start + i * step for i in range(math.floor((stop - start) / step + 1e-9) + 1)]
+    else:
+        raise ValueError(f"Invalid sweep: {value}")
+    if not values:
+        raise ValueError(f"Sweep without values: {value}")
+    return values
+
+
+def expand_sweep(params: dict[str, Any]) -> list[dict[str, Any]]:
+    """Expand the swept parameters of a benchmark configuration into a Cartesian grid.
+
+    Returns:
+        One configuration per point of the grid, the last swept parameter varying fastest. A
+        configuration without sweeps is returned as the only point.
+    """
+    swept = [key for key, value in params.items() if is_sweep(value)]
+    grid = itertools.product(*(sweep_values(params[key]) for key in swept))
+    return [{**params, **dict(zip(swept, point))} for point in grid]
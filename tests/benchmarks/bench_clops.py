@@ -0,0 +1,47 @@
+"""Micro-benchmark of the CLOPS qubit map search on large heavy-hex devices.
+
+Run with `python -m tests.benchmarks.bench_clops`.
+"""
+
+import timeit
+
+import rustworkx as rx
+
+from metriq_gym.benchmarks.clops import create_qubit_map
+
+# Heavy-hex distances whose lattices are cut down to the sizes of 127, 433 and 1121 qubit devices.
+DEVICE_SIZES = {127: 9, 433: 15, 1121: 23}
+
+
+def heavy_hex_device(num_qubits: int, fragmented: bool = False) -> rx.PyGraph:
+    """A heavy-hex topology of `num_qubits` qubits.
+
+    If `fragmented`, every other edge among the first half of the qubits is removed, so that
+    searches starting there fail before a large enough component is found.
+    """
+    lattice = rx.generators.heavy_hex_graph(DEVICE_SIZES[num_qubits])
+    distances = {0: 0.0, **rx.graph_dijkstra_shortest_path_lengths(lattice, 0, lambda _: 1.0)}
+    closest = sorted(lattice.node_indices(), key=lambda qubit: (distances[qubit], qubit))
+    graph = lattice.subgraph(closest[:num_qubits])
+    if fragmented:
+        for edge_index, (q0, q1) in enumerate(list(graph.edge_list())):
+            if edge_index % 2 and max(q0, q1) < num_qubits // 2:
+                graph.remove_edge(q0, q1)
+    return graph
+
+
+def main() -> None:
+    for num_qubits in DEVICE_SIZES:
+        for fragmented in [False, True]:
+            graph = heavy_hex_device(num_qubits, fragmented)
+            width = num_qubits // 4
+            number = 20
+            seconds = timeit.timeit(
+                lambda: create_qubit_map(width, graph, num_qubits), number=number
+            )
+            label = "fragmented" if fragmented else "connected"
+            print(f"{num_qubits:5d} qubits, {label:10s}: {1e3 * seconds / number:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
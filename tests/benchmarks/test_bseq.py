@@ -0,0 +1,23 @@
+import numpy as np
+from qiskit.result import marginal_counts, sampled_expectation_value
+
+from metriq_gym.benchmarks.bseq import counts_to_bit_matrix, zz_expectation_values
+
+
+def test_counts_to_bit_matrix():
+    bits, weights = counts_to_bit_matrix({"01": 3, "110": 5}, 2)
+    np.testing.assert_array_equal(bits, [[True, False, False], [False, True, True]])
+    np.testing.assert_array_equal(weights, [3, 5])
+
+
+def test_zz_expectation_values():
+    rng = np.random.default_rng(0)
+    num_pairs = 5
+    counts = {
+        "".join(rng.choice(["0", "1"], 2 * num_pairs)): int(rng.integers(1, 100)) for _ in range(50)
+    }
+    expected = [
+        sampled_expectation_value(marginal_counts(counts, [2 * pair, 2 * pair + 1]), "ZZ")
+        for pair in range(num_pairs)
+    ]
+    np.testing.assert_array_equal(zz_expectation_values(counts, num_pairs), expected)
@@ -0,0 +1,189 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from qbraid import QuantumDevice, QuantumJob
+import rustworkx as rx
+
+from metriq_gym.benchmarks import clops
+from metriq_gym.benchmarks.clops import (
+    Clops,
+    ClopsData,
+    bind_clops_circuits,
+    clops_parameter_values,
+    create_qubit_map,
+    prepare_clops_circuits,
+    prepare_clops_template,
+    random_maximal_matching,
+)
+from metriq_gym.qplatform.device import DeviceMetadata
+from metriq_gym.qplatform.job import CachedQuantumJob, JobMetadata
+
+
+def test_create_qubit_map_breadth_first():
+    graph = rx.generators.star_graph(5)
+    graph.add_node(None)
+    graph.add_edge(4, 5, None)
+
+    assert create_qubit_map(4, graph, 6) == [0, 1, 2, 3]
+    assert create_qubit_map(6, graph, 6) == [0, 1, 2, 3, 4, 5]
+
+
+def test_create_qubit_map_skips_small_components():
+    graph = rx.PyGraph()
+    graph.add_nodes_from(range(6))
+    graph.add_edges_from_no_data([(1, 2), (3, 4), (4, 5)])
+
+    assert create_qubit_map(3, graph, 6) == [3, 4, 5]
+    with pytest.raises(ValueError, match="Insufficient connected qubits"):
+        create_qubit_map(4, graph, 6)
+
+
+def test_create_qubit_map_qubit_weights():
+    graph = rx.generators.path_graph(4)
+
+    assert create_qubit_map(2, graph, 4, qubit_weights=[0.1, 0.2, 0.9, 0.5]) == [2, 1]
+
+
+def test_random_maximal_matching():
+    graph = rx.generators.heavy_hex_graph(5)
+    edges = np.array(graph.edge_list())
+
+    matching = random_maximal_matching(edges, graph.num_nodes(), np.random.default_rng(0))
+
+    matched_qubits = matching.flatten().tolist()
+    assert len(matched_qubits) == len(set(matched_qubits))
+    assert {tuple(edge) for edge in matching.tolist()} <= {tuple(edge) for edge in edges.tolist()}
+    # Maximal: every edge touches a matched qubit.
+    assert all(q0 in matched_qubits or q1 in matched_qubits for q0, q1 in edges.tolist())
+    np.testing.assert_array_equal(
+        matching, random_maximal_matching(edges, graph.num_nodes(), np.random.default_rng(0))
+    )
+
+
+def test_prepare_clops_circuits_keeps_topology():
+    graph = rx.generators.heavy_hex_graph(3)
+    num_edges = graph.num_edges()
+
+    circuits = prepare_clops_circuits(
+        width=5,
+        layers=3,
+        num_circuits=2,
+        basis_gates={"cz"},
+        topology_graph=graph,
+        total_qubits=graph.num_nodes(),
+    )
+
+    assert len(circuits) == 2
+    assert graph.num_edges() == num_edges
+    assert circuits[0].count_ops()["cz"] >= 3
+
+
+def test_clops_parameter_values_bind_template():
+    graph = rx.generators.path_graph(4)
+    rng = np.random.default_rng(0)
+    template = prepare_clops_template(4, 2, {"cx"}, graph, 4, rng)
+
+    values = clops_parameter_values(template, 3, rng)
+    circuits = bind_clops_circuits(template, values)
+
+    assert values.shape == (3, template.num_parameters)
+    assert len(circuits) == 3
+    assert all(circuit.num_parameters == 0 for circuit in circuits)
+    assert circuits[1] == template.assign_parameters(dict(zip(template.parameters, values[1])))
+
+
+def test_clops_native_binding_falls_back_to_client(monkeypatch):
+    graph = rx.generators.path_graph(4)
+    monkeypatch.setattr(
+        clops,
+        "load_device_metadata",
+        lambda device, refresh=False: DeviceMetadata(
+            provider_name="test",
+            device_id="test",
+            version=None,
+            num_qubits=4,
+            basis_gates=["cx"],
+            num_nodes=4,
+            edges=np.array(graph.edge_list()),
+        ),
+    )
+    device = MagicMock(spec=QuantumDevice)
+    device.apply_runtime_profile.side_effect = lambda program: program
+    device.submit.return_value = [MagicMock(spec=QuantumJob, id=f"job{i}") for i in range(3)]
+    params = SimpleNamespace(
+        width=4, num_layers=2, num_circuits=3, shots=10, parameter_binding="native"
+    )
+
+    job_data = Clops(SimpleNamespace(), params).dispatch_handler(device)
+
+    assert job_data.parameter_binding == "client"
+    assert job_data.provider_job_ids == ["job0", "job1", "job2"]
+    assert set(job_data.stage_seconds) == {"generate", "bind", "transpile", "submit"}
+    circuits = device.submit.call_args.args[0]
+    assert len(circuits) == 3
+    assert all(circuit.num_parameters == 0 for circuit in circuits)
+
+
+def test_clops_poll_handler_scores():
+    params = SimpleNamespace(num_circuits=2, num_layers=5, shots=10)
+    end = datetime(2025, 1, 1, 0, 0, 50, tzinfo=timezone.utc)
+    quantum_jobs = [
+        CachedQuantumJob(
+            "job0",
+            "device",
+            None,
+            JobMetadata(execution_start=end - timedelta(seconds=4), execution_end=end),
+        ),
+        CachedQuantumJob(
+            "job1",
+            "device",
+            None,
+            JobMetadata(execution_duration=6.0, ended_at=end - timedelta(seconds=10)),
+        ),
+    ]
+    job_data = ClopsData(
+        provider_job_ids=["job0", "job1"],
+        stage_seconds={"generate": 1.0, "bind": 2.0, "transpile": 3.0, "submit": 4.0},
+        dispatch_started_at=end.timestamp() - 25.0,
+    )
+
+    result = Clops(SimpleNamespace(), params).poll_handler(job_data, [], quantum_jobs)
+
+    assert result.clops_score == 10.0
+    assert result.hybrid_clops_score == 5.0
+    assert result.wall_clock_clops_score == 4.0
+    assert result.provider_seconds == 10.0
+    assert result.stage_seconds == job_data.stage_seconds
+
+
+def test_clops_poll_handler_without_client_timing():
+    params = SimpleNamespace(num_circuits=2, num_layers=5, shots=10)
+    quantum_jobs = [CachedQuantumJob("job0", "device", None, JobMetadata(execution_duration=4.0))]
+
+    result = Clops(SimpleNamespace(), params).poll_handler(
+        ClopsData(provider_job_ids=["job0"]), [], quantum_jobs
+    )
+
+    assert result.clops_score == 25.0
+    assert result.hybrid_clops_score is None
+    assert result.wall_clock_clops_score is None
+
+
+def test_clops_poll_handler_without_execution_times():
+    params = SimpleNamespace(num_circuits=2, num_layers=5, shots=10)
+    end = datetime(2025, 1, 1, 0, 0, 50, tzinfo=timezone.utc)
+    quantum_jobs = [CachedQuantumJob("job0", "device", None, JobMetadata(ended_at=end))]
+    job_data = ClopsData(
+        provider_job_ids=["job0"],
+        stage_seconds={"generate": 1.0},
+        dispatch_started_at=end.timestamp() - 50.0,
+    )
+
+    result = Clops(SimpleNamespace(), params).poll_handler(job_data, [], quantum_jobs)
+
+    assert result.clops_score is None
+    assert result.hybrid_clops_score is None
+    assert result.wall_clock_clops_score == 2.0
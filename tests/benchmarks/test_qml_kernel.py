@@ -0,0 +1,13 @@
+from metriq_gym.benchmarks.qml_kernel import create_inner_product_circuit, inner_product_template
+
+
+def test_inner_product_circuits_share_template():
+    first = create_inner_product_circuit(4, seed=1)
+    second = create_inner_product_circuit(4, seed=2)
+
+    template = inner_product_template(4)
+    assert inner_product_template(4) is template
+    assert template.num_parameters > 0
+    # Binding the parameters leaves the shared template untouched.
+    assert first.num_parameters == second.num_parameters == 0
+    assert first != second
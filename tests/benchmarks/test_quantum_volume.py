@@ -1,5 +1,21 @@
+import math
+import statistics
+from types import SimpleNamespace
+
+import numpy as np
 import pytest
-from metriq_gym.benchmarks.quantum_volume import calc_stats, QuantumVolumeData, prepare_qv_circuits
+from metriq_gym.benchmarks import quantum_volume
+from metriq_gym.benchmarks.quantum_volume import (
+    calc_stats,
+    calc_trial_stats,
+    calc_trials_stats,
+    counts_to_indices,
+    load_qv_circuits,
+    QuantumVolume,
+    QuantumVolumeData,
+    prepare_qv_circuits,
+)
+from metriq_gym.circuit_cache import CircuitSetCache
 
 
 @pytest.mark.parametrize("n, trials", [(2, 2), (3, 3)])
@@ -11,6 +27,16 @@ def test_prepare_qv_circuits(n, trials):
     assert len(ideal_probs[0]) == 2**n
 
 
+def test_prepare_qv_circuits_seeded():
+    circuits, ideal_probs = prepare_qv_circuits(n=3, num_trials=5, seed=7)
+    parallel_circuits, parallel_probs = prepare_qv_circuits(
+        n=3, num_trials=5, seed=7, max_workers=2
+    )
+    assert circuits == parallel_circuits
+    np.testing.assert_allclose(ideal_probs, parallel_probs, atol=1e-6)
+    np.testing.assert_allclose(ideal_probs.sum(axis=1), 1.0, atol=1e-5)
+
+
 def test_calc_stats_pass():
     job_data = QuantumVolumeData(
         provider_job_ids=["test_job_id"],
@@ -51,3 +77,76 @@ def test_calc_stats_not_pass():
     ]
     stats = calc_stats(job_data, counts)
     assert stats.confidence_pass is False  # Not all trials pass confidence level
+
+
+def test_counts_to_indices():
+    indices, values = counts_to_indices({"000": 1, "101": 2, "111": 3, "1x1": 4, "0101": 5}, 3)
+    assert indices.tolist() == [0, 5, 7]
+    assert values.tolist() == [1, 2, 3]
+
+
+def test_calc_trial_stats():
+    stats = calc_trial_stats(
+        ideal_probs=[0.4, 0.3, 0.2, 0.1],
+        counts={"00": 50, "01": 30, "10": 15, "11": 5},
+        shots=100,
+        confidence_level=0.95,
+    )
+    assert stats.qubits == 2
+    assert stats.hog_prob == 0.8
+    assert stats.hog_pass is True
+    assert stats.xeb == pytest.approx(1.5)
+
+
+def reference_xeb(ideal_probs: list[float], counts: dict[str, int], shots: int) -> float:
+    n = int(round(math.log2(len(ideal_probs))))
+    u_u = statistics.mean(ideal_probs)
+    numer = sum(
+        (ideal - u_u) * (counts.get(bin(i)[2:].zfill(n), 0) / shots - u_u)
+        for i, ideal in enumerate(ideal_probs)
+    )
+    denom = sum((ideal - u_u) ** 2 for ideal in ideal_probs)
+    return numer / denom
+
+
+def test_calc_trials_stats_matches_per_trial_xeb():
+    rng = np.random.default_rng(0)
+    num_qubits, shots = 4, 200
+    ideal_probs = rng.dirichlet(np.ones(2**num_qubits), size=3)
+    counts = [
+        {
+            bin(outcome)[2:].zfill(num_qubits): int(count)
+            for outcome, count in enumerate(rng.multinomial(shots, probs))
+            if count
+        }
+        for probs in ideal_probs
+    ]
+    trial_stats = calc_trials_stats(ideal_probs, counts, shots, confidence_level=0.95)
+    for stats, probs, trial_counts in zip(trial_stats, ideal_probs, counts):
+        assert stats.xeb == pytest.approx(reference_xeb(list(probs), trial_counts, shots))
+
+
+def test_load_qv_circuits_cached(tmpdir, monkeypatch):
+    cache = CircuitSetCache(str(tmpdir))
+    circuits, ideal_probs = load_qv_circuits(n=2, num_trials=2, seed=3, cache=cache)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("circuits should be loaded from the cache")
+
+    monkeypatch.setattr(quantum_volume, "prepare_qv_circuits", fail)
+    cached_circuits, cached_probs = load_qv_circuits(n=2, num_trials=2, seed=3, cache=cache)
+    assert cached_circuits == circuits
+    np.testing.assert_array_equal(cached_probs, ideal_probs)
+
+
+def test_prepare_fills_circuit_cache(tmpdir, monkeypatch):
+    monkeypatch.setenv("METRIQ_GYM_CIRCUIT_CACHE_DIR", str(tmpdir))
+    params = SimpleNamespace(num_qubits=2, trials=2, seed=5)
+    QuantumVolume(SimpleNamespace(), params).prepare()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("circuits should be loaded from the cache")
+
+    monkeypatch.setattr(quantum_volume, "prepare_qv_circuits", fail)
+    circuits, _ = load_qv_circuits(n=2, num_trials=2, seed=5, cache=CircuitSetCache(str(tmpdir)))
+    assert len(circuits) == 2
@@ -1,3 +1,4 @@
+import pytest
 import rustworkx as rx
 
 
@@ -95,3 +96,63 @@ def test_device_graph_coloring_multigraph():
     assert coloring.num_nodes == 3
     assert max(coloring.edge_color_map.values()) + 1 <= 3  # Should use at most 3 colors
     assert len(coloring.edge_index_map) == 3  # Should match the number of edges
+
+
+def test_graph_coloring_color_edges():
+    """Test the per-color edge arrays follow the order of the edge color map."""
+    coloring = GraphColoring(
+        num_nodes=4,
+        edge_color_map={0: 1, 1: 0, 2: 1},
+        edge_index_map={0: (0, 1, None), 1: (1, 2, None), 2: (2, 3, None)},
+    )
+
+    assert coloring.num_colors == 2
+    assert [edges.tolist() for edges in coloring.color_edges] == [[[1, 2]], [[0, 1], [2, 3]]]
+
+
+def test_graph_coloring_dict_round_trip():
+    """Test a coloring is restored from its dictionary, with or without the edge arrays."""
+    graph = rx.generators.grid_graph(3, 3)
+    coloring = device_graph_coloring(graph)
+    data = coloring.to_dict()
+    legacy_data = {key: value for key, value in data.items() if key != "color_edges"}
+
+    for restored in [GraphColoring.from_dict(data), GraphColoring.from_dict(legacy_data)]:
+        assert restored.num_colors == coloring.num_colors
+        for edges, restored_edges in zip(coloring.color_edges, restored.color_edges):
+            assert edges.tolist() == restored_edges.tolist()
+
+
+def assert_proper_edge_coloring(graph, coloring):
+    """Assert that no two edges sharing a qubit have the same color."""
+    for edges in coloring.color_edges:
+        qubits = edges.flatten().tolist()
+        assert len(qubits) == len(set(qubits))
+    assert sum(len(edges) for edges in coloring.color_edges) == graph.num_edges()
+
+
+@pytest.mark.parametrize("strategy", ["auto", "misra_gries", "greedy"])
+def test_device_graph_coloring_complete_graph(strategy):
+    """Test non-bipartite (all-to-all) topologies are colored with every general strategy."""
+    graph = rx.generators.complete_graph(7)
+
+    coloring = device_graph_coloring(graph, strategy)
+
+    assert_proper_edge_coloring(graph, coloring)
+    if strategy != "greedy":
+        assert coloring.num_colors <= 7  # Misra-Gries uses at most max degree + 1 colors
+
+
+def test_device_graph_coloring_auto_bipartite():
+    """Test the auto strategy colors bipartite topologies with the minimal number of colors."""
+    graph = rx.generators.heavy_hex_graph(5)
+
+    coloring = device_graph_coloring(graph, "auto")
+
+    assert_proper_edge_coloring(graph, coloring)
+    assert coloring.num_colors == 3
+
+
+def test_device_graph_coloring_unknown_strategy():
+    with pytest.raises(ValueError):
+        device_graph_coloring(rx.generators.path_graph(3), "unknown")
@@ -1,7 +1,37 @@
+import time
+
 import pytest
-from metriq_gym.helpers.task_helpers import flatten_counts
+from metriq_gym.exceptions import ProviderJobError
+from metriq_gym.helpers.task_helpers import fetch_results, flatten_counts
+from qbraid.runtime import JobStatus, Result
 from qbraid.runtime.result_data import MeasCount, GateModelResultData
 
+LATENCY = 0.2
+
+
+class FakeQuantumJob:
+    """Provider job whose status and result requests each take `LATENCY` seconds."""
+
+    def __init__(self, counts: MeasCount, status: JobStatus = JobStatus.COMPLETED):
+        self.id = "job"
+        self.counts = counts
+        self._status = status
+        self.result_calls = 0
+
+    def status(self) -> JobStatus:
+        time.sleep(LATENCY)
+        return self._status
+
+    def result(self) -> Result:
+        time.sleep(LATENCY)
+        self.result_calls += 1
+        return Result(
+            device_id="device",
+            job_id="job",
+            success=True,
+            data=GateModelResultData(measurement_counts=self.counts),
+        )
+
 
 @pytest.fixture
 def ibm_result_data():
@@ -61,3 +91,34 @@ def test_flatten_counts_none():
     result_data = [GateModelResultData(measurement_counts=None)]
     flat_counts = flatten_counts(result_data)
     assert flat_counts == []
+
+
+def test_fetch_results_concurrently():
+    quantum_jobs = [FakeQuantumJob(MeasCount({"00": i})) for i in range(8)]
+    start = time.perf_counter()
+    result_data = fetch_results(quantum_jobs, max_workers=8)
+    elapsed = time.perf_counter() - start
+
+    assert [result.measurement_counts for result in result_data] == [
+        MeasCount({"00": i}) for i in range(8)
+    ]
+    # Sequential fetching would take 8 * 2 * LATENCY.
+    assert elapsed < 4 * LATENCY
+
+
+def test_fetch_results_stops_when_a_job_is_not_completed():
+    quantum_jobs = [FakeQuantumJob(MeasCount({"00": 1}), JobStatus.RUNNING)] + [
+        FakeQuantumJob(MeasCount({"00": 1})) for _ in range(7)
+    ]
+    assert fetch_results(quantum_jobs, max_workers=1) is None
+    assert all(quantum_job.result_calls == 0 for quantum_job in quantum_jobs)
+
+
+def test_fetch_results_reports_failed_jobs():
+    quantum_jobs = [
+        FakeQuantumJob(MeasCount({"00": 1}), JobStatus.QUEUED),
+        FakeQuantumJob(MeasCount({"00": 1}), JobStatus.FAILED),
+    ]
+    with pytest.raises(ProviderJobError) as error:
+        fetch_results(quantum_jobs, max_workers=2)
+    assert error.value.status == JobStatus.FAILED
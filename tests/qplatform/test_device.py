@@ -5,7 +5,10 @@ from qbraid.runtime import QiskitBackend
 
 from rustworkx import PyGraph
 
-from metriq_gym.qplatform.device import connectivity_graph
+import numpy as np
+from qiskit import QuantumCircuit
+
+from metriq_gym.qplatform.device import connectivity_graph, run_parameterized
 
 
 def test_device_connectivity_graph_qiskit_backend():
@@ -30,3 +33,10 @@ def test_device_connectivity_graph_invalid_device():
     mock_device = MagicMock(spec=QuantumDevice)  # Mock an unknown QuantumDevice
     with pytest.raises(NotImplementedError, match="Connectivity graph not implemented for device"):
         connectivity_graph(mock_device)
+
+
+def test_run_parameterized_unsupported_device():
+    mock_device = MagicMock(spec=QuantumDevice)
+
+    with pytest.raises(NotImplementedError):
+        run_parameterized(mock_device, QuantumCircuit(1), np.zeros((2, 0)), 10)
@@ -0,0 +1,58 @@
+from unittest.mock import MagicMock
+
+import pytest
+from qbraid.runtime import QiskitBackend
+from rustworkx import PyGraph
+
+from metriq_gym.qplatform.device_cache import DeviceMetadataCache, load_device_metadata
+
+
+def fake_qiskit_device(edges: list[tuple[int, int]], backend_version: str = "1.0.0"):
+    graph = PyGraph()
+    graph.add_nodes_from(range(4))
+    graph.add_edges_from_no_data(edges)
+    device = MagicMock(spec=QiskitBackend)
+    device.id = "ibm_fake"
+    device.num_qubits = 4
+    device.profile.provider_name = "IBM"
+    device.profile.basis_gates = ["sx", "ecr", "rz"]
+    device._backend = MagicMock()
+    device._backend.backend_version = backend_version
+    device._backend.coupling_map.graph.to_undirected.return_value = graph
+    return device
+
+
+@pytest.fixture
+def device_cache(tmpdir):
+    return DeviceMetadataCache(str(tmpdir.join("devices")))
+
+
+def test_load_device_metadata(device_cache):
+    metadata = load_device_metadata(fake_qiskit_device([(0, 1), (1, 2)]), cache=device_cache)
+
+    assert metadata.version == "1.0.0"
+    assert metadata.num_qubits == 4
+    assert metadata.basis_gates == ["ecr", "rz", "sx"]
+    graph = metadata.connectivity_graph()
+    assert graph.num_nodes() == 4
+    assert set(graph.edge_list()) == {(0, 1), (1, 2)}
+
+
+def test_load_device_metadata_cached(device_cache):
+    load_device_metadata(fake_qiskit_device([(0, 1)]), cache=device_cache)
+
+    cached = load_device_metadata(fake_qiskit_device([(2, 3)]), cache=device_cache)
+    assert cached.edges.tolist() == [[0, 1]]
+
+    refreshed = load_device_metadata(fake_qiskit_device([(2, 3)]), True, device_cache)
+    assert refreshed.edges.tolist() == [[2, 3]]
+
+    new_version = load_device_metadata(fake_qiskit_device([(1, 3)], "1.0.1"), cache=device_cache)
+    assert new_version.edges.tolist() == [[1, 3]]
+
+
+def test_load_device_metadata_expired(tmpdir):
+    device_cache = DeviceMetadataCache(str(tmpdir), ttl_seconds=0)
+    load_device_metadata(fake_qiskit_device([(0, 1)]), cache=device_cache)
+
+    assert device_cache.get(fake_qiskit_device([(0, 1)])) is None
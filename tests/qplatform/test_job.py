@@ -1,8 +1,17 @@
 from unittest.mock import MagicMock
 import pytest
-from qbraid.runtime import QuantumJob, QiskitJob
-from metriq_gym.qplatform.job import execution_time
-from datetime import datetime, timedelta
+from qbraid.runtime import (
+    BraketQuantumTask,
+    GateModelResultData,
+    JobStatus,
+    QuantumJob,
+    QiskitJob,
+    Result,
+)
+from qiskit_ibm_runtime.execution_span import ExecutionSpans, SliceSpan
+
+from metriq_gym.qplatform.job import execution_time, job_metadata, record_job_metadata
+from datetime import datetime, timedelta, timezone
 
 
 def test_execution_time_qiskit():
@@ -20,3 +29,144 @@ def test_execution_time_unsupported():
     mock_job = MagicMock(spec=QuantumJob)
     with pytest.raises(NotImplementedError):
         execution_time(mock_job)
+
+
+def test_execution_time_braket_fetches_metadata_once():
+    braket_task = MagicMock(spec=BraketQuantumTask)
+    braket_task._task = MagicMock()
+    created_at = datetime.now()
+    braket_task._task.metadata.return_value = {
+        "status": "COMPLETED",
+        "createdAt": created_at,
+        "endedAt": created_at + timedelta(seconds=4),
+    }
+    braket_task._task.result().additional_metadata.simulatorMetadata.executionDuration = 1500
+
+    assert execution_time(braket_task) == 1.5
+    assert execution_time(braket_task) == 1.5
+    braket_task._task.metadata.assert_called_once()
+
+
+def test_braket_queueing_is_not_execution_time():
+    braket_task = MagicMock(spec=BraketQuantumTask)
+    braket_task._task = MagicMock()
+    created_at = datetime.now()
+    braket_task._task.metadata.return_value = {
+        "status": "COMPLETED",
+        "createdAt": created_at,
+        "endedAt": created_at + timedelta(seconds=4),
+    }
+    braket_task._task.result().additional_metadata.simulatorMetadata = None
+
+    metadata = job_metadata(braket_task)
+    assert metadata.queued_at == created_at
+    assert metadata.completion_time() == created_at + timedelta(seconds=4)
+    assert {"execution_start", "execution_end", "execution_duration"} <= metadata.unavailable
+    with pytest.raises(ValueError):
+        execution_time(braket_task)
+
+
+def test_qiskit_circuit_spans():
+    qiskit_job = MagicMock(spec=QiskitJob)
+    # A job without metrics, e.g. run on a local simulator.
+    qiskit_job._job = MagicMock(spec=["result"])
+    start = datetime.now()
+    execution_spans = ExecutionSpans(
+        [
+            SliceSpan(start, start + timedelta(seconds=2), {0: ((10,), slice(0, 10))}),
+            SliceSpan(
+                start + timedelta(seconds=2),
+                start + timedelta(seconds=5),
+                {1: ((10,), slice(0, 10))},
+            ),
+        ]
+    )
+    qiskit_job._job.result().metadata = {"execution": {"execution_spans": execution_spans}}
+
+    metadata = job_metadata(qiskit_job)
+    assert metadata.execution_time() == 5.0
+    assert metadata.completion_time() == start + timedelta(seconds=5)
+    assert metadata.circuit_spans == [
+        (start, start + timedelta(seconds=2)),
+        (start + timedelta(seconds=2), start + timedelta(seconds=5)),
+    ]
+    assert "queued_at" in metadata.unavailable
+
+
+def test_qiskit_job_timestamps_from_metrics():
+    qiskit_job = MagicMock(spec=QiskitJob)
+    qiskit_job._job = MagicMock()
+    start = datetime(2025, 1, 1, 12, 0, 5, tzinfo=timezone.utc)
+    execution_spans = ExecutionSpans(
+        [SliceSpan(start, start + timedelta(seconds=2), {0: ((10,), slice(0, 10))})]
+    )
+    qiskit_job._job.result().metadata = {"execution": {"execution_spans": execution_spans}}
+    qiskit_job._job.metrics.return_value = {
+        "timestamps": {
+            "created": "2025-01-01T12:00:00.000Z",
+            "running": "2025-01-01T12:00:04.000Z",
+            "finished": "2025-01-01T12:00:08.000Z",
+        }
+    }
+
+    metadata = job_metadata(qiskit_job)
+    assert metadata.queued_at == datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert metadata.started_at == datetime(2025, 1, 1, 12, 0, 4, tzinfo=timezone.utc)
+    assert metadata.completion_time() == datetime(2025, 1, 1, 12, 0, 8, tzinfo=timezone.utc)
+    assert metadata.execution_time() == 2.0
+    assert metadata.unavailable == frozenset({"execution_duration"})
+
+
+def test_record_job_metadata_from_result():
+    qiskit_job = MagicMock(spec=QiskitJob)
+    qiskit_job._job = MagicMock()
+    execution_spans = MagicMock()
+    execution_spans.start = datetime.now()
+    execution_spans.stop = execution_spans.start + timedelta(seconds=2)
+    result = Result(
+        device_id="ibm_device",
+        job_id="job",
+        success=True,
+        data=GateModelResultData(),
+        execution={"execution_spans": execution_spans},
+    )
+
+    record_job_metadata(qiskit_job, result)
+
+    metadata = job_metadata(qiskit_job)
+    assert metadata.status == JobStatus.COMPLETED
+    assert metadata.execution_time() == 2.0
+    qiskit_job._job.result.assert_not_called()
+
+
+def test_record_job_metadata_does_not_request_metrics():
+    qiskit_job = MagicMock(spec=QiskitJob)
+    qiskit_job._job = MagicMock()
+    start = datetime(2025, 1, 1, 12, 0, 5, tzinfo=timezone.utc)
+    execution_spans = ExecutionSpans(
+        [SliceSpan(start, start + timedelta(seconds=2), {0: ((10,), slice(0, 10))})]
+    )
+    result = Result(
+        device_id="ibm_device",
+        job_id="job",
+        success=True,
+        data=GateModelResultData(),
+        execution={"execution_spans": execution_spans},
+    )
+    qiskit_job._job.metrics.side_effect = ConnectionError("metrics unavailable")
+
+    record_job_metadata(qiskit_job, result)
+    qiskit_job._job.metrics.assert_not_called()
+
+    # The error reaches the caller of job_metadata, which tries again later.
+    with pytest.raises(ConnectionError):
+        job_metadata(qiskit_job)
+    qiskit_job._job.metrics.side_effect = None
+    qiskit_job._job.metrics.return_value = {
+        "timestamps": {"created": "2025-01-01T12:00:00.000Z", "finished": "2025-01-01T12:00:08Z"}
+    }
+
+    metadata = job_metadata(qiskit_job)
+    assert metadata.queued_at == datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert metadata.execution_time() == 2.0
+    qiskit_job._job.result.assert_not_called()
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from metriq_gym.array_store import ARRAY_REF_KEY, ArrayStore
+
+
+@pytest.fixture
+def array_store(tmpdir):
+    return ArrayStore(str(tmpdir.join("arrays")), min_size=8)
+
+
+def test_put_is_content_addressed(array_store):
+    array = np.arange(16, dtype=float)
+    assert array_store.put(array) == array_store.put(array.copy())
+    assert array_store.put(array) != array_store.put(array.astype(np.float32))
+
+
+def test_externalize_and_resolve_roundtrip(array_store):
+    ideal_probs = [[0.1 * i + j for i in range(8)] for j in range(3)]
+    data = {"provider_job_ids": ["a", "b"], "shots": 10, "ideal_probs": ideal_probs}
+
+    externalized = array_store.externalize(data)
+    assert externalized["provider_job_ids"] == ["a", "b"]
+    assert externalized["shots"] == 10
+    assert externalized["ideal_probs"].keys() == {ARRAY_REF_KEY}
+
+    resolved = array_store.resolve(externalized)
+    assert isinstance(resolved["ideal_probs"], np.memmap)
+    np.testing.assert_array_equal(resolved["ideal_probs"], ideal_probs)
+
+
+def test_externalize_keeps_small_arrays_inline(array_store):
+    data = {"ideal_probs": [[0.5, 0.5]]}
+    assert array_store.externalize(data) == data
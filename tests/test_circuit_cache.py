@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+
+from metriq_gym.circuit_cache import CircuitSetCache
+
+
+@pytest.fixture
+def circuit_cache(tmpdir):
+    return CircuitSetCache(str(tmpdir.join("circuits")))
+
+
+def bell_circuit() -> QuantumCircuit:
+    circuit = QuantumCircuit(2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure_all()
+    return circuit
+
+
+def test_put_and_get(circuit_cache):
+    key = {"num_qubits": 2, "trials": 1, "seed": 1}
+    ideal_probs = np.array([[0.5, 0.0, 0.0, 0.5]])
+    assert circuit_cache.get(key) is None
+
+    circuit_cache.put(key, [bell_circuit()], ideal_probs)
+
+    circuits, cached_probs = circuit_cache.get(key)
+    assert circuits == [bell_circuit()]
+    np.testing.assert_array_equal(cached_probs, ideal_probs)
+    assert circuit_cache.get({**key, "seed": 2}) is None
+
+
+def test_evicts_least_recently_used_entries(circuit_cache):
+    keys = [{"num_qubits": 2, "trials": 1, "seed": seed} for seed in range(4)]
+    ideal_probs = np.array([[0.5, 0.0, 0.0, 0.5]])
+    for i, key in enumerate(keys[:3]):
+        circuit_cache.put(key, [bell_circuit()], ideal_probs)
+        for suffix in (".qpy", ".npy"):
+            os.utime(f"{circuit_cache._path(key)}{suffix}", (i, i))
+    circuit_cache.get(keys[0])
+    circuit_cache.max_bytes = 3 * sum(
+        os.path.getsize(f"{circuit_cache._path(keys[0])}{suffix}") for suffix in (".qpy", ".npy")
+    )
+
+    circuit_cache.put(keys[3], [bell_circuit()], ideal_probs)
+
+    assert circuit_cache.get(keys[1]) is None
+    assert all(circuit_cache.get(key) is not None for key in [keys[0], keys[2], keys[3]])
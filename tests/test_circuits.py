@@ -0,0 +1,26 @@
+import numpy as np
+
+from metriq_gym.circuits import (
+    qiskit_random_circuit_sampling,
+    qiskit_random_circuit_sampling_batch,
+    random_circuit_sampling_params,
+)
+
+
+def test_random_circuit_sampling_params():
+    angles, permutations = random_circuit_sampling_params(4, 3, np.random.default_rng(0))
+    assert angles.shape == (3, 4, 4, 3)
+    assert ((angles >= 0) & (angles < 2 * np.pi)).all()
+    assert permutations.shape == (3, 4, 4)
+    assert (np.sort(permutations, axis=-1) == np.arange(4)).all()
+
+
+def test_qiskit_random_circuit_sampling_batch_reproducible():
+    circuits = qiskit_random_circuit_sampling_batch(3, 5, np.random.default_rng(1))
+    assert circuits == qiskit_random_circuit_sampling_batch(3, 5, np.random.default_rng(1))
+    assert circuits != qiskit_random_circuit_sampling_batch(3, 5, np.random.default_rng(2))
+
+
+def test_qiskit_random_circuit_sampling_gate_counts():
+    circuit = qiskit_random_circuit_sampling(5)
+    assert circuit.count_ops() == {"u": 5 * 5, "cx": 2 * 5}
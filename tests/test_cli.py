@@ -2,7 +2,7 @@ from datetime import datetime
 from tabulate import tabulate
 import pytest
 from unittest.mock import MagicMock
-from metriq_gym.cli import LIST_JOBS_HEADERS, list_jobs
+from metriq_gym.cli import LIST_JOBS_HEADERS, list_group_results, list_jobs
 from metriq_gym.job_manager import JobManager, MetriqGymJob
 from metriq_gym.job_type import JobType
 
@@ -64,3 +64,31 @@ def test_list_jobs_no_jobs(capsys):
 
     # Verify the printed output
     assert captured.out == "No jobs found.\n"
+
+
+def test_list_group_results(capsys):
+    """Test tabulating the varying parameters and results of a sweep."""
+    jobs = [
+        MetriqGymJob(
+            id=f"job_{num_qubits}",
+            device_name="sv1",
+            provider_name="aws",
+            job_type=JobType.QML_KERNEL,
+            dispatch_time=datetime.fromisoformat("2021-09-01T12:00:00"),
+            params={"benchmark_name": "QML Kernel", "num_qubits": num_qubits, "shots": 10},
+            data={},
+            result=result,
+            suite_id="sweep",
+        )
+        for num_qubits, result in [(4, {"accuracy_score": 0.9}), (8, None)]
+    ]
+
+    list_group_results(jobs)
+
+    table = [["job_4", "sv1", "QML Kernel", 4, 0.9], ["job_8", "sv1", "QML Kernel", 8, None]]
+    expected_output = tabulate(
+        table,
+        headers=["Metriq-gym Job Id", "Device", "Type", "num_qubits", "accuracy_score"],
+        tablefmt="grid",
+    )
+    assert capsys.readouterr().out == expected_output + "\n"
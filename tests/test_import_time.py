@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Packages taking seconds to import, which commands that only read the job store must not load.
+HEAVY_PACKAGES = {
+    "jsonschema",
+    "networkx",
+    "numpy",
+    "pydantic",
+    "pyqrack",
+    "qbraid",
+    "qiskit",
+    "qiskit_device_benchmarking",
+    "qiskit_ibm_runtime",
+    "rustworkx",
+    "scipy",
+}
+
+
+def imported_packages(code: str, cwd: str) -> set[str]:
+    """Run `code` in a fresh interpreter and return the top-level packages it imported."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd,
+        env={**os.environ, "PYTHONPATH": REPO_ROOT},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.rsplit("|", 1)[1].strip().split(".")[0]
+        for line in process.stderr.splitlines()
+        if line.startswith("import time:") and line.count("|") == 2
+    }
+
+
+@pytest.mark.parametrize("action", ["view", "poll"])
+def test_cli_startup_imports(action, tmp_path):
+    # Parsing the arguments and listing the (empty) job store.
+    code = (
+        "import sys; from metriq_gym.run import main; "
+        f"sys.argv = ['metriq-gym', '{action}']; main()"
+    )
+
+    assert imported_packages(code, str(tmp_path)) & HEAVY_PACKAGES == set()
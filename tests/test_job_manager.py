@@ -1,7 +1,17 @@
+from dataclasses import replace
+import sqlite3
+import numpy as np
 from unittest.mock import patch
 import pytest
 from datetime import datetime
-from metriq_gym.job_manager import JobManager, MetriqGymJob
+from metriq_gym.array_store import ArrayStore
+from metriq_gym.job_manager import (
+    JobManager,
+    JsonlJobStore,
+    MetriqGymJob,
+    SqliteJobStore,
+    migrate_jsonl_store,
+)
 from tests.test_schema_validator import FAKE_BENCHMARK_NAME, FakeJobType
 
 
@@ -48,3 +58,101 @@ def test_load_jobs_with_existing_data(job_manager, sample_job):
     jobs = new_job_manager.get_jobs()
     assert len(jobs) == 1
     assert jobs[0].id == sample_job.id
+
+
+@pytest.fixture
+def sqlite_store(tmpdir):
+    return SqliteJobStore(str(tmpdir.join("test_jobs.db")))
+
+
+def test_sqlite_store_get_job(sqlite_store, sample_job):
+    job_manager = JobManager(sqlite_store)
+    job_manager.add_job(sample_job)
+    job = job_manager.get_job(sample_job.id)
+    assert job.id == sample_job.id
+    assert job.dispatch_time == sample_job.dispatch_time
+    with pytest.raises(ValueError, match="not found"):
+        job_manager.get_job("missing_job_id")
+
+
+def test_sqlite_store_filtered_listing(sqlite_store, sample_job):
+    for i in range(5):
+        sqlite_store.add(
+            replace(sample_job, id=f"job_{i}", device_name="even" if i % 2 == 0 else "odd")
+        )
+    job_manager = JobManager(sqlite_store)
+    assert [job.id for job in job_manager.get_jobs(device_name="even")] == [
+        "job_0",
+        "job_2",
+        "job_4",
+    ]
+    assert [job.id for job in job_manager.get_jobs(limit=2, offset=1)] == ["job_1", "job_2"]
+    assert job_manager.get_jobs(provider_name="other_provider") == []
+
+
+def test_sqlite_store_suite_listing(sqlite_store, sample_job):
+    sqlite_store.add(sample_job)
+    sqlite_store.add(replace(sample_job, id="suite_job", suite_id="suite"))
+    job_manager = JobManager(sqlite_store)
+    assert [job.id for job in job_manager.get_jobs(suite_id="suite")] == ["suite_job"]
+
+
+def test_sqlite_store_adds_suite_column(sample_job, tmpdir):
+    path = str(tmpdir.join("old_jobs.db"))
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute(
+            "CREATE TABLE jobs (id TEXT PRIMARY KEY, job_type TEXT NOT NULL, "
+            "provider_name TEXT NOT NULL, device_name TEXT NOT NULL, "
+            "dispatch_time TEXT NOT NULL, record TEXT NOT NULL)"
+        )
+        job = replace(sample_job, suite_id="suite")
+        connection.execute(
+            "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?)",
+            (job.id, "fake", job.provider_name, job.device_name, "", job.serialize()),
+        )
+    connection.close()
+
+    assert [job.id for job in SqliteJobStore(path).query(suite_id="suite")] == [sample_job.id]
+
+
+def test_migrate_jsonl_store(sample_job, sqlite_store, tmpdir):
+    # Legacy records hold their arrays inline.
+    ideal_probs = [[0.25] * 4, [0.5, 0.5, 0.0, 0.0]]
+    jsonl_path = str(tmpdir.join("legacy_jobs.jsonl"))
+    JsonlJobStore(jsonl_path).add(replace(sample_job, data={"ideal_probs": ideal_probs}))
+    array_store = ArrayStore(str(tmpdir.join("arrays")), min_size=4)
+
+    assert migrate_jsonl_store(jsonl_path, sqlite_store, array_store) == 1
+
+    migrated_job = sqlite_store.get(sample_job.id)
+    assert set(migrated_job.data["ideal_probs"]) == {"$array"}
+    assert array_store.resolve(migrated_job.data)["ideal_probs"].tolist() == ideal_probs
+
+
+def test_add_job_externalizes_large_arrays(sqlite_store, sample_job, tmpdir):
+    job_manager = JobManager(sqlite_store, ArrayStore(str(tmpdir.join("arrays")), min_size=4))
+    ideal_probs = [[0.25] * 4, [0.5, 0.5, 0.0, 0.0]]
+    job_manager.add_job(replace(sample_job, data={"ideal_probs": ideal_probs}))
+
+    stored_job = job_manager.get_job(sample_job.id)
+    assert "0.25" not in stored_job.serialize()
+    assert job_manager.load_job_data(stored_job)["ideal_probs"].tolist() == ideal_probs
+
+
+def test_update_job(job_manager, sample_job):
+    job_manager.add_job(sample_job)
+    sample_job.result = {"score": 1.0}
+    sample_job.completion_time = datetime.now()
+    job_manager.update_job(sample_job)
+
+    job = JobManager().get_job(sample_job.id)
+    assert job.result == {"score": 1.0}
+    assert job.completion_time == sample_job.completion_time
+    assert len(JobManager().get_jobs()) == 1
+
+
+def test_serialize_numpy_result(sample_job):
+    sample_job.result = {"xeb": np.float64(0.5), "largest_connected_size": np.int64(3)}
+    job = MetriqGymJob.deserialize(sample_job.serialize())
+    assert job.result == {"xeb": 0.5, "largest_connected_size": 3}
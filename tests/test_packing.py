@@ -0,0 +1,159 @@
+import pytest
+from qbraid import GateModelResultData
+from qbraid.runtime.ibm.result_builder import QiskitGateModelResultBuilder
+from qiskit import QuantumCircuit
+from qiskit.primitives import StatevectorSampler
+
+from metriq_gym.helpers.task_helpers import flatten_counts
+from metriq_gym.packing import CircuitPacker, packing, run_circuits, unpack_results
+
+
+class FakeJob:
+    def __init__(self, id):
+        self.id = id
+
+
+class FakeDevice:
+    def __init__(self, max_shots=None):
+        self.submissions = []
+        self.max_shots = max_shots
+
+    def run(self, circuits, shots):
+        if self.max_shots is not None and shots > self.max_shots:
+            raise ValueError("Too many shots")
+        self.submissions.append((list(circuits), shots))
+        return [FakeJob(f"job_{len(self.submissions) - 1}")]
+
+
+def test_run_circuits_without_packing():
+    device = FakeDevice()
+    assert run_circuits(device, ["a", "b"], 10) == ["job_0"]
+    assert device.submissions == [(["a", "b"], 10)]
+
+
+def test_packing_shares_provider_jobs():
+    device = FakeDevice()
+    with packing(device) as packer:
+        first = {"provider_job_ids": run_circuits(device, ["a1", "a2"], 10)}
+        second = {
+            "provider_job_ids": run_circuits(device, "b", 10) + run_circuits(device, ["c"], 20)
+        }
+    assert device.submissions == []
+
+    packer.submit()
+    packer.resolve(first)
+    packer.resolve(second)
+
+    # Circuits run with the same number of shots share a provider job.
+    assert device.submissions == [(["a1", "a2", "b"], 10), (["c"], 20)]
+    assert first == {"provider_job_ids": ["job_0"], "circuit_indices": [0, 1]}
+    assert second == {"provider_job_ids": ["job_0", "job_1"], "circuit_indices": [2, 3]}
+
+
+def test_packing_respects_max_circuits():
+    device = FakeDevice()
+    packer = CircuitPacker(device, max_circuits=2)
+    first = {"provider_job_ids": [packer.add(["a", "b", "c"], 10)]}
+    second = {"provider_job_ids": [packer.add(["d"], 10)]}
+
+    packer.submit()
+    packer.resolve(first)
+    packer.resolve(second)
+
+    assert device.submissions == [(["a", "b"], 10), (["c", "d"], 10)]
+    assert first == {"provider_job_ids": ["job_0", "job_1"], "circuit_indices": [0, 1, 2]}
+    assert second == {"provider_job_ids": ["job_1"], "circuit_indices": [1]}
+
+
+def test_submit_continues_after_failure():
+    device = FakeDevice(max_shots=10)
+    packer = CircuitPacker(device)
+    first = {"provider_job_ids": [packer.add(["a"], 20)]}
+    second = {"provider_job_ids": [packer.add(["b"], 10)]}
+
+    errors = packer.submit()
+
+    assert [str(err) for err in errors] == ["Too many shots"]
+    assert device.submissions == [(["b"], 10)]
+    assert not packer.is_submitted(first)
+    assert packer.is_submitted(second)
+
+    # Failed submissions are tried again.
+    device.max_shots = None
+    assert packer.submit() == []
+    assert device.submissions == [(["b"], 10), (["a"], 20)]
+    assert packer.is_submitted(first)
+
+
+def test_rollback_on_error():
+    device = FakeDevice()
+    packer = CircuitPacker(device)
+    first = {"provider_job_ids": [packer.add(["a"], 10)]}
+    with pytest.raises(ValueError):
+        with packer.rollback_on_error():
+            packer.add(["b"], 10)
+            packer.add(["c"], 20)
+            raise ValueError("Dispatch failed")
+    second = {"provider_job_ids": [packer.add(["d"], 10)]}
+
+    packer.submit()
+    packer.resolve(first)
+    packer.resolve(second)
+
+    assert device.submissions == [(["a", "d"], 10)]
+    assert second == {"provider_job_ids": ["job_0"], "circuit_indices": [1]}
+
+
+class SamplerDevice:
+    def __init__(self):
+        self.results = {}
+
+    def run(self, circuits, shots):
+        job_id = f"job_{len(self.results)}"
+        self.results[job_id] = StatevectorSampler().run(circuits, shots=shots).result()
+        return [FakeJob(job_id)]
+
+    def result_data(self, job_id):
+        # As read from the result of a Sampler job by qbraid.
+        counts = QiskitGateModelResultBuilder(self.results[job_id]).get_counts()
+        return GateModelResultData(measurement_counts=counts)
+
+
+def test_packing_separates_classical_registers():
+    # Measured into a register named "c", as in BSEQ.
+    measured_one = QuantumCircuit(1, 1)
+    measured_one.x(0)
+    measured_one.measure(0, 0)
+    # Measured into a register named "meas", as in Quantum Volume.
+    measured_zero = QuantumCircuit(1)
+    measured_zero.measure_all()
+    device = SamplerDevice()
+    with packing(device) as packer:
+        first = {"provider_job_ids": run_circuits(device, [measured_one], 10)}
+        second = {"provider_job_ids": run_circuits(device, [measured_zero, measured_one], 10)}
+
+    packer.submit()
+    packer.resolve(first)
+    packer.resolve(second)
+
+    assert len(device.results) == 2
+    for data, expected_counts in [(first, [{"1": 10}]), (second, [{"0": 10}, {"1": 10}])]:
+        result_data = [device.result_data(job_id) for job_id in data["provider_job_ids"]]
+        unpacked = unpack_results(result_data, data["circuit_indices"])
+        assert flatten_counts(unpacked) == expected_counts
+
+
+def test_resolve_leaves_unpacked_data():
+    packer = CircuitPacker(FakeDevice())
+    data = {"provider_job_ids": ["job_0"]}
+    packer.resolve(data)
+    assert data == {"provider_job_ids": ["job_0"]}
+
+
+def test_unpack_results():
+    result_data = [
+        GateModelResultData(measurement_counts=[{"00": 1}, {"01": 2}]),
+        GateModelResultData(measurement_counts={"11": 3}),
+    ]
+
+    assert flatten_counts(unpack_results(result_data, [2, 0])) == [{"11": 3}, {"00": 1}]
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+import os
+from unittest.mock import MagicMock
+
+import pytest
+from qbraid.runtime import GateModelResultData, JobStatus, QuantumJob
+from qbraid.runtime.result_data import MeasCount
+
+from metriq_gym.qplatform.job import JobMetadata, completion_time, execution_time, job_metadata
+from metriq_gym.result_cache import ResultCache
+
+
+@pytest.fixture
+def result_cache(tmpdir):
+    return ResultCache(str(tmpdir.join("results")))
+
+
+def fake_quantum_job(job_id: str) -> QuantumJob:
+    quantum_job = MagicMock(spec=QuantumJob)
+    quantum_job.id = job_id
+    return quantum_job
+
+
+@pytest.mark.parametrize(
+    "measurement_counts",
+    [
+        [MeasCount({"00": 50, "11": 50}), MeasCount({"01": 30, "10": 70})],
+        MeasCount({"00": 20, "11": 80}),
+        None,
+    ],
+)
+def test_put_and_get(result_cache, measurement_counts):
+    result_data = GateModelResultData(measurement_counts=measurement_counts)
+    result_cache.put("ibm", fake_quantum_job("job"), result_data, "ibm_device")
+
+    cached_job = result_cache.get("ibm", "job")
+    assert cached_job.id == "job"
+    assert cached_job.result().device_id == "ibm_device"
+    assert cached_job.result().data.measurement_counts == measurement_counts
+    assert result_cache.get("aws", "job") is None
+
+
+def test_put_stores_job_metadata(result_cache, monkeypatch):
+    quantum_job = fake_quantum_job("job")
+    result_data = GateModelResultData(measurement_counts=MeasCount({"0": 1}))
+    assert result_cache.put("ibm", quantum_job, result_data).metadata == JobMetadata()
+
+    start = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    metadata = JobMetadata(
+        status=JobStatus.COMPLETED,
+        execution_start=start,
+        execution_end=start + timedelta(seconds=12.5),
+        circuit_spans=[(start, start + timedelta(seconds=12.5))],
+        unavailable=frozenset({"queued_at", "started_at", "ended_at"}),
+    )
+    monkeypatch.setattr("metriq_gym.result_cache.job_metadata", lambda _: metadata)
+    result_cache.put("ibm", quantum_job, result_data)
+
+    cached_job = result_cache.get("ibm", "job")
+    assert job_metadata(cached_job) == metadata
+    assert execution_time(cached_job) == 12.5
+    assert completion_time(cached_job) == start + timedelta(seconds=12.5)
+
+
+def test_put_does_not_cache_transient_metadata_errors(result_cache, monkeypatch):
+    def failing_job_metadata(quantum_job):
+        raise ConnectionError("provider unreachable")
+
+    monkeypatch.setattr("metriq_gym.result_cache.job_metadata", failing_job_metadata)
+    result_data = GateModelResultData(measurement_counts=MeasCount({"0": 1}))
+    with pytest.raises(ConnectionError):
+        result_cache.put("ibm", fake_quantum_job("job"), result_data)
+
+    assert result_cache.get("ibm", "job") is None
+
+
+def test_get_many_requires_all_jobs(result_cache):
+    result_data = GateModelResultData(measurement_counts=MeasCount({"0": 1}))
+    result_cache.put("ibm", fake_quantum_job("a"), result_data)
+    assert result_cache.get_many("ibm", ["a", "b"]) is None
+    result_cache.put("ibm", fake_quantum_job("b"), result_data)
+    assert [job.id for job in result_cache.get_many("ibm", ["a", "b"])] == ["a", "b"]
+
+
+def test_least_recently_used_entries_are_evicted(result_cache):
+    result_data = GateModelResultData(measurement_counts=MeasCount({"0": 1}))
+    for i, job_id in enumerate(["a", "b", "c"]):
+        result_cache.put("ibm", fake_quantum_job(job_id), result_data)
+        os.utime(result_cache._path("ibm", job_id), (i, i))
+    result_cache.get("ibm", "a")
+    result_cache.max_bytes = 3 * os.path.getsize(result_cache._path("ibm", "a"))
+
+    result_cache.put("ibm", fake_quantum_job("d"), result_data)
+
+    assert result_cache.get("ibm", "b") is None
+    assert all(result_cache.get("ibm", job_id) is not None for job_id in ["a", "c", "d"])
@@ -1,10 +1,29 @@
+import argparse
+from dataclasses import asdict, dataclass
+from datetime import datetime
+import json
 import logging
 import pytest
 from unittest.mock import MagicMock, patch
 
 from qbraid import QbraidError
-from metriq_gym.run import setup_device
+from qbraid.runtime import JobStatus
+from metriq_gym.benchmarks.benchmark import BenchmarkData, BenchmarkResult
+from metriq_gym.benchmarks.clops import ClopsResult
+from metriq_gym.job_manager import JobManager, MetriqGymJob, SqliteJobStore
+from metriq_gym.job_type import JobType
+from metriq_gym.run import (
+    dispatch_job,
+    dispatch_packed,
+    dispatch_suite,
+    poll_all_jobs,
+    poll_job,
+    setup_device,
+)
 from metriq_gym.exceptions import QBraidSetupError
+from metriq_gym.helpers.task_helpers import fetch_results
+from metriq_gym.packing import run_circuits
+from metriq_gym.schema_validator import validate_and_create_model
 
 
 class FakeDevice:
@@ -24,7 +43,7 @@ def mock_device():
 
 @pytest.fixture
 def patch_load_provider(mock_provider, monkeypatch):
-    monkeypatch.setattr("metriq_gym.run.load_provider", lambda _: mock_provider)
+    monkeypatch.setattr("qbraid.runtime.load_provider", lambda _: mock_provider)
 
 
 def test_setup_device_success(mock_provider, mock_device, patch_load_provider):
@@ -39,7 +58,7 @@ def test_setup_device_success(mock_provider, mock_device, patch_load_provider):
     assert device == mock_device
 
 
-@patch("metriq_gym.run.get_providers")
+@patch("qbraid.runtime.get_providers")
 def test_setup_device_invalid_provider(get_providers_patch, caplog):
     get_providers_patch.return_value = ["supported_provider"]
     caplog.set_level(logging.INFO)
@@ -72,3 +91,344 @@ def test_setup_device_invalid_device(mock_provider, patch_load_provider, caplog)
         in caplog.text
     )
     assert "Devices available: ['device1', 'device2']" in caplog.text
+
+
+@dataclass
+class FakeResult(BenchmarkResult):
+    score: float
+
+
+@pytest.fixture
+def poll_all_args():
+    return argparse.Namespace(
+        provider=None, device=None, job_type=None, max_workers=2, recompute=False
+    )
+
+
+@pytest.fixture
+def job_manager_with_jobs(tmpdir):
+    job_manager = JobManager(SqliteJobStore(str(tmpdir.join("jobs.db"))))
+    for job_id, provider_name in [("a", "ibm"), ("b", "ibm"), ("c", "aws"), ("d", "aws")]:
+        job_manager.add_job(
+            MetriqGymJob(
+                id=job_id,
+                job_type=JobType.CLOPS,
+                params={},
+                data={"provider_job_ids": [job_id]},
+                provider_name=provider_name,
+                device_name="device",
+                dispatch_time=datetime.now(),
+            )
+        )
+    return job_manager
+
+
+def fake_poll_metriq_job(args, job_manager, metriq_job, max_workers, loader_kwargs):
+    if metriq_job.id == "b":
+        return None
+    if metriq_job.id == "d":
+        raise RuntimeError("provider error")
+    return FakeResult(score=1.0)
+
+
+def failing_poll_metriq_job(args, job_manager, metriq_job, max_workers, loader_kwargs):
+    if metriq_job.id == "b":
+        # A provider job of "b" failed.
+        quantum_job = MagicMock(id="b")
+        quantum_job.status.return_value = JobStatus.FAILED
+        fetch_results([quantum_job], max_workers)
+    return None
+
+
+def test_poll_all_jobs(poll_all_args, job_manager_with_jobs, monkeypatch, capsys):
+    monkeypatch.setattr("qbraid.runtime.load_provider", MagicMock())
+    monkeypatch.setattr("metriq_gym.run.poll_metriq_job", fake_poll_metriq_job)
+    poll_all_jobs(poll_all_args, job_manager_with_jobs)
+
+    assert job_manager_with_jobs.get_job("a").result == {"score": 1.0}
+    assert job_manager_with_jobs.get_job("a").completion_time is not None
+    assert job_manager_with_jobs.get_job("c").result == {"score": 1.0}
+    assert job_manager_with_jobs.get_job("b").result is None
+    assert job_manager_with_jobs.get_job("d").result is None
+    output = capsys.readouterr().out
+    assert "COMPLETED" in output and "PENDING" in output and "ERROR" in output
+
+
+def test_poll_all_jobs_records_failed_jobs(
+    poll_all_args, job_manager_with_jobs, monkeypatch, capsys
+):
+    monkeypatch.setattr("qbraid.runtime.load_provider", MagicMock())
+    poll_metriq_job = MagicMock(side_effect=failing_poll_metriq_job)
+    monkeypatch.setattr("metriq_gym.run.poll_metriq_job", poll_metriq_job)
+    poll_all_jobs(poll_all_args, job_manager_with_jobs)
+
+    assert job_manager_with_jobs.get_job("b").provider_status == "FAILED"
+    assert job_manager_with_jobs.get_job("a").provider_status is None
+    output = capsys.readouterr().out
+    assert "FAILED" in output and "PENDING" in output
+
+    # The failed job is final and is not polled again.
+    poll_metriq_job.reset_mock()
+    poll_all_jobs(poll_all_args, job_manager_with_jobs)
+    assert {call.args[2].id for call in poll_metriq_job.call_args_list} == {"a", "c", "d"}
+
+
+def test_poll_all_jobs_skips_completed_jobs(poll_all_args, job_manager_with_jobs, monkeypatch):
+    job = job_manager_with_jobs.get_job("a")
+    job.result = {"clops_score": 1.0}
+    job.result_version = ClopsResult.schema_version
+    job_manager_with_jobs.update_job(job)
+    poll_metriq_job = MagicMock(return_value=None)
+    monkeypatch.setattr("qbraid.runtime.load_provider", MagicMock())
+    monkeypatch.setattr("metriq_gym.run.poll_metriq_job", poll_metriq_job)
+    poll_all_jobs(poll_all_args, job_manager_with_jobs)
+
+    assert {call.args[2].id for call in poll_metriq_job.call_args_list} == {"b", "c", "d"}
+
+
+@pytest.fixture
+def poll_args():
+    return argparse.Namespace(job_id="a", max_workers=2, recompute=False)
+
+
+def test_poll_job_records_result(poll_args, job_manager_with_jobs, monkeypatch, capsys):
+    clops_result = ClopsResult(clops_score=2.0)
+    poll_metriq_job = MagicMock(return_value=clops_result)
+    monkeypatch.setattr("metriq_gym.run.poll_metriq_job", poll_metriq_job)
+    poll_job(poll_args, job_manager_with_jobs)
+
+    job = job_manager_with_jobs.get_job("a")
+    assert job.result == asdict(clops_result)
+    assert job.result_version == ClopsResult.schema_version
+    assert job.completion_time is not None
+    assert str(clops_result) in capsys.readouterr().out
+
+    # The recorded result is returned without polling the provider again...
+    poll_job(poll_args, job_manager_with_jobs)
+    assert poll_metriq_job.call_count == 1
+    assert str(clops_result) in capsys.readouterr().out
+
+    # ...unless a recomputation is requested.
+    poll_args.recompute = True
+    poll_job(poll_args, job_manager_with_jobs)
+    assert poll_metriq_job.call_count == 2
+
+
+def test_poll_job_recomputes_outdated_result(poll_args, job_manager_with_jobs, monkeypatch, capsys):
+    job = job_manager_with_jobs.get_job("a")
+    job.result = {"clops_score": 1.0}
+    job.result_version = ClopsResult.schema_version - 1
+    job_manager_with_jobs.update_job(job)
+    clops_result = ClopsResult(clops_score=2.0)
+    monkeypatch.setattr("metriq_gym.run.poll_metriq_job", MagicMock(return_value=clops_result))
+    poll_job(poll_args, job_manager_with_jobs)
+
+    assert job_manager_with_jobs.get_job("a").result == asdict(clops_result)
+
+
+class FakeBenchmark:
+    def __init__(self, params):
+        self.params = params
+
+    def dispatch_handler(self, device):
+        if device.id == "flaky_device" and self.params.benchmark_name == "CLOPS":
+            raise RuntimeError("submission error")
+        return BenchmarkData(provider_job_ids=[f"{device.id}-{self.params.benchmark_name}"])
+
+
+def fake_setup_device(provider_name, backend_name):
+    if backend_name == "missing_device":
+        raise QBraidSetupError("Device not found")
+    return FakeDevice(id=backend_name)
+
+
+def test_dispatch_suite_isolates_failures(tmpdir, monkeypatch, capsys):
+    suite_file = tmpdir.join("suite.json")
+    suite_file.write(
+        json.dumps(
+            {
+                "benchmarks": [
+                    {"benchmark_name": "QML Kernel", "num_qubits": 4, "shots": 10},
+                    {"benchmark_name": "CLOPS", "width": 4, "num_layers": 4, "shots": 10},
+                ],
+                "devices": [
+                    {"provider": "ibm", "device": "good_device"},
+                    {"provider": "ibm", "device": "missing_device"},
+                    {"provider": "ibm", "device": "flaky_device"},
+                ],
+            }
+        )
+    )
+    args = argparse.Namespace(
+        suite_file=str(suite_file), max_workers=1, max_submissions=4, refresh_device=False
+    )
+    job_manager = JobManager(SqliteJobStore(str(tmpdir.join("jobs.db"))))
+    monkeypatch.setattr("metriq_gym.run.setup_device", fake_setup_device)
+    monkeypatch.setattr(
+        "metriq_gym.run.setup_benchmark", lambda args, params, job_type: FakeBenchmark(params)
+    )
+    # Neither benchmark has preparation to run ahead of time.
+    monkeypatch.setattr("metriq_gym.run.ProcessPoolExecutor", None)
+
+    dispatch_suite(args, job_manager)
+
+    jobs = job_manager.get_jobs()
+    assert sorted(job.data["provider_job_ids"][0] for job in jobs) == [
+        "flaky_device-QML Kernel",
+        "good_device-CLOPS",
+        "good_device-QML Kernel",
+    ]
+    assert len({job.suite_id for job in jobs}) == 1
+    assert jobs[0].suite_id is not None
+    assert "Dispatched 3 of 6 jobs" in capsys.readouterr().out
+
+
+def test_dispatch_job_sweep(tmpdir, monkeypatch, capsys):
+    input_file = tmpdir.join("sweep.json")
+    input_file.write(
+        json.dumps(
+            {"benchmark_name": "QML Kernel", "num_qubits": {"sweep": [4, 6, 8]}, "shots": 10}
+        )
+    )
+    args = argparse.Namespace(
+        input_file=str(input_file), provider="ibm", device="good_device", refresh_device=False
+    )
+    job_manager = JobManager(SqliteJobStore(str(tmpdir.join("jobs.db"))))
+    setup_device_calls = []
+    monkeypatch.setattr(
+        "metriq_gym.run.setup_device",
+        lambda *device_args: setup_device_calls.append(device_args)
+        or fake_setup_device(*device_args),
+    )
+    monkeypatch.setattr(
+        "metriq_gym.run.setup_benchmark", lambda args, params, job_type: FakeBenchmark(params)
+    )
+
+    dispatch_job(args, job_manager)
+
+    jobs = job_manager.get_jobs()
+    assert setup_device_calls == [("ibm", "good_device")]
+    assert [job.params["num_qubits"] for job in jobs] == [4, 6, 8]
+    assert len({job.suite_id for job in jobs}) == 1
+    assert jobs[0].suite_id is not None
+    assert job_manager.get_jobs(suite_id=jobs[0].suite_id) == jobs
+    assert "Dispatched 3 of 3 jobs" in capsys.readouterr().out
+
+
+def test_dispatch_job_pack_without_sweep(tmpdir, monkeypatch, caplog):
+    input_file = tmpdir.join("input.json")
+    input_file.write(json.dumps({"benchmark_name": "QML Kernel", "num_qubits": 4, "shots": 10}))
+    args = argparse.Namespace(
+        input_file=str(input_file),
+        provider="ibm",
+        device="good_device",
+        refresh_device=False,
+        pack=True,
+    )
+    job_manager = JobManager(SqliteJobStore(str(tmpdir.join("jobs.db"))))
+    monkeypatch.setattr("metriq_gym.run.setup_device", fake_setup_device)
+    monkeypatch.setattr(
+        "metriq_gym.run.setup_benchmark", lambda args, params, job_type: FakeBenchmark(params)
+    )
+
+    with caplog.at_level(logging.WARNING):
+        dispatch_job(args, job_manager)
+
+    assert "Nothing to pack" in caplog.text
+    assert len(job_manager.get_jobs()) == 1
+
+
+class FakePackingDevice(FakeDevice):
+    def __init__(self, id):
+        super().__init__(id)
+        self.submissions = []
+
+    def run(self, circuits, shots):
+        if shots > 100:
+            raise QbraidError("Too many shots")
+        self.submissions.append(list(circuits))
+        return [FakeDevice(id=f"{self.id}-job_{len(self.submissions) - 1}")]
+
+
+class FakePackingBenchmark:
+    def __init__(self, params):
+        self.params = params
+
+    def dispatch_handler(self, device):
+        circuits = [f"{self.params.num_qubits}-{i}" for i in range(2)]
+        provider_job_ids = run_circuits(device, circuits, self.params.shots)
+        if self.params.num_qubits > 10:
+            raise ValueError("Too many qubits")
+        return BenchmarkData(provider_job_ids=provider_job_ids)
+
+
+def test_dispatch_suite_packs_circuits(tmpdir, monkeypatch):
+    suite_file = tmpdir.join("suite.json")
+    suite_file.write(
+        json.dumps(
+            {
+                "benchmarks": [
+                    {"benchmark_name": "QML Kernel", "num_qubits": {"sweep": [4, 6]}, "shots": 10}
+                ],
+                "devices": [
+                    {"provider": "ibm", "device": "first_device"},
+                    {"provider": "ibm", "device": "second_device"},
+                ],
+            }
+        )
+    )
+    args = argparse.Namespace(
+        suite_file=str(suite_file),
+        max_workers=1,
+        max_submissions=2,
+        refresh_device=False,
+        pack=True,
+    )
+    job_manager = JobManager(SqliteJobStore(str(tmpdir.join("jobs.db"))))
+    devices = {}
+    monkeypatch.setattr(
+        "metriq_gym.run.setup_device",
+        lambda provider_name, device_name: devices.setdefault(
+            device_name, FakePackingDevice(id=device_name)
+        ),
+    )
+    monkeypatch.setattr(
+        "metriq_gym.run.setup_benchmark",
+        lambda args, params, job_type: FakePackingBenchmark(params),
+    )
+
+    dispatch_suite(args, job_manager)
+
+    # One provider job per device holds the circuits of both configurations.
+    assert devices["first_device"].submissions == [["4-0", "4-1", "6-0", "6-1"]]
+    jobs = job_manager.get_jobs(device_name="first_device")
+    assert [job.data["provider_job_ids"] for job in jobs] == [["first_device-job_0"]] * 2
+    assert [job.data["circuit_indices"] for job in jobs] == [[0, 1], [2, 3]]
+
+
+def test_dispatch_packed_isolates_failures(monkeypatch, caplog):
+    models = [
+        validate_and_create_model({"benchmark_name": "QML Kernel", **params})
+        for params in [
+            {"num_qubits": 4, "shots": 10},
+            # Fails to dispatch after its circuits were set aside.
+            {"num_qubits": 12, "shots": 10},
+            # Its circuits fail to be submitted.
+            {"num_qubits": 6, "shots": 1000},
+            {"num_qubits": 8, "shots": 10},
+        ]
+    ]
+    device = FakePackingDevice(id="device")
+    monkeypatch.setattr(
+        "metriq_gym.run.setup_benchmark",
+        lambda args, params, job_type: FakePackingBenchmark(params),
+    )
+
+    with caplog.at_level(logging.ERROR):
+        jobs = dispatch_packed(argparse.Namespace(), models, device, "ibm", "device")
+
+    assert device.submissions == [["4-0", "4-1", "8-0", "8-1"]]
+    assert [job.params["num_qubits"] for job in jobs] == [4, 8]
+    assert [job.data["circuit_indices"] for job in jobs] == [[0, 1], [2, 3]]
+    assert "Too many qubits" in caplog.text
+    assert "Too many shots" in caplog.text
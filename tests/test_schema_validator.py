@@ -3,7 +3,14 @@ import json
 from unittest.mock import patch
 import pytest
 from jsonschema import ValidationError
-from metriq_gym.schema_validator import load_and_validate
+
+from metriq_gym import schema_validator
+from metriq_gym.schema_validator import (
+    create_pydantic_model,
+    load_and_validate,
+    validate_and_create_model,
+    validate_many,
+)
 
 FAKE_BENCHMARK_NAME = "Test Benchmark"
 
@@ -93,3 +100,43 @@ def test_load_and_validate_invalid(file_path_invalid_job, mock_schema):
 def test_load_and_validate_invalid_job_path():
     with pytest.raises(FileNotFoundError):
         load_and_validate("invalid_job.json")
+
+
+def test_create_pydantic_model_optional_fields():
+    schema = {
+        **MOCK_SCHEMA_CONTENT,
+        "properties": {
+            **MOCK_SCHEMA_CONTENT["properties"],
+            "shots": {"type": "integer", "minimum": 1, "default": 1000},
+        },
+    }
+    model = create_pydantic_model(schema)(benchmark_name=FAKE_BENCHMARK_NAME, num_qubits=5)
+    assert model.shots == 1000
+    assert model.trials is None
+
+
+def test_validate_and_create_model_reuses_compiled_schema(valid_params):
+    with patch(
+        "metriq_gym.schema_validator.load_json_file", wraps=schema_validator.load_json_file
+    ) as load_json_file:
+        first = validate_and_create_model(valid_params)
+        second = validate_and_create_model({**valid_params, "num_qubits": 3})
+
+    assert type(first) is type(second)
+    assert second.num_qubits == 3
+    load_json_file.assert_called_once()
+
+
+def test_validate_many(valid_params):
+    models = validate_many([valid_params, {**valid_params, "shots": 10}])
+
+    assert [model.shots for model in models] == [1024, 10]
+
+
+def test_validate_many_reports_invalid_entry(valid_params, invalid_params):
+    with pytest.raises(ValidationError) as error:
+        validate_many([valid_params, invalid_params])
+    assert list(error.value.path) == [1, "num_qubits"]
+
+    with pytest.raises(ValueError, match="entry 1"):
+        validate_many([valid_params, {"num_qubits": 5}])
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+from jsonschema import ValidationError
+
+from metriq_gym.suite import SuiteDevice, load_suite, needs_preparation
+
+QV_PARAMS = {
+    "benchmark_name": "Quantum Volume",
+    "num_qubits": 4,
+    "shots": 2,
+    "trials": 2,
+    "confidence_level": 0.95,
+}
+QML_KERNEL_PARAMS = {"benchmark_name": "QML Kernel", "num_qubits": 4, "shots": 10}
+
+
+def write_suite(tmpdir, suite) -> str:
+    file_path = tmpdir.join("suite.json")
+    with open(file_path, "w") as file:
+        json.dump(suite, file)
+    return str(file_path)
+
+
+def test_load_suite(tmpdir):
+    suite = load_suite(
+        write_suite(
+            tmpdir,
+            {
+                "suite_name": "weekly",
+                "benchmarks": [QV_PARAMS, {**QV_PARAMS, "seed": 7}, QML_KERNEL_PARAMS],
+                "devices": [{"provider": "ibm", "device": "ibm_sherbrooke"}],
+            },
+        )
+    )
+
+    assert suite.name == "weekly"
+    assert suite.devices == [SuiteDevice(provider="ibm", device="ibm_sherbrooke")]
+    # A seed is drawn once for the whole suite when the configuration does not set one.
+    assert isinstance(suite.benchmarks[0]["seed"], int)
+    assert suite.benchmarks[1]["seed"] == 7
+    assert suite.benchmarks[2] == QML_KERNEL_PARAMS
+
+
+def test_load_suite_expands_sweeps(tmpdir):
+    suite = load_suite(
+        write_suite(
+            tmpdir,
+            {
+                "benchmarks": [{**QML_KERNEL_PARAMS, "num_qubits": {"sweep": [4, 6, 8]}}],
+                "devices": [{"provider": "aws", "device": "sv1"}],
+            },
+        )
+    )
+
+    assert suite.benchmarks == [{**QML_KERNEL_PARAMS, "num_qubits": n} for n in (4, 6, 8)]
+
+
+def test_load_suite_default_name(tmpdir):
+    suite = load_suite(
+        write_suite(
+            tmpdir,
+            {"benchmarks": [QML_KERNEL_PARAMS], "devices": [{"provider": "aws", "device": "sv1"}]},
+        )
+    )
+
+    assert suite.name == "suite"
+
+
+@pytest.mark.parametrize(
+    "suite",
+    [
+        {"benchmarks": [QML_KERNEL_PARAMS], "devices": []},
+        {"benchmarks": [QML_KERNEL_PARAMS], "devices": [{"provider": "ibm"}]},
+        {
+            "benchmarks": [{**QML_KERNEL_PARAMS, "num_qubits": 0}],
+            "devices": [{"provider": "ibm", "device": "ibm_sherbrooke"}],
+        },
+    ],
+)
+def test_load_suite_invalid(tmpdir, suite):
+    with pytest.raises(ValidationError):
+        load_suite(write_suite(tmpdir, suite))
+
+
+def test_needs_preparation():
+    assert needs_preparation(QV_PARAMS)
+    assert not needs_preparation(QML_KERNEL_PARAMS)
@@ -0,0 +1,50 @@
+import pytest
+
+from metriq_gym.sweep import expand_sweep, sweep_values
+
+
+def test_expand_sweep_grid():
+    params = {
+        "benchmark_name": "QML Kernel",
+        "num_qubits": {"sweep": [4, 8]},
+        "shots": {"sweep": {"from": 100, "to": 300, "step": 100}},
+    }
+
+    points = expand_sweep(params)
+
+    assert [(point["num_qubits"], point["shots"]) for point in points] == [
+        (4, 100),
+        (4, 200),
+        (4, 300),
+        (8, 100),
+        (8, 200),
+        (8, 300),
+    ]
+    assert all(point["benchmark_name"] == "QML Kernel" for point in points)
+
+
+def test_expand_sweep_without_sweeps():
+    params = {"benchmark_name": "QML Kernel", "num_qubits": 4, "shots": 10}
+    assert expand_sweep(params) == [params]
+
+
+def test_sweep_values_range():
+    assert sweep_values({"sweep": {"from": 2, "to": 5}}) == [2, 3, 4, 5]
+    assert sweep_values({"sweep": {"from": 0.1, "to": 0.3, "step": 0.1}}) == pytest.approx(
+        [0.1, 0.2, 0.3]
+    )
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"sweep": []},
+        {"sweep": {"from": 1, "to": 4, "step": 0}},
+        {"sweep": {"from": 4, "to": 1}},
+        {"sweep": {"to": 4}},
+        {"sweep": 4},
+    ],
+)
+def test_sweep_values_invalid(value):
+    with pytest.raises(ValueError):
+        sweep_values(value)